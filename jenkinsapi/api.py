@@ -7,7 +7,6 @@ hence they have simple string arguments.
 
 import os
 import re
-import time
 import logging
 from typing import List, Dict
 
@@ -19,6 +18,7 @@ from jenkinsapi.jenkins import Jenkins
 from jenkinsapi.view import View
 from jenkinsapi.job import Job
 from jenkinsapi.build import Build
+from jenkinsapi.build_waiter import BuildWaiter
 from jenkinsapi.custom_exceptions import ArtifactsMissing, TimeOut, BadURL
 from jenkinsapi.result_set import ResultSet
 
@@ -148,10 +148,9 @@ def search_artifacts(
         jenkinsurl, username=username, password=password, ssl_verify=ssl_verify
     )
     job = jenkinsci[jobname]
-    build_ids = job.get_build_ids()
     missing_artifacts = set()
-    for build_id in build_ids:
-        build = job.get_build(build_id)
+    for build in job.get_builds(tree="number,url"):
+        build_id = build.get_number()
         artifacts = build.get_artifact_dict()
         if set(artifact_ids).issubset(set(artifacts.keys())):
             return dict((a, artifacts[a]) for a in artifact_ids)
@@ -210,27 +209,29 @@ def block_until_complete(
     assert maxwait > interval
     assert interval > 0
 
-    report: str = ""
     obj_jenkins: Jenkins = Jenkins(
         jenkinsurl, username=username, password=password, ssl_verify=ssl_verify
     )
     obj_jobs: List[Job] = [obj_jenkins[jid] for jid in jobs]
-    for time_left in range(maxwait, 0, -interval):
-        still_running = [j for j in obj_jobs if j.is_queued_or_running()]
-        if not still_running:
-            return
-        report = ", ".join('"%s"' % str(a) for a in still_running)
-        log.warning(
-            "Waiting for jobs %s to complete. Will wait another %is",
-            report,
-            time_left,
-        )
-        time.sleep(interval)
-    if raise_on_timeout:
-        # noinspection PyUnboundLocalVariable
-        raise TimeOut(
-            "Waited too long for these jobs to complete: %s" % report
+    # Polls the queue and each job with pending builds once per round,
+    # rather than each job several times
+    waiter = BuildWaiter(
+        obj_jenkins, min_interval=min(5, interval), max_interval=interval
+    )
+    futures = {job.name: waiter.add_job(job) for job in obj_jobs}
+    try:
+        waiter.wait(timeout=maxwait)
+    except TimeOut:
+        report = ", ".join(
+            '"%s"' % name
+            for name, future in futures.items()
+            if not future.done()
         )
+        log.warning("Jobs %s did not complete in %is", report, maxwait)
+        if raise_on_timeout:
+            raise TimeOut(
+                "Waited too long for these jobs to complete: %s" % report
+            )
 
 
 def get_view_from_url(
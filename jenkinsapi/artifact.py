@@ -12,16 +12,81 @@ objects from the server and also access them as a stream.
 from __future__ import annotations
 
 import os
+import time
 import logging
 import hashlib
-from typing import Any, Literal
+import threading
+from typing import Any, Callable, Literal
 
+import requests
+
+from jenkinsapi import config
 from jenkinsapi.fingerprint import Fingerprint
 from jenkinsapi.custom_exceptions import ArtifactBroken
+from jenkinsapi.custom_exceptions import JenkinsAPIException
+from jenkinsapi.utils.fingerprint_cache import FingerprintCache
 
 log = logging.getLogger(__name__)
 
 
+class DownloadStats(object):
+    """
+    Progress of a download of one or more artifacts, handed to progress
+    callbacks after every chunk written. Callbacks of concurrent downloads
+    are called from the threads downloading.
+    """
+
+    def __init__(self, files_total: int) -> None:
+        self.files_total = files_total
+        self.files_done = 0
+        self.bytes_done = 0
+        # Sum of the sizes of the artifacts whose download has started
+        self.bytes_total = 0
+        self.bytes_resumed = 0
+        self.artifact: Artifact | None = None
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def throughput(self) -> float:
+        """
+        Bytes downloaded per second, not counting resumed bytes.
+        """
+        elapsed = self.elapsed
+        if not elapsed:
+            return 0.0
+        return (self.bytes_done - self.bytes_resumed) / elapsed
+
+    def _update(
+        self,
+        artifact: Artifact,
+        received: int = 0,
+        size: int = 0,
+        resumed: int = 0,
+        done: bool = False,
+    ) -> None:
+        with self._lock:
+            self.artifact = artifact
+            self.bytes_done += received + resumed
+            self.bytes_resumed += resumed
+            self.bytes_total += size
+            self.files_done += done
+
+    def __repr__(self) -> str:
+        return "<%s %i/%i files, %i/%i bytes, %.0f bytes/s>" % (
+            self.__class__.__name__,
+            self.files_done,
+            self.files_total,
+            self.bytes_done,
+            self.bytes_total,
+            self.throughput,
+        )
+
+
 class Artifact(object):
     """
     Represents a single Jenkins artifact, usually some kind of file
@@ -39,6 +104,8 @@ class Artifact(object):
         self.url: str = url
         self.build: "Build" = build
         self.relative_path: str | None = relative_path
+        # (path, size, mtime_ns, md5) of the last download
+        self._downloaded: tuple[str, int, int, str] | None = None
 
     def save(self, fspath: str, strict_validation: bool = False) -> str:
         """
@@ -92,14 +159,166 @@ class Artifact(object):
         """
         Download the the artifact to a path.
         """
-        data = self.get_jenkins_obj().requester.get_and_confirm_status(
-            self.url, stream=True
-        )
-        with open(fspath, "wb") as out:
-            for chunk in data.iter_content(chunk_size=1024):
-                out.write(chunk)
+        return self.download(fspath)
+
+    def download(
+        self,
+        fspath: str,
+        chunk_size: int | None = None,
+        resume: bool = False,
+        retries: int = 3,
+        progress: Callable[[DownloadStats], Any] | None = None,
+        stats: DownloadStats | None = None,
+    ) -> str:
+        """
+        Download the artifact to fspath without verifying it.
+
+        With resume, the artifact is written to fspath + ".part" and only
+        renamed to fspath once complete. A part left by an interrupted
+        download is continued with a HTTP Range request, and transfers
+        interrupted while downloading are resumed up to retries times.
+
+        :param chunk_size: bytes read at a time, ARTIFACT_CHUNK_SIZE of
+            jenkinsapi.config by default
+        :param progress: callable receiving a DownloadStats after every
+            chunk written
+        :return: fspath
+        """
+        chunk_size = chunk_size or config.ARTIFACT_CHUNK_SIZE
+        stats = stats or DownloadStats(1)
+        partpath = fspath + ".part" if resume else fspath
+        offset = 0
+        if resume and os.path.exists(partpath):
+            offset = os.path.getsize(partpath)
+        md5 = self._md5_of_part(partpath, offset)
+        started = False
+        while True:
+            response = self._request_from(offset)
+            if response.status_code == 416:
+                response.close()
+                if self._content_size(response) != offset:
+                    # Not a part of this artifact, start over
+                    offset = 0
+                    md5 = hashlib.md5()
+                    continue
+                if not started:
+                    stats._update(self, size=offset, resumed=offset)
+                break
+            if response.status_code != 206 and offset:
+                # Ranges are not supported, start over
+                if started:
+                    stats._update(self, received=-offset)
+                offset = 0
+                md5 = hashlib.md5()
+            if not started:
+                size = self._content_size(response)
+                stats._update(self, size=size or 0, resumed=offset)
+                started = True
+            try:
+                with open(partpath, "ab" if offset else "wb") as out:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        out.write(chunk)
+                        md5.update(chunk)
+                        offset += len(chunk)
+                        stats._update(self, received=len(chunk))
+                        if progress is not None:
+                            progress(stats)
+                break
+            except (
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.ConnectionError,
+            ):
+                if not resume or retries <= 0:
+                    raise
+                retries -= 1
+                log.warning(
+                    "Download of %s interrupted after %i bytes, resuming.",
+                    self.url,
+                    offset,
+                )
+            finally:
+                response.close()
+        if partpath != fspath:
+            os.replace(partpath, fspath)
+        self._record_md5(fspath, md5.hexdigest())
+        stats._update(self, done=True)
+        if progress is not None:
+            progress(stats)
         return fspath
 
+    def _md5_of_part(self, partpath: str, size: int) -> Any:
+        """
+        Return a MD5 hash fed with the part of an artifact downloaded
+        already, to be continued with the rest.
+        """
+        md5 = hashlib.md5()
+        if size:
+            with open(partpath, "rb") as part:
+                for chunk in iter(lambda: part.read(2**20), b""):
+                    md5.update(chunk)
+        return md5
+
+    def _record_md5(self, fspath: str, md5: str) -> None:
+        stat = os.stat(fspath)
+        self._downloaded = (fspath, stat.st_size, stat.st_mtime_ns, md5)
+        if config.ARTIFACT_FINGERPRINT_CACHE:
+            FingerprintCache.for_path(fspath).put_md5(fspath, md5)
+
+    def _local_md5(self, fspath: str) -> str:
+        """
+        Return the MD5 of a local file, hashing it only if it was neither
+        just downloaded nor found unchanged in the fingerprint cache.
+        """
+        if self._downloaded and self._downloaded[0] == fspath:
+            try:
+                stat = os.stat(fspath)
+            except OSError:
+                stat = None
+            if stat and self._downloaded[1:3] == (
+                stat.st_size,
+                stat.st_mtime_ns,
+            ):
+                return self._downloaded[3]
+        cache = None
+        if config.ARTIFACT_FINGERPRINT_CACHE:
+            cache = FingerprintCache.for_path(fspath)
+            md5 = cache.get_md5(fspath)
+            if md5:
+                return md5
+        md5 = self._md5sum(fspath)
+        if cache is not None:
+            cache.put_md5(fspath, md5)
+        return md5
+
+    def _request_from(self, offset: int) -> Any:
+        headers = None
+        valid: tuple[int, ...] = (200,)
+        if offset:
+            headers = {"Range": "bytes=%i-" % offset}
+            valid = (200, 206, 416)
+        response = self.get_jenkins_obj().requester.get_url(
+            self.url, headers=headers, stream=True
+        )
+        if response.status_code not in valid:
+            response.close()
+            raise JenkinsAPIException(
+                "Download of %s failed with status %s"
+                % (self.url, response.status_code)
+            )
+        return response
+
+    @staticmethod
+    def _content_size(response: Any) -> int | None:
+        """
+        Return the size of the whole artifact a response is part of.
+        """
+        content_range = response.headers.get("Content-Range")
+        if content_range and "/" in content_range:
+            size = content_range.rsplit("/", 1)[1]
+            return int(size) if size.isdigit() else None
+        length = response.headers.get("Content-Length")
+        return int(length) if length else None
+
     def _verify_download(self, fspath, strict_validation) -> Literal[True]:
         """
         Verify that a downloaded object has a valid fingerprint.
@@ -107,11 +326,23 @@ class Artifact(object):
         Returns True if the fingerprint is valid, raises an exception if
         the fingerprint is invalid.
         """
-        local_md5 = self._md5sum(fspath)
+        local_md5 = self._local_md5(fspath)
         baseurl = self.build.job.jenkins.baseurl
+        job_name = self.build.job.get_full_name()
+        cache = None
+        if config.ARTIFACT_FINGERPRINT_CACHE:
+            cache = FingerprintCache.for_path(fspath)
+            if cache.is_validated(
+                fspath,
+                local_md5,
+                job_name,
+                self.build.buildno,
+                strict_validation,
+            ):
+                return True
         fp = Fingerprint(baseurl, local_md5, self.build.job.jenkins)
         valid = fp.validate_for_build(
-            self.filename, self.build.job.get_full_name(), self.build.buildno
+            self.filename, job_name, self.build.buildno
         )
         if not valid or (fp.unknown and strict_validation):
             # strict = 404 as invalid
@@ -119,6 +350,10 @@ class Artifact(object):
                 "Artifact %s seems to be broken, check %s"
                 % (local_md5, baseurl)
             )
+        if cache is not None:
+            cache.put_validated(
+                fspath, local_md5, job_name, self.build.buildno, fp.unknown
+            )
         return True
 
     def _md5sum(self, fspath: str, chunksize: int = 2**20) -> str:
@@ -0,0 +1,578 @@
+"""
+Module for the asyncio flavour of the jenkinsapi objects.
+
+AsyncJenkins, AsyncJobs, AsyncJob, AsyncBuild and AsyncQueueItem inherit
+all data accessors (get_status, get_params, get_duration...) from their
+blocking counterparts and only replace the methods doing network I/O with
+coroutines, those which have no coroutine yet raise TypeError. Objects are
+never polled on construction, so that thousands of them can be fetched
+concurrently:
+
+    async with AsyncJenkins("http://localhost:8080") as jenkins:
+        jobs = await jenkins.jobs.values()
+        builds = await asyncio.gather(*(j.get_last_build() for j in jobs))
+
+Requires aiohttp, install it with: pip install jenkinsapi[async]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from urllib.parse import quote
+from typing import List
+
+from requests import HTTPError
+
+from jenkinsapi.build import Build
+from jenkinsapi.jenkins import Jenkins
+from jenkinsapi.job import Job
+from jenkinsapi.jobs import Jobs
+from jenkinsapi.queue import QueueItem
+from jenkinsapi.artifact import Artifact
+from jenkinsapi.custom_exceptions import (
+    NoBuildData,
+    NotBuiltYet,
+    NotFound,
+    UnknownJob,
+)
+from jenkinsapi.utils.async_requester import (
+    AsyncCrumbRequester,
+    AsyncRequester,
+)
+
+log = logging.getLogger(__name__)
+
+
+def _blocking(self, *args, **kwargs):
+    raise TypeError(
+        "%s does not support blocking access, "
+        "use the coroutine methods instead" % type(self).__name__
+    )
+
+
+class AsyncJenkinsBase(object):
+    """
+    Mixin replacing the blocking I/O of JenkinsBase with coroutines.
+    It must come before the JenkinsBase subclass in the bases.
+    """
+
+    async def get_data(self, url, params=None, tree=None):
+        requester = self.get_jenkins_obj().requester
+        params = self._merge_tree(params, tree)
+        response = await requester.get_url(url, params)
+        return self._decode_response(url, params, tree, response)
+
+    async def poll(self, tree=None):
+        data = await self._poll(tree=tree)
+        if "jobs" in data:
+            data["jobs"] = await self.resolve_job_folders(data["jobs"])
+        if not tree:
+            self._data = data
+
+        return data
+
+    async def _poll(self, tree=None):
+        url = self.python_api_url(self.baseurl)
+        return await self.get_data(url, tree=tree)
+
+    async def resolve_job_folders(self, jobs):
+        folders = [job for job in jobs if "color" not in job.keys()]
+        if not folders:
+            return jobs
+        jobs = [job for job in jobs if "color" in job.keys()]
+        for result in await asyncio.gather(
+            *(self.process_job_folder(f, self.baseurl) for f in folders)
+        ):
+            jobs += result
+
+        return jobs
+
+    async def process_job_folder(self, folder, folder_path):
+        log.debug("Processing folder %s in %s", folder["name"], folder_path)
+        folder_path += "/job/%s" % quote(folder["name"])
+        data = await self.get_data(
+            self.python_api_url(folder_path), tree="jobs[name,color]"
+        )
+
+        children = data.get("jobs", [])
+        subfolders = await asyncio.gather(
+            *(
+                self.process_job_folder(job, folder_path)
+                for job in children
+                if "color" not in job.keys()
+            )
+        )
+        subfolders = iter(subfolders)
+        result = []
+        for job in children:
+            if "color" not in job.keys():
+                result += next(subfolders)
+            else:
+                job["url"] = "%s/job/%s" % (folder_path, quote(job["name"]))
+                result.append(job)
+
+        return result
+
+
+class AsyncJenkins(AsyncJenkinsBase, Jenkins):
+    """
+    Represents a jenkins environment, accessed with asyncio.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        baseurl: str,
+        username: str = "",
+        password: str = "",
+        requester=None,
+        ssl_verify: bool = True,
+        cert=None,
+        timeout: int = 10,
+        use_crumb: bool = True,
+        pool_maxsize: int = 100,
+        coalesce: bool = False,
+    ) -> None:
+        """
+        :param baseurl: baseurl for jenkins instance including port, str
+        :param username: username for jenkins auth, str
+        :param password: password for jenkins auth, str
+        :param pool_maxsize: maximum number of open connections, int
+        :param coalesce: share the response of identical GET requests
+            made by several coroutines at once, bool
+        :return: an AsyncJenkins obj, call poll() before reading its data
+        """
+        if requester is None:
+            if use_crumb:
+                requester = AsyncCrumbRequester
+            else:
+                requester = AsyncRequester
+
+            requester = requester(
+                username,
+                password,
+                baseurl=baseurl,
+                ssl_verify=ssl_verify,
+                cert=cert,
+                timeout=timeout,
+                pool_maxsize=pool_maxsize,
+                coalesce=coalesce,
+            )
+        Jenkins.__init__(
+            self,
+            baseurl,
+            username=username,
+            password=password,
+            requester=requester,
+            lazy=True,
+            timeout=timeout,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.requester.close()
+
+    async def _poll(self, tree=None):
+        url = self.python_api_url(self.baseurl)
+        return await self.get_data(
+            url, tree="jobs[name,color,url]" if not tree else tree
+        )
+
+    @property
+    def jobs(self):
+        if self.jobs_container is None:
+            self.jobs_container = AsyncJobs(self)
+
+        return self.jobs_container
+
+    async def get_job(self, jobname: str) -> "AsyncJob":
+        """
+        Get a polled job by name
+        :param jobname: name of the job, str
+        :return: AsyncJob obj
+        """
+        return await self.jobs.get(jobname)
+
+    def get_job_by_url(self, url: str, job_name: str) -> "AsyncJob":
+        """
+        Get a job by url, without polling it
+        :param url: jobs' url
+        :param jobname: name of the job, str
+        :return: AsyncJob obj
+        """
+        return AsyncJob(url, job_name, self)
+
+    async def has_job(self, jobname: str) -> bool:
+        return await self.jobs.contains(jobname)
+
+    async def get_jobs_list(self) -> List[str]:
+        return await self.jobs.keys()
+
+    async def get_queue_item(self, url: str) -> "AsyncQueueItem":
+        """
+        Get a polled queue item by url
+        """
+        item = AsyncQueueItem(url, self)
+        await item.poll()
+        return item
+
+
+class AsyncJobs(Jobs):
+    """
+    Container-like access to all jobs on the server, with coroutines in
+    place of the blocking dict interface of Jobs.
+    """
+
+    __getitem__ = __contains__ = __len__ = _blocking
+    __delitem__ = __setitem__ = _blocking
+    iteritems = iterkeys = itervalues = _blocking
+
+    async def poll(self, tree="jobs[name,color,url]"):
+        return await self.jenkins.poll(tree=tree)
+
+    async def _get_rows(self) -> List[dict]:
+        if not self._data:
+            self._data = (await self.poll()).get("jobs", [])
+        return self._data
+
+    async def keys(self) -> List[str]:
+        return [self._job_row_name(row) for row in await self._get_rows()]
+
+    async def contains(self, job_name: str) -> bool:
+        await self._get_rows()
+        return self._find_job_row(job_name) is not None
+
+    async def get(self, job_name: str) -> "AsyncJob":
+        """
+        Return a polled AsyncJob by name or full name
+        :raises UnknownJob: when there is no such job
+        """
+        await self._get_rows()
+        job_data = self._find_job_row(job_name)
+        if job_data is None:
+            raise UnknownJob(job_name)
+        job = AsyncJob(job_data["url"], job_data["name"], self.jenkins)
+        await job.poll()
+        return job
+
+    async def values(self, poll: bool = True) -> List["AsyncJob"]:
+        """
+        Return all jobs, polled concurrently unless poll is False
+        """
+        jobs = [
+            AsyncJob(row["url"], row["name"], self.jenkins)
+            for row in await self._get_rows()
+        ]
+        if poll:
+            await asyncio.gather(*(job.poll() for job in jobs))
+        return jobs
+
+    async def items(self, poll: bool = True):
+        jobs = await self.values(poll=poll)
+        return [
+            (self._job_row_name(row), job)
+            for row, job in zip(self._data, jobs)
+        ]
+
+    async def build(self, job_name: str, params=None, **kwargs):
+        """
+        Executes build of a job, see AsyncJob.invoke
+        """
+        job = await self.get(job_name)
+        if params:
+            assert isinstance(params, dict)
+            return await job.invoke(build_params=params, **kwargs)
+
+        return await job.invoke(**kwargs)
+
+
+class AsyncJob(AsyncJenkinsBase, Job):
+    """
+    Represents a jenkins job, accessed with asyncio.
+    """
+
+    def __init__(self, url: str, name: str, jenkins_obj: AsyncJenkins) -> None:
+        Job.__init__(self, url, name, jenkins_obj, poll=False)
+
+    __getitem__ = __len__ = __delitem__ = _blocking
+    _get_build_index = _get_build_url = _load_build_dict = _blocking
+    get_builds = get_build_by_params = delete_build = _blocking
+    get_revision_dict = get_buildnumber_for_revision = _blocking
+    get_test_history = toggle_keep_build = _blocking
+    get_queue_item = has_queued_build = delete_from_queue = _blocking
+    get_config = load_config = update_config = _blocking
+    get_scm_type = get_scm_url = get_scm_branch = _blocking
+    modify_scm_branch = modify_scm_url = _blocking
+    enable = disable = _trigger = _blocking
+    get_upstream_jobs = get_downstream_jobs = _blocking
+
+    async def poll(self, tree=None):
+        data = await AsyncJenkinsBase.poll(self, tree=tree)
+        if not tree:
+            self._data = await self._add_missing_builds(self._data)
+
+        return data
+
+    async def _add_missing_builds(self, data):
+        if self._all_builds_loaded(data):
+            return data
+        response = await self.poll(tree="allBuilds[number,url]")
+        data["builds"] = response["allBuilds"]
+        return data
+
+    async def _buildid_for_type(self, buildtype):
+        data = await self.poll(tree="%s[number]" % buildtype)
+
+        if not data.get(buildtype):
+            raise NoBuildData(buildtype)
+        return data[buildtype]["number"]
+
+    async def get_first_buildnumber(self):
+        return await self._buildid_for_type("firstBuild")
+
+    async def get_last_stable_buildnumber(self):
+        return await self._buildid_for_type("lastStableBuild")
+
+    async def get_last_good_buildnumber(self):
+        return await self._buildid_for_type("lastSuccessfulBuild")
+
+    async def get_last_failed_buildnumber(self):
+        return await self._buildid_for_type("lastFailedBuild")
+
+    async def get_last_buildnumber(self):
+        return await self._buildid_for_type("lastBuild")
+
+    async def get_last_completed_buildnumber(self):
+        return await self._buildid_for_type("lastCompletedBuild")
+
+    async def get_build_dict(self):
+        builds = await self.poll(tree="builds[number,url]")
+        if not builds:
+            raise NoBuildData(repr(self))
+        builds = (await self._add_missing_builds(builds))["builds"]
+        last_build = (await self.poll(tree="lastBuild[number,url]"))[
+            "lastBuild"
+        ]
+        return self._make_build_dict(builds, last_build)
+
+    async def get_build_ids(self):
+        return sorted((await self.get_build_dict()).keys(), reverse=True)
+
+    async def get_build(self, buildnumber: int, depth: int = 1):
+        assert isinstance(buildnumber, int)
+        try:
+            url = (await self.get_build_dict())[buildnumber]
+        except KeyError:
+            raise NotFound("Build #%s not found" % buildnumber)
+        build = AsyncBuild(url, buildnumber, job=self, depth=depth)
+        await build.poll()
+        return build
+
+    async def get_build_metadata(self, buildnumber: int):
+        return await self.get_build(buildnumber, depth=0)
+
+    async def get_last_build(self):
+        return await self.get_build(await self.get_last_buildnumber())
+
+    async def get_last_build_or_none(self):
+        try:
+            return await self.get_last_build()
+        except NoBuildData:
+            return None
+
+    async def get_first_build(self):
+        return await self.get_build(await self.get_first_buildnumber())
+
+    async def get_last_good_build(self):
+        return await self.get_build(await self.get_last_good_buildnumber())
+
+    async def get_last_stable_build(self):
+        return await self.get_build(await self.get_last_stable_buildnumber())
+
+    async def get_last_completed_build(self):
+        return await self.get_build(
+            await self.get_last_completed_buildnumber()
+        )
+
+    async def is_queued(self):
+        data = await self.poll(tree="inQueue")
+        return data.get("inQueue", False)
+
+    async def is_running(self):
+        try:
+            build = await self.get_last_build_or_none()
+            if build is not None:
+                return await build.is_running()
+        except NoBuildData:
+            log.info(
+                "No build info available for %s, assuming not running.",
+                str(self),
+            )
+        return False
+
+    async def is_queued_or_running(self):
+        return await self.is_queued() or await self.is_running()
+
+    async def is_enabled(self):
+        data = await self.poll(tree="color")
+        return "disabled" not in data.get("color", "")
+
+    async def invoke(
+        self,
+        securitytoken=None,
+        block: bool = False,
+        build_params=None,
+        cause=None,
+        files=None,
+        delay: int = 5,
+        quiet_period=None,
+    ) -> "AsyncQueueItem":
+        assert isinstance(block, bool)
+        if self._data is None:
+            await self.poll()
+        url, data, params = self._prepare_invoke(
+            securitytoken, build_params, cause, files, quiet_period
+        )
+        response = await self.jenkins.requester.post_and_confirm_status(
+            url,
+            data=data,
+            params=params,
+            files=files,
+            valid=[200, 201, 303],
+            allow_redirects=False,
+        )
+
+        redirect_url = self._get_queue_item_url(response.headers["location"])
+        qi = await self.jenkins.get_queue_item(redirect_url)
+        if block:
+            await qi.block_until_complete(delay=delay)
+        return qi
+
+
+class AsyncBuild(AsyncJenkinsBase, Build):
+    """
+    Represents a Jenkins build, accessed with asyncio.
+    """
+
+    def __init__(
+        self, url: str, buildno: int, job: AsyncJob, depth: int = 1
+    ) -> None:
+        Build.__init__(self, url, buildno, job, depth=depth, poll=False)
+
+    block = toggle_keep = set_description = get_env_vars = _blocking
+    download_artifacts = extract_artifacts = _blocking
+    stream_logs = follow_logs = _blocking
+    get_resultset = has_resultset = _blocking
+    get_upstream_job = get_upstream_build = _blocking
+    get_master_job = get_master_build = _blocking
+    get_downstream_jobs = get_downstream_builds = get_matrix_runs = _blocking
+
+    async def _poll(self, tree=None):
+        url = self.python_api_url(self.baseurl)
+        return await self.get_data(
+            url, params={"depth": self.depth}, tree=tree
+        )
+
+    async def is_running(self) -> bool:
+        data = await self.poll(tree="building")
+        return data.get("building", False)
+
+    async def is_good(self) -> bool:
+        return (not await self.is_running()) and self._data[
+            "result"
+        ] == "SUCCESS"
+
+    async def block_until_complete(self, delay: int = 15) -> None:
+        count = 0
+        while await self.is_running():
+            log.info(
+                "Waited %is for %s #%s to complete",
+                delay * count,
+                self.job.name,
+                self.name,
+            )
+            await asyncio.sleep(delay)
+            count += 1
+        await self.poll()
+
+    async def get_artifacts(self) -> List[Artifact]:
+        """
+        Return the artifacts of this build. Downloading them is blocking.
+        """
+        data = await self.poll(tree="artifacts[relativePath,fileName]")
+        return [
+            Artifact(
+                afinfo["fileName"],
+                "%s/artifact/%s"
+                % (self.baseurl, quote(afinfo["relativePath"])),
+                self,
+                relative_path=afinfo["relativePath"],
+            )
+            for afinfo in data["artifacts"]
+        ]
+
+    async def get_artifact_dict(self) -> dict[str, Artifact]:
+        return {af.relative_path: af for af in await self.get_artifacts()}
+
+    async def get_console(self) -> str:
+        url = "%s/consoleText" % self.baseurl
+        resp = await self.job.jenkins.requester.get_url(url)
+        return resp.content.decode(resp.encoding or "ISO-8859-1")
+
+    async def stop(self) -> bool:
+        if await self.is_running():
+            url = "%s/stop" % self.baseurl
+            await self.job.jenkins.requester.post_and_confirm_status(
+                url, data="", valid=[302, 200, 500]
+            )
+            return True
+        return False
+
+
+class AsyncQueueItem(AsyncJenkinsBase, QueueItem):
+    """An individual item in the queue, accessed with asyncio"""
+
+    def __init__(self, baseurl: str, jenkins_obj: AsyncJenkins) -> None:
+        QueueItem.__init__(self, baseurl, jenkins_obj, poll=False)
+
+    async def get_build(self) -> AsyncBuild:
+        build_number = self.get_build_number()
+        job = self.get_job()
+        return await job.get_build(build_number)
+
+    async def block_until_building(self, delay=5) -> AsyncBuild:
+        while True:
+            try:
+                await self.poll()
+                return await self.get_build()
+            except NotBuiltYet:
+                await asyncio.sleep(delay)
+                continue
+            except HTTPError as http_error:
+                log.debug(str(http_error))
+                await asyncio.sleep(delay)
+                continue
+
+    async def block_until_complete(self, delay=5) -> AsyncBuild:
+        build = await self.block_until_building(delay)
+        await build.block_until_complete(delay=delay)
+        return build
+
+    async def is_running(self) -> bool:
+        try:
+            return await (await self.get_build()).is_running()
+        except NotBuiltYet:
+            return False
+
+    async def is_queued(self) -> bool:
+        try:
+            self.get_build_number()
+        except NotBuiltYet:
+            return True
+        return False
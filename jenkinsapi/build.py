@@ -10,21 +10,27 @@ Build objects can be associated with Results and Artifacts.
 
 from __future__ import annotations
 
+import os
 import time
+import fnmatch
 import logging
 import warnings
 import datetime
 
 from time import sleep
-from typing import Iterator, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
 
 import pytz
 from jenkinsapi import config
-from jenkinsapi.artifact import Artifact
+from jenkinsapi.artifact import Artifact, DownloadStats
 
 # from jenkinsapi.job import Job
 from jenkinsapi.result_set import ResultSet
 from jenkinsapi.jenkinsbase import JenkinsBase
+from jenkinsapi.log_follower import LogFollower
+from jenkinsapi.utils.zip_stream import _safe_path, extract_zip_stream
+from jenkinsapi.utils.build_cache import BuildCache
 from jenkinsapi.constants import STATUS_SUCCESS
 from jenkinsapi.custom_exceptions import NoResults
 from jenkinsapi.custom_exceptions import JenkinsAPIException
@@ -32,7 +38,6 @@ from jenkinsapi.custom_exceptions import JenkinsAPIException
 from urllib.parse import quote
 from requests import HTTPError
 
-
 log = logging.getLogger(__name__)
 
 
@@ -46,8 +51,27 @@ class Build(JenkinsBase):
         "%s has status %s, and does not have " "any test results"
     )
 
+    # Trees fetched by the accessors of lazy builds
+    PARAMS_TREE = "actions[_class,parameters[name,value]]"
+    VCS_TREE = (
+        "changeSet[kind],changeSets[kind],"
+        "actions[lastBuiltRevision[SHA1,branch[SHA1,name]],"
+        "remoteUrl,remoteUrls]"
+    )
+    CAUSES_TREE = (
+        "actions[causes[_class,shortDescription,userId,userName,"
+        "upstreamProject,upstreamBuild,upstreamUrl]]"
+    )
+    FINGERPRINT_TREE = "fingerprint[usage[name,ranges[ranges[start,end]]]]"
+
     def __init__(
-        self, url: str, buildno: int, job: "Job", depth: int = 1
+        self,
+        url: str,
+        buildno: int,
+        job: "Job",
+        depth: int = 1,
+        poll: bool = True,
+        lazy: bool = False,
     ) -> None:
         """
         depth=1 is for backward compatibility consideration
@@ -56,11 +80,25 @@ class Build(JenkinsBase):
         depth=0 is sufficient for you, don't go up to 1. For more
         information, see
         https://www.jenkins.io/doc/book/using/remote-access-api/#RemoteaccessAPI-Depthcontrol
+
+        A lazy build is not polled on creation: each accessor fetches only
+        the fields it needs, once, and merges them into the build data.
         """
         self.buildno: int = buildno
         self.job: "Job" = job
         self.depth = depth
-        JenkinsBase.__init__(self, url)
+        self.lazy = lazy
+        self._complete = False
+        self._fetched: set[str] = set()
+        JenkinsBase.__init__(self, url, poll=poll and not lazy)
+        if lazy:
+            self._data = {}
+
+    def poll(self, tree=None):
+        data = super(Build, self).poll(tree=tree)
+        if not tree:
+            self._complete = True
+        return data
 
     def _poll(self, tree=None):
         # For builds we need more information for downstream and
@@ -69,7 +107,49 @@ class Build(JenkinsBase):
         url = self.python_api_url(self.baseurl)
         return self.get_data(url, params={"depth": self.depth}, tree=tree)
 
+    def _load_fields(self, tree: str | None = None) -> None:
+        """
+        Fetch the fields of tree a lazy build does not have yet, or all
+        of its data if tree is None. Does nothing for other builds.
+        """
+        if not self.lazy or self._complete:
+            return
+        if tree is None:
+            self.poll()
+            return
+        missing = [
+            field
+            for field in self.split_tree(tree)
+            if field not in self._fetched
+            and field.split("[")[0] not in self._fetched
+        ]
+        if missing:
+            self._merge_fields(missing, self.poll(tree=",".join(missing)))
+
+    def _merge_fields(self, fields: List[str], data: Dict[str, Any]) -> None:
+        """
+        Merge partial build data fetched with the given tree fields.
+        """
+        self._data = self._merge_data(self._data or {}, data)
+        self._fetched.update(fields)
+
+    @classmethod
+    def _merge_data(cls, old: Any, new: Any) -> Any:
+        if isinstance(old, dict) and isinstance(new, dict):
+            merged = dict(old)
+            for key, value in new.items():
+                merged[key] = cls._merge_data(old.get(key), value)
+            return merged
+        if (
+            isinstance(old, list)
+            and isinstance(new, list)
+            and len(old) == len(new)
+        ):
+            return [cls._merge_data(o, n) for o, n in zip(old, new)]
+        return new
+
     def __str__(self) -> str:
+        self._load_fields("fullDisplayName")
         return self._data["fullDisplayName"]
 
     @property
@@ -77,26 +157,33 @@ class Build(JenkinsBase):
         return str(self)
 
     def get_description(self) -> str:
+        self._load_fields("description")
         return self._data["description"]
 
     def get_number(self) -> int:
+        self._load_fields("number")
         return self._data["number"]
 
     def get_status(self) -> str:
+        self._load_fields("result")
         return self._data["result"]
 
     def get_slave(self) -> str:
+        self._load_fields("builtOn")
         return self._data["builtOn"]
 
     def get_revision(self) -> str:
+        self._load_fields(self.VCS_TREE)
         return getattr(self, f"_get_{self._get_vcs()}_rev", lambda: "")()
 
     def get_revision_branch(self) -> str:
+        self._load_fields(self.VCS_TREE)
         return getattr(
             self, f"_get_{self._get_vcs()}_rev_branch", lambda: ""
         )()
 
     def get_repo_url(self) -> str:
+        self._load_fields(self.VCS_TREE)
         return getattr(self, f"_get_{self._get_vcs()}_repo_url", lambda: "")()
 
     def get_params(self) -> dict[str, str]:
@@ -109,6 +196,7 @@ class Build(JenkinsBase):
         #     {'_class': 'hudson.model.StringParameterValue',
         #      'value': '12',
         #      'name': 'FOO_BAR_BAZ'}]}
+        self._load_fields(self.PARAMS_TREE)
         actions = self._data.get("actions")
         if actions:
             parameters = {}
@@ -145,6 +233,7 @@ class Build(JenkinsBase):
             "user": "username"
         }
         """
+        self._load_fields()
         if "changeSet" in self._data:
             if "items" in self._data["changeSet"]:
                 return self._data["changeSet"]["items"]
@@ -200,9 +289,11 @@ class Build(JenkinsBase):
         return result
 
     def get_duration(self) -> datetime.timedelta:
+        self._load_fields("duration")
         return datetime.timedelta(milliseconds=self._data["duration"])
 
     def get_build_url(self) -> str:
+        self._load_fields("url")
         return self._data["url"]
 
     def get_artifacts(self) -> Iterator[Artifact]:
@@ -223,6 +314,115 @@ class Build(JenkinsBase):
     def get_artifact_dict(self) -> dict[str, Artifact]:
         return {af.relative_path: af for af in self.get_artifacts()}
 
+    def download_artifacts(
+        self,
+        dirpath: str,
+        artifacts: Iterable[Artifact] | None = None,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        resume: bool = True,
+        progress: Callable[[DownloadStats], Any] | None = None,
+    ) -> Dict[str, str]:
+        """
+        Download artifacts of this build concurrently to dirpath, keeping
+        their relative paths. Interrupted downloads are resumed, see
+        Artifact.download(). Downloads are not verified against their
+        fingerprints.
+
+        Use a requester with a pool_maxsize of at least workers to keep a
+        connection per worker alive.
+
+        :param artifacts: the artifacts to download, all by default
+        :param workers: number of concurrent downloads,
+            ARTIFACT_WORKERS of jenkinsapi.config by default
+        :param progress: callable receiving a DownloadStats for all of the
+            downloads after every chunk written, from the threads
+            downloading
+        :return: dict of relative paths to the paths downloaded to,
+            artifacts whose path leads outside of dirpath are skipped
+        """
+        if artifacts is None:
+            artifacts = self.get_artifacts()
+        targets = []
+        for artifact in artifacts:
+            relative_path = artifact.relative_path or artifact.filename
+            fspath = _safe_path(dirpath, relative_path)
+            if fspath is None:
+                log.warning(
+                    "Not downloading %s outside of %s", relative_path, dirpath
+                )
+                continue
+            targets.append((artifact, relative_path, fspath))
+        stats = DownloadStats(len(targets))
+
+        def download(target: Tuple[Artifact, str, str]) -> Tuple[str, str]:
+            artifact, relative_path, fspath = target
+            os.makedirs(os.path.dirname(fspath), exist_ok=True)
+            artifact.download(
+                fspath,
+                chunk_size=chunk_size,
+                resume=resume,
+                progress=progress,
+                stats=stats,
+            )
+            return relative_path, fspath
+
+        workers = workers or config.ARTIFACT_WORKERS
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            downloaded = dict(executor.map(download, targets))
+        log.info(
+            "Downloaded %i artifacts of %s, %i bytes in %.1fs",
+            len(downloaded),
+            self,
+            stats.bytes_done,
+            stats.elapsed,
+        )
+        return downloaded
+
+    def extract_artifacts(
+        self,
+        dirpath: str,
+        include: Callable[[str], bool] | str | Iterable[str] | None = None,
+        chunk_size: int | None = None,
+    ) -> Dict[str, str]:
+        """
+        Download all artifacts of this build as a single zip archive and
+        extract them to dirpath while downloading, keeping their relative
+        paths. This saves a request per artifact, which matters for
+        builds with many small artifacts. The archive is never written to
+        disk.
+
+        :param include: glob pattern, list of them, or callable returning
+            whether an artifact is extracted by its relative path; all
+            are by default
+        :param chunk_size: bytes read at a time, ARTIFACT_CHUNK_SIZE of
+            jenkinsapi.config by default
+        :return: dict of relative paths to the paths extracted to
+        """
+        if isinstance(include, str):
+            include = [include]
+        if include is not None and not callable(include):
+            patterns = list(include)
+
+            def include(path: str) -> bool:
+                return any(fnmatch.fnmatchcase(path, p) for p in patterns)
+
+        url = "%s/artifact/*zip*/archive.zip" % self.baseurl
+        response = self.get_jenkins_obj().requester.get_and_confirm_status(
+            url, stream=True
+        )
+        try:
+            return extract_zip_stream(
+                response.iter_content(
+                    chunk_size=chunk_size or config.ARTIFACT_CHUNK_SIZE
+                ),
+                dirpath,
+                include=include,
+                strip_prefix="archive/",
+            )
+        finally:
+            response.close()
+
     def get_upstream_job_name(self) -> str | None:
         """
         Get the upstream job name if it exist, None otherwise
@@ -326,6 +526,7 @@ class Build(JenkinsBase):
         """
         downstream_job_names: List[str] = self.job.get_downstream_job_names()
         downstream_names: List[str] = []
+        self._load_fields(self.FINGERPRINT_TREE)
         try:
             fingerprints = self._data["fingerprint"]
             for fingerprint in fingerprints:
@@ -343,6 +544,7 @@ class Build(JenkinsBase):
         """
         downstream_job_names: List[str] = self.get_downstream_job_names()
         downstream_builds: List[Build] = []
+        self._load_fields(self.FINGERPRINT_TREE)
         try:  # pylint: disable=R1702
             fingerprints = self._data["fingerprint"]
             for fingerprint in fingerprints:
@@ -366,6 +568,7 @@ class Build(JenkinsBase):
         matrix configuration
         :return: Generator of Build
         """
+        self._load_fields("number,runs[number,url]")
         if "runs" in self._data:
             for rinfo in self._data["runs"]:
                 number: int = rinfo["number"]
@@ -388,9 +591,10 @@ class Build(JenkinsBase):
         Return a bool, true if the build was good.
         If the build is still running, return False.
         """
-        return (not self.is_running()) and self._data[
-            "result"
-        ] == STATUS_SUCCESS
+        if self.is_running():
+            return False
+        self._load_fields("result")
+        return self._data["result"] == STATUS_SUCCESS
 
     def block_until_complete(self, delay: int = 15) -> None:
         count: int = 0
@@ -410,15 +614,29 @@ class Build(JenkinsBase):
         """
         Return the URL for the object which provides the job's result summary.
         """
+        self._load_fields("url")
         url_tpl: str = r"%stestReport/%s"
         return url_tpl % (self._data["url"], config.JENKINS_API)
 
-    def get_resultset(self) -> ResultSet:
+    def get_resultset(
+        self,
+        fields: Iterable[str] | None = None,
+        statuses: Iterable[str] | None = None,
+        summary: bool = False,
+    ) -> ResultSet:
         """
         Obtain detailed results for this build.
 
         Raises NoResults if the build has no results.
 
+        To only fetch what the failures are, for instance:
+        get_resultset(ResultSet.FAILURE_FIELDS, ResultSet.FAILED_STATUSES)
+
+        :param fields: only fetch these fields of the test cases,
+            default all of them, stdout and stack traces included
+        :param statuses: only keep the test cases with these statuses
+        :param summary: only fetch the counts of the report, see
+            ResultSet.get_counts()
         :return: ResultSet
         """
         result_url: str = self.get_result_url()
@@ -431,7 +649,13 @@ class Build(JenkinsBase):
             raise NoResults(
                 self.STR_TPL_NOTESTS_ERR % (str(self), buildstatus)
             )
-        return ResultSet(result_url, build=self)
+        return ResultSet(
+            result_url,
+            build=self,
+            fields=fields,
+            statuses=statuses,
+            summary=summary,
+        )
 
     def has_resultset(self) -> bool:
         """
@@ -440,6 +664,7 @@ class Build(JenkinsBase):
         return self.STR_TOTALCOUNT in self.get_actions()
 
     def get_actions(self) -> Dict[str, Any]:
+        self._load_fields()
         all_actions: Dict[str, Any] = {}
         for dct_action in self._data["actions"]:
             if dct_action is None:
@@ -454,6 +679,7 @@ class Build(JenkinsBase):
         aborted, Jenkins could add an empty causes list to the actions
         dict. Empty ones are ignored.
         """
+        self._load_fields(self.CAUSES_TREE)
         all_causes: List[str] = []
         for dct_action in self._data["actions"]:
             if dct_action is None:
@@ -467,6 +693,7 @@ class Build(JenkinsBase):
         Returns build timestamp in UTC
         """
         # Java timestamps are given in miliseconds since the epoch start!
+        self._load_fields("timestamp")
         naive_timestamp = datetime.datetime(
             *time.gmtime(self._data["timestamp"] / 1000.0)[:6]
         )
@@ -493,31 +720,28 @@ class Build(JenkinsBase):
         """
         Return generator which streams parts of text console.
         """
-        url: str = "%s/logText/progressiveText" % self.baseurl
-        size: int = 0
-        more_data: bool = True
-        while more_data:
-            resp = self.job.jenkins.requester.get_url(
-                url, params={"start": size}
-            )
-            content = resp.content
-            if content:
-                if isinstance(content, str):
-                    yield content
-                elif isinstance(content, bytes):
-                    yield content.decode(resp.encoding or "ISO-8859-1")
-                else:
-                    raise JenkinsAPIException(
-                        "Unknown content type for console"
-                    )
-            size = resp.headers["X-Text-Size"]
-            more_data = resp.headers.get("X-More-Data")
-            sleep(interval)
+        follower = self.follow_logs(
+            min_interval=interval, max_interval=interval
+        )
+        return follower.iter_text()
+
+    def follow_logs(self, offset: int = 0, **kwargs: Any) -> LogFollower:
+        """
+        Return a LogFollower streaming the text console from byte offset
+        onwards, as bytes, text or lines, until the build has finished.
+        Unlike get_console() the log never has to fit in memory.
+
+        :param offset: byte offset to resume from, see LogFollower.offset
+        :param kwargs: min_interval, max_interval, backoff, chunk_size
+            and tee, see LogFollower
+        """
+        return LogFollower(self, offset=offset, **kwargs)
 
     def get_estimated_duration(self) -> int | None:
         """
         Return the estimated build duration (in seconds) or none.
         """
+        self._load_fields("estimatedDuration")
         try:
             eta_ms = self._data["estimatedDuration"]
             return max(0, eta_ms / 1000.0)
@@ -569,7 +793,25 @@ class Build(JenkinsBase):
         """
         url: str = "%s/toggleLogKeep" % self.baseurl
         self.get_jenkins_obj().requester.post_and_confirm_status(url, data={})
+        self._drop_from_build_cache()
         self._data = self._poll()
 
+    def set_description(self, description: str) -> None:
+        """
+        Set the description of this build
+        """
+        url: str = "%s/submitDescription" % self.baseurl
+        self.get_jenkins_obj().requester.post_and_confirm_status(
+            url, data={"description": description}
+        )
+        self._drop_from_build_cache()
+        self._data = self._poll()
+
+    def _drop_from_build_cache(self) -> None:
+        build_cache = getattr(self.get_jenkins_obj(), "build_cache", None)
+        if isinstance(build_cache, BuildCache):
+            build_cache.invalidate(self.baseurl)
+
     def is_kept_forever(self) -> bool:
+        self._load_fields("keepLog")
         return self._data["keepLog"]
@@ -0,0 +1,438 @@
+"""
+Wait for many queue items and builds at once.
+
+Instead of one sleep loop per object, a BuildWaiter polls everything it
+tracks together: the queue once for all queue items, the executors once
+for the items which left the queue, and the recent builds of each job
+once for all of its builds. Running builds are polled again around the
+time their estimatedDuration says they will finish, everything else
+with an exponential backoff.
+"""
+
+from __future__ import annotations
+
+import time
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future
+from concurrent.futures import wait as futures_wait
+from typing import Any, Callable, Dict, Iterable, List
+
+from requests import HTTPError
+
+from jenkinsapi.build import Build
+from jenkinsapi.job import Job
+from jenkinsapi.queue import QueueItem
+from jenkinsapi.custom_exceptions import JenkinsAPIException, TimeOut
+
+log = logging.getLogger(__name__)
+
+UNTIL_BUILDING = "building"
+UNTIL_COMPLETE = "complete"
+
+
+class _Tracked(object):
+    """A queue item or build waited for, and when to poll it next."""
+
+    __slots__ = (
+        "future",
+        "job",
+        "until",
+        "queue_id",
+        "number",
+        "due",
+        "interval",
+    )
+
+    def __init__(
+        self,
+        job: Job,
+        until: str,
+        interval: float,
+        queue_id: int | None = None,
+        number: int | None = None,
+    ) -> None:
+        self.future: Future = Future()
+        self.job = job
+        self.until = until
+        self.queue_id = queue_id
+        self.number = number
+        self.due = 0.0
+        self.interval = interval
+
+
+class BuildWaiter(object):
+    """
+    Tracks queue items and builds until they start or complete, and
+    resolves a Future with the Build for each of them as it does.
+
+    Either call wait(), which polls in the calling thread, or start() to
+    poll in a background thread and use the futures.
+
+    :param min_interval: seconds between the first polls of an object
+    :param max_interval: longest time an object is not polled
+    :param backoff: factor the interval grows by while nothing changes
+    :param builds_window: number of recent builds fetched per job
+    """
+
+    BUILD_FIELDS = (
+        "number,url,queueId,building,result,timestamp,estimatedDuration"
+    )
+
+    def __init__(
+        self,
+        jenkins: Any,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0,
+        backoff: float = 2.0,
+        builds_window: int = 50,
+    ) -> None:
+        self.jenkins = jenkins
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = backoff
+        self.builds_window = builds_window
+        self.requests = 0
+        self._tracked: List[_Tracked] = []
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._tracked)
+
+    def _track(
+        self, tracked: _Tracked, callback: Callable[[Future], Any] | None
+    ) -> Future:
+        if callback is not None:
+            tracked.future.add_done_callback(callback)
+        with self._lock:
+            self._tracked.append(tracked)
+        self._wakeup.set()
+        return tracked.future
+
+    def add_build(
+        self, build: Build, callback: Callable[[Future], Any] | None = None
+    ) -> Future:
+        """
+        Wait for a build to complete. The Future resolves to the build,
+        with its result and duration updated.
+
+        :param callback: called with the Future once it is resolved
+        """
+        tracked = _Tracked(
+            build.job,
+            UNTIL_COMPLETE,
+            self.min_interval,
+            number=build.buildno,
+        )
+        return self._track(tracked, callback)
+
+    def add_queue_item(
+        self,
+        queue_item: QueueItem,
+        until: str = UNTIL_COMPLETE,
+        callback: Callable[[Future], Any] | None = None,
+    ) -> Future:
+        """
+        Wait for the build of a queue item to start, with
+        until="building", or to complete. The Future resolves to the
+        build, or raises JenkinsAPIException if the item was cancelled.
+
+        :param callback: called with the Future once it is resolved
+        """
+        task = queue_item._data["task"]
+        job = Job(task["url"], task["name"], self.jenkins, poll=False)
+        return self.add_queue_id(job, queue_item.queue_id, until, callback)
+
+    def add_queue_id(
+        self,
+        job: Job,
+        queue_id: int,
+        until: str = UNTIL_COMPLETE,
+        callback: Callable[[Future], Any] | None = None,
+    ) -> Future:
+        """
+        Same as add_queue_item(), given the job and id of a queue item.
+        """
+        assert until in (UNTIL_BUILDING, UNTIL_COMPLETE), until
+        tracked = _Tracked(job, until, self.min_interval, queue_id=queue_id)
+        return self._track(tracked, callback)
+
+    def add_job(
+        self, job: Job, callback: Callable[[Future], Any] | None = None
+    ) -> Future:
+        """
+        Wait for whatever a job has queued or running to complete. The
+        Future resolves to the last build, or None if the job has none.
+
+        :param callback: called with the Future once it is resolved
+        """
+        data = self._get(
+            job.baseurl,
+            "inQueue,queueItem[id],lastBuild[number,url,building]",
+        )
+        last_build = data.get("lastBuild") or {}
+        if data.get("inQueue") and data.get("queueItem"):
+            tracked = _Tracked(
+                job,
+                UNTIL_COMPLETE,
+                self.min_interval,
+                queue_id=data["queueItem"]["id"],
+            )
+        elif last_build.get("building"):
+            tracked = _Tracked(
+                job,
+                UNTIL_COMPLETE,
+                self.min_interval,
+                number=last_build["number"],
+            )
+        else:
+            future: Future = Future()
+            if callback is not None:
+                future.add_done_callback(callback)
+            future.set_result(
+                Build(last_build["url"], last_build["number"], job, lazy=True)
+                if last_build
+                else None
+            )
+            return future
+        return self._track(tracked, callback)
+
+    def _get(self, url: str, tree: str) -> Dict[str, Any]:
+        self.requests += 1
+        return self.jenkins.get_data(
+            self.jenkins.python_api_url(url), tree=tree
+        )
+
+    def poll(self) -> float | None:
+        """
+        Poll whatever is due once. Returns the seconds until the next
+        poll is due, or None once nothing is tracked anymore.
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [t for t in self._tracked if t.due <= now]
+        if due:
+            self._poll(due)
+        with self._lock:
+            self._tracked = [t for t in self._tracked if not t.future.done()]
+            if not self._tracked:
+                return None
+            next_due = min(t.due for t in self._tracked)
+        return max(0.0, next_due - time.monotonic())
+
+    def _poll(self, due: List[_Tracked]) -> None:
+        by_job: Dict[str, List[_Tracked]] = defaultdict(list)
+        queued = []
+        for tracked in due:
+            if tracked.number is None:
+                queued.append(tracked)
+            else:
+                by_job[tracked.job.baseurl].append(tracked)
+        if queued:
+            queue_url = self.jenkins.get_queue_url()
+            items = self._get(queue_url, "items[id]").get("items", [])
+            waiting = {item["id"] for item in items}
+            left = []
+            for tracked in queued:
+                if tracked.queue_id in waiting:
+                    self._reschedule(tracked)
+                else:
+                    left.append(tracked)
+            running = self._running_builds() if left else {}
+            for tracked in left:
+                if tracked.queue_id in running:
+                    self._update(tracked, running[tracked.queue_id])
+                else:
+                    by_job[tracked.job.baseurl].append(tracked)
+
+        for job_url, job_tracked in by_job.items():
+            try:
+                rows = self._get(
+                    job_url,
+                    "builds[%s]{0,%i}"
+                    % (self.BUILD_FIELDS, self.builds_window),
+                ).get("builds", [])
+            except HTTPError as err:
+                log.warning("Could not poll builds of %s: %s", job_url, err)
+                for tracked in job_tracked:
+                    self._reschedule(tracked)
+                continue
+            by_number = {row["number"]: row for row in rows}
+            by_queue_id = {row.get("queueId"): row for row in rows}
+            for tracked in job_tracked:
+                if tracked.number is None:
+                    row = by_queue_id.get(tracked.queue_id)
+                    if row is None:
+                        row = self._left_queue(tracked)
+                else:
+                    row = by_number.get(tracked.number)
+                    if row is None:
+                        row = self._get(
+                            "%s/%i" % (job_url.rstrip("/"), tracked.number),
+                            self.BUILD_FIELDS,
+                        )
+                if row is not None:
+                    self._update(tracked, row)
+
+    def _running_builds(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Return the builds running on any executor by their queue id.
+        """
+        executable = "currentExecutable[%s]" % self.BUILD_FIELDS
+        data = self._get(
+            "%s/computer" % self.jenkins.baseurl,
+            "computer[executors[%s],oneOffExecutors[%s]]"
+            % (executable, executable),
+        )
+        running = {}
+        for computer in data.get("computer", []):
+            for executor in computer.get("executors", []) + computer.get(
+                "oneOffExecutors", []
+            ):
+                row = (executor or {}).get("currentExecutable")
+                if row and row.get("queueId") is not None:
+                    running[row["queueId"]] = row
+        return running
+
+    def _left_queue(self, tracked: _Tracked) -> Dict[str, Any] | None:
+        """
+        Look up a queue item which is not waiting anymore, but whose build
+        was not found among the recent builds of its job.
+        """
+        url = "%s/item/%i" % (self.jenkins.get_queue_url(), tracked.queue_id)
+        try:
+            data = self._get(url, "cancelled,executable[number,url]")
+        except HTTPError as err:
+            log.debug("Queue item %s: %s", tracked.queue_id, err)
+            data = {}
+        if data.get("cancelled"):
+            tracked.future.set_exception(
+                JenkinsAPIException(
+                    "Queue item %i of %s was cancelled"
+                    % (tracked.queue_id, tracked.job.name)
+                )
+            )
+            return None
+        executable = data.get("executable")
+        if executable:
+            tracked.number = executable["number"]
+            return {
+                "number": executable["number"],
+                "url": executable["url"],
+                "building": True,
+            }
+        self._reschedule(tracked)
+        return None
+
+    def _update(self, tracked: _Tracked, row: Dict[str, Any]) -> None:
+        if tracked.number is None:
+            tracked.number = row["number"]
+            tracked.interval = self.min_interval
+        building = row.get("building", True)
+        if tracked.until == UNTIL_BUILDING or not building:
+            build = Build(
+                row.get("url")
+                or "%s/%i/" % (tracked.job.baseurl.rstrip("/"), row["number"]),
+                row["number"],
+                tracked.job,
+                lazy=True,
+            )
+            build._merge_fields(list(row), row)
+            tracked.future.set_result(build)
+            return
+        self._reschedule(tracked, row)
+
+    def _reschedule(
+        self, tracked: _Tracked, row: Dict[str, Any] | None = None
+    ) -> None:
+        now = time.monotonic()
+        estimated = (row or {}).get("estimatedDuration", -1)
+        if estimated > 0 and row.get("timestamp"):
+            remaining = (row["timestamp"] + estimated) / 1000.0 - time.time()
+            if remaining > tracked.interval:
+                # Not expected to finish earlier, don't poll before
+                tracked.due = now + min(remaining, self.max_interval)
+                return
+        tracked.due = now + tracked.interval
+        tracked.interval = min(
+            tracked.interval * self.backoff, self.max_interval
+        )
+
+    def wait(
+        self,
+        futures: Iterable[Future] | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Poll in the calling thread until the given futures, or all that
+        are tracked, are resolved. Raises TimeOut after timeout seconds.
+        """
+        futures = list(futures) if futures is not None else None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if futures is not None and all(f.done() for f in futures):
+                return
+            if self._thread is None:
+                delay = self.poll()
+            else:
+                delay = self.max_interval if len(self) else None
+            if delay is None:
+                return
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    with self._lock:
+                        pending = {
+                            t.job.name
+                            for t in self._tracked
+                            if futures is None or t.future in futures
+                        }
+                    raise TimeOut(
+                        "Waited too long for builds of %s"
+                        % ", ".join(sorted(pending))
+                    )
+                delay = min(delay, left)
+            if self._thread is None:
+                time.sleep(delay)
+            else:
+                with self._lock:
+                    waiting = futures or [t.future for t in self._tracked]
+                self._wait_futures(waiting, delay)
+
+    @staticmethod
+    def _wait_futures(futures: List[Future], timeout: float) -> None:
+        pending = [future for future in futures if not future.done()]
+        if pending:
+            futures_wait(pending, timeout, return_when=FIRST_COMPLETED)
+
+    def start(self) -> None:
+        """
+        Poll in a daemon thread from now on, as long as anything is
+        tracked.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="BuildWaiter", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                delay = self.poll()
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Polling builds failed")
+                delay = self.max_interval
+            if delay is None:
+                with self._lock:
+                    if not self._tracked:
+                        self._thread = None
+                        return
+                delay = 0
+            self._wakeup.wait(delay)
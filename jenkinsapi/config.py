@@ -2,6 +2,41 @@
 Jenkins configuration
 """
 
-JENKINS_API = r"api/python"
+JENKINS_API = r"api/json"
+
+# Legacy endpoint, parsed with ast.literal_eval. Set
+# JENKINS_API = JENKINS_PYTHON_API to restore the old behaviour.
+JENKINS_PYTHON_API = r"api/python"
+
+# Decoder used for JSON responses: None picks the fastest installed
+# library (orjson, ujson, json), a name from
+# jenkinsapi.utils.json_decoder.DECODER_LOADERS or any callable
+# accepting the response text may be given instead.
+JSON_DECODER = None
 
 LOAD_TIMEOUT = 30
+
+# Number of folders listed in parallel when resolving jobs inside
+# folders. 1 lists them one after the other.
+FOLDER_WORKERS = 8
+
+# When above 0, jobs inside folders are first fetched with a single
+# request nesting jobs[...] that many levels deep; deeper folders are
+# then listed as above.
+FOLDER_TREE_DEPTH = 0
+
+# Artifacts are downloaded in chunks of this many bytes, and this many at
+# a time by Build.download_artifacts().
+ARTIFACT_CHUNK_SIZE = 2**20
+ARTIFACT_WORKERS = 4
+
+# When True, the MD5 and fingerprint validation of every artifact saved
+# are recorded in a hidden file in its directory, so that unchanged
+# files are neither hashed nor validated against Jenkins again.
+ARTIFACT_FINGERPRINT_CACHE = False
+
+# Number of build triggers posted at a time by Jenkins.build_jobs().
+TRIGGER_WORKERS = 8
+
+# Number of test reports fetched at a time by Job.get_test_history().
+TEST_HISTORY_WORKERS = 8
@@ -17,20 +17,27 @@ class Executor(JenkinsBase):
     """
 
     def __init__(
-        self, baseurl: str, nodename: str, jenkins_obj: "Jenkins", number: int
+        self,
+        baseurl: str,
+        nodename: str,
+        jenkins_obj: "Jenkins",
+        number: int,
+        poll: bool = True,
     ) -> None:
         """
         Init a node object by providing all relevant pointers to it
         :param baseurl: basic url for querying information on a node
         :param nodename: hostname of the node
         :param jenkins_obj: ref to the jenkins obj
+        :param poll: set to False to not fetch the executor until one of
+            its accessors is called
         :return: Node obj
         """
         self.nodename: str = nodename
         self.number: int = number
         self.jenkins: "Jenkins" = jenkins_obj
         self.baseurl: str = baseurl
-        JenkinsBase.__init__(self, baseurl)
+        JenkinsBase.__init__(self, baseurl, poll=poll)
 
     def __str__(self) -> str:
         return f"{self.nodename} {self.number}"
@@ -65,3 +72,45 @@ class Executor(JenkinsBase):
         Returns the current Queue.Task this executor is running.
         """
         return self.poll(tree="currentExecutable")["currentExecutable"]
+
+
+class ExecutorRecord(object):
+    """
+    The state of one executor as read from a node or nodes snapshot,
+    without polling the executor itself.
+    """
+
+    # Fields of an executor fetched with the executors of a node
+    TREE = "number,idle,likelyStuck,progress,currentExecutable[url,number]"
+
+    __slots__ = (
+        "nodename",
+        "number",
+        "idle",
+        "likely_stuck",
+        "progress",
+        "current_executable",
+        "one_off",
+    )
+
+    def __init__(self, nodename: str, row: dict, one_off: bool = False):
+        self.nodename: str = nodename
+        self.number: int | None = row.get("number")
+        self.idle: bool = row.get("idle", True)
+        self.likely_stuck: bool = row.get("likelyStuck", False)
+        self.progress: int = row.get("progress", -1)
+        self.current_executable: dict | None = row.get("currentExecutable")
+        self.one_off: bool = one_off
+
+    def __repr__(self) -> str:
+        return "<%s.%s %s %s>" % (
+            self.__class__.__module__,
+            self.__class__.__name__,
+            self.nodename,
+            self.number,
+        )
+
+    @property
+    def build_url(self) -> str | None:
+        """Url of the build this executor is running, if any."""
+        return (self.current_executable or {}).get("url")
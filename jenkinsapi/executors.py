@@ -9,7 +9,7 @@ from __future__ import annotations
 import logging
 from typing import Iterator
 
-from jenkinsapi.executor import Executor
+from jenkinsapi.executor import Executor, ExecutorRecord
 from jenkinsapi.jenkinsbase import JenkinsBase
 
 log: logging.Logger = logging.getLogger(__name__)
@@ -21,8 +21,17 @@ class Executors(JenkinsBase):
     access to all executors on a Jenkins node.
 
     Returns a list of Executor Objects.
+
+    The node is fetched once with the state of all its executors, which
+    records(), find_idle() and find_stuck() read without polling any
+    executor.
     """
 
+    TREE = "numExecutors,executors[%s],oneOffExecutors[%s]" % (
+        ExecutorRecord.TREE,
+        ExecutorRecord.TREE,
+    )
+
     def __init__(
         self, baseurl: str, nodename: str, jenkins: "Jenkins"
     ) -> None:
@@ -31,6 +40,9 @@ class Executors(JenkinsBase):
         JenkinsBase.__init__(self, baseurl)
         self.count: int = self._data["numExecutors"]
 
+    def _poll(self, tree=None):
+        return super()._poll(tree=tree or self.TREE)
+
     def __str__(self) -> str:
         return f"Executors @ {self.baseurl}"
 
@@ -40,4 +52,30 @@ class Executors(JenkinsBase):
     def __iter__(self) -> Iterator[Executor]:
         for index in range(self.count):
             executor_url = "%s/executors/%s" % (self.baseurl, index)
-            yield Executor(executor_url, self.nodename, self.jenkins, index)
+            yield Executor(
+                executor_url, self.nodename, self.jenkins, index, poll=False
+            )
+
+    def records(self) -> list[ExecutorRecord]:
+        """
+        Return the state of the executors, one-off executors included, as
+        of the last poll.
+        """
+        return [
+            ExecutorRecord(self.nodename, row or {}, one_off=one_off)
+            for key, one_off in (
+                ("executors", False),
+                ("oneOffExecutors", True),
+            )
+            for row in self._data.get(key, [])
+        ]
+
+    def find_idle(self) -> list[ExecutorRecord]:
+        return [
+            record
+            for record in self.records()
+            if record.idle and not record.one_off
+        ]
+
+    def find_stuck(self) -> list[ExecutorRecord]:
+        return [record for record in self.records() if record.likely_stuck]
@@ -4,9 +4,12 @@ Module for jenkinsapi Jenkins object
 
 from __future__ import annotations
 
+import os
 import time
 import logging
+import threading
 import warnings
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 
 from urllib.parse import urlparse
 from urllib.request import Request, HTTPRedirectHandler, build_opener
@@ -16,6 +19,8 @@ from urllib.parse import urlencode
 from requests import HTTPError, ConnectionError
 
 from jenkinsapi import config
+from jenkinsapi.build import Build
+from jenkinsapi.build_waiter import BuildWaiter, UNTIL_BUILDING
 from jenkinsapi.credentials import Credentials
 from jenkinsapi.credentials import Credentials2x
 from jenkinsapi.credentials import CredentialsById
@@ -28,15 +33,20 @@ from jenkinsapi.node import Node
 from jenkinsapi.nodes import Nodes
 from jenkinsapi.plugins import Plugins
 from jenkinsapi.plugin import Plugin
+from jenkinsapi.utils.build_cache import BuildCache
 from jenkinsapi.utils.requester import Requester
 from jenkinsapi.views import Views
 from jenkinsapi.queue import Queue
+from jenkinsapi.sync import JenkinsSync
 from jenkinsapi.fingerprint import Fingerprint
 from jenkinsapi.jenkinsbase import JenkinsBase
-from jenkinsapi.custom_exceptions import JenkinsAPIException
+from jenkinsapi.custom_exceptions import (
+    JenkinsAPIException,
+    TimeOut,
+    UnknownJob,
+)
 from jenkinsapi.utils.crumb_requester import CrumbRequester
 
-
 log = logging.getLogger(__name__)
 
 
@@ -58,11 +68,30 @@ class Jenkins(JenkinsBase):
         timeout: int = 10,
         use_crumb: bool = True,
         max_retries=None,
+        cache=None,
+        pool_maxsize=None,
+        pool_block=False,
+        build_cache=None,
+        coalesce=False,
     ) -> None:
         """
         :param baseurl: baseurl for jenkins instance including port, str
         :param username: username for jenkins auth, str
         :param password: password for jenkins auth, str
+        :param cache: True to cache API responses in the process-wide
+            ResponseCache, or a ResponseCache instance, default disabled
+        :param max_retries: number of retries or a retry policy, see
+            jenkinsapi.utils.requester.retry_policy
+        :param pool_maxsize: connections kept alive, at least the number
+            of threads sharing this object, int
+        :param pool_block: wait for a free connection rather than opening
+            extra ones, bool
+        :param build_cache: path of a database to keep the data of
+            completed builds in across runs, str or os.PathLike, or a
+            BuildCache instance, default disabled
+        :param coalesce: share the response of identical GET requests
+            made from several threads at once, see
+            jenkinsapi.utils.single_flight, default disabled
         :return: a Jenkins obj
         """
         self.username = username
@@ -81,13 +110,21 @@ class Jenkins(JenkinsBase):
                 cert=cert,
                 timeout=timeout,
                 max_retries=max_retries,
+                cache=cache,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+                coalesce=coalesce,
             )
         else:
             self.requester = requester
 
         self.requester.timeout = timeout
+        if isinstance(build_cache, (str, os.PathLike)):
+            build_cache = BuildCache(build_cache)
+        self.build_cache = build_cache
         self.lazy = lazy
         self.jobs_container = None
+        self._lock = threading.RLock()
         JenkinsBase.__init__(self, baseurl, poll=not lazy)
 
     def _poll(self, tree=None):
@@ -98,7 +135,9 @@ class Jenkins(JenkinsBase):
 
     def _poll_if_needed(self):
         if self.lazy and self._data is None:
-            self.poll()
+            with self._lock:
+                if self._data is None:
+                    self.poll()
 
     def _clone(self):
         return Jenkins(
@@ -106,6 +145,7 @@ class Jenkins(JenkinsBase):
             username=self.username,
             password=self.password,
             requester=self.requester,
+            build_cache=self.build_cache,
         )
 
     def base_server_url(self):
@@ -144,7 +184,9 @@ class Jenkins(JenkinsBase):
     @property
     def jobs(self):
         if self.jobs_container is None:
-            self.jobs_container = Jobs(self)
+            with self._lock:
+                if self.jobs_container is None:
+                    self.jobs_container = Jobs(self)
 
         return self.jobs_container
 
@@ -221,6 +263,113 @@ class Jenkins(JenkinsBase):
         """
         self[jobname].invoke(build_params=params or {})
 
+    # Only what Job.has_params() looks at, to pick the trigger url
+    TRIGGER_TREE = (
+        "actions[parameterDefinitions[name]],"
+        "property[parameterDefinitions[name]]"
+    )
+
+    def build_jobs(
+        self,
+        jobs,
+        workers: int | None = None,
+        rate: float | None = None,
+        until: str = UNTIL_BUILDING,
+        timeout: float | None = None,
+        **kwargs,
+    ) -> list[Build | Exception]:
+        """
+        Trigger many jobs at once and wait for their builds.
+
+        Triggers are posted from a pool of threads and the queue items
+        they create are all followed by one BuildWaiter, which polls a
+        single queue snapshot for all of them.
+
+        :param jobs: job names, (name, params) pairs or a dict of job
+            names to their params. A job may be given several times
+        :param workers: triggers posted at a time, default
+            config.TRIGGER_WORKERS
+        :param rate: most triggers posted per second, default unlimited
+        :param until: "building" to return once every build started,
+            "complete" once every build finished
+        :param timeout: seconds to wait for the builds, the builds not
+            there by then are given as TimeOut
+        :param kwargs: passed on like to Job.invoke(), such as
+            securitytoken, cause or quiet_period
+        :return: list with an entry per job given, in the same order:
+            the Build of that trigger, or the exception raised while
+            triggering or waiting for it. A list rather than a mapping
+            since a job given several times, e.g. with other params, has
+            a build each time; dict(zip(names, builds)) maps jobs given
+            once to their builds
+        """
+        if isinstance(jobs, dict):
+            jobs = list(jobs.items())
+        triggered_jobs = [
+            (job, None) if isinstance(job, str) else tuple(job) for job in jobs
+        ]
+        self.jobs._load_rows()
+        rows = {}
+        for jobname, _ in triggered_jobs:
+            rows[jobname] = self.jobs._find_job_row(jobname)
+            if rows[jobname] is None:
+                raise UnknownJob(jobname)
+
+        waiter = BuildWaiter(self)
+        lock = threading.Lock()
+        next_slot = [time.monotonic()]
+
+        def trigger(request):
+            jobname, params = request
+            row = rows[jobname]
+            job = Job(row["url"], row["name"], self, poll=False)
+            job._data = job.poll(tree=self.TRIGGER_TREE)
+            if rate:
+                with lock:
+                    now = time.monotonic()
+                    slot = max(now, next_slot[0])
+                    next_slot[0] = slot + 1.0 / rate
+                time.sleep(slot - now)
+            queue_url = job._trigger(build_params=params, **kwargs)
+            queue_id = int(queue_url.rstrip("/").rsplit("/", 1)[1])
+            log.info("Triggered %s, queue item %i", jobname, queue_id)
+            return waiter.add_queue_id(job, queue_id, until=until)
+
+        with ThreadPoolExecutor(
+            max_workers=workers or config.TRIGGER_WORKERS
+        ) as pool:
+            triggers = [
+                pool.submit(trigger, request) for request in triggered_jobs
+            ]
+        futures = []
+        for (jobname, _), triggered in zip(triggered_jobs, triggers):
+            try:
+                futures.append(triggered.result())
+            except Exception as err:  # pylint: disable=broad-except
+                log.warning("Could not trigger %s: %s", jobname, err)
+                futures.append(err)
+
+        timed_out = None
+        try:
+            waiter.wait(
+                [f for f in futures if isinstance(f, Future)], timeout=timeout
+            )
+        except TimeOut as err:
+            timed_out = err
+        return [
+            self._build_or_exception(future, timed_out) for future in futures
+        ]
+
+    @staticmethod
+    def _build_or_exception(future, timed_out):
+        if not isinstance(future, Future):
+            return future
+        if not future.done():
+            return timed_out or TimeOut("Build not found")
+        if future.cancelled():
+            return CancelledError()
+        return future.exception() or future.result()
+
     def delete_job(self, jobname: str) -> None:
         """
         Delete a job by name
@@ -320,6 +469,13 @@ class Jenkins(JenkinsBase):
         queue_url = self.get_queue_url()
         return Queue(queue_url, self)
 
+    def get_sync(self, **kwargs) -> JenkinsSync:
+        """
+        Return a JenkinsSync keeping a local model of the jobs, builds,
+        queue and nodes of this server, see jenkinsapi.sync.
+        """
+        return JenkinsSync(self, **kwargs)
+
     def get_nodes(self) -> Nodes:
         return Nodes(self.baseurl, self)
 
@@ -391,7 +547,11 @@ class Jenkins(JenkinsBase):
 
     def get_plugins_url(self, depth):
         # This only ever needs to work on the base object
-        return f"{self.baseurl}/pluginManager/api/python?depth={depth}"
+        return "%s/pluginManager/%s?depth=%s" % (
+            self.baseurl,
+            config.JENKINS_API,
+            depth,
+        )
 
     def install_plugin(
         self,
@@ -656,7 +816,7 @@ class Jenkins(JenkinsBase):
         return Executors(url, nodename, self)
 
     def get_master_data(self):
-        url = f"{self.baseurl}/computer/api/python"
+        url = f"{self.baseurl}/computer/{config.JENKINS_API}"
         return self.get_data(url)
 
     @property
@@ -693,7 +853,7 @@ class Jenkins(JenkinsBase):
 
     @property
     def is_quieting_down(self) -> bool:
-        url = "%s/api/python?tree=quietingDown" % (self.baseurl,)
+        url = "%s/%s?tree=quietingDown" % (self.baseurl, config.JENKINS_API)
         data = self.get_data(url=url)
         return data.get("quietingDown", False)
 
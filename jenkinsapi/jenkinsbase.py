@@ -4,12 +4,14 @@ Module for JenkinsBase class
 
 from __future__ import annotations
 
-import ast
 import pprint
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 from jenkinsapi import config
 from jenkinsapi.custom_exceptions import JenkinsAPIException
+from jenkinsapi.utils.build_cache import BuildCache
+from jenkinsapi.utils.json_decoder import get_decoder_for_url
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +37,7 @@ class JenkinsBase(object):
         Initialize a jenkins connection
         """
         self._data = None
+        self.folder_requests = 0
         self.baseurl = self.strip_trailing_slash(baseurl)
         if poll:
             self.poll()
@@ -73,14 +76,48 @@ class JenkinsBase(object):
         return self.get_data(url, tree=tree)
 
     def get_data(self, url, params=None, tree=None):
-        requester = self.get_jenkins_obj().requester
+        jenkins = self.get_jenkins_obj()
+        requester = jenkins.requester
+        params = self._merge_tree(params, tree)
+        # Completed builds may be served from the persistent build cache
+        build_cache = getattr(jenkins, "build_cache", None)
+        key = None
+        if isinstance(build_cache, BuildCache):
+            key = build_cache.make_key(
+                url, params, getattr(jenkins, "username", None)
+            )
+            if key is not None:
+                cached = build_cache.get(key, url)
+                if cached is not None:
+                    data, volatile = cached
+                    if volatile:
+                        # Fields which may change after the build completed
+                        live = {"tree": ",".join(volatile)}
+                        response = requester.get_url(url, live)
+                        data.update(
+                            self._decode_response(url, live, None, response)
+                        )
+                    return data
+        response = requester.get_url(url, params)
+        data = self._decode_response(url, params, tree, response)
+        if key is not None:
+            build_cache.put(key, url, data)
+        return data
+
+    @staticmethod
+    def _merge_tree(params, tree):
         if tree:
             if not params:
                 params = {"tree": tree}
             else:
                 params.update({"tree": tree})
+        return params
 
-        response = requester.get_url(url, params)
+    @staticmethod
+    def _decode_response(url, params, tree, response):
+        """
+        Check the status of an API response and decode its payload.
+        """
         if response.status_code != 200:
             logger.error(
                 "Failed request at %s with params: %s %s",
@@ -90,7 +127,7 @@ class JenkinsBase(object):
             )
             response.raise_for_status()
         try:
-            return ast.literal_eval(response.text)
+            return get_decoder_for_url(url)(response.text)
         except Exception:
             logger.exception("Inappropriate content found at %s", url)
             raise JenkinsAPIException("Cannot parse %s" % response.content)
@@ -102,33 +139,131 @@ class JenkinsBase(object):
         pprint.pprint(self._data)
 
     def resolve_job_folders(self, jobs):
-        for job in list(jobs):
-            if "color" not in job.keys():
-                jobs.remove(job)
-                jobs += self.process_job_folder(job, self.baseurl)
+        """
+        Replace the folders in jobs by the jobs they contain, recursively.
+
+        Each level of folders is listed with up to config.FOLDER_WORKERS
+        parallel requests, or first with a single deep request when
+        config.FOLDER_TREE_DEPTH is set. The number of requests issued is
+        kept in folder_requests.
+        """
+        self.folder_requests = 0
+        folders = [job for job in jobs if "color" not in job.keys()]
+        if not folders:
+            return jobs
+
+        contents = {}
+        if config.FOLDER_TREE_DEPTH > 0:
+            data = self.get_data(
+                self.python_api_url(self.baseurl),
+                tree=self._folder_tree(config.FOLDER_TREE_DEPTH),
+            )
+            self.folder_requests += 1
+            pending = self._collect_folders(
+                self.baseurl, data.get("jobs", []), contents
+            )
+            pending = [path for path in pending if path not in contents]
+        else:
+            pending = [self._folder_path(self.baseurl, f) for f in folders]
+        self._list_folders(pending, contents)
+        logger.debug(
+            "Resolved %i folders with %i requests",
+            len(contents),
+            self.folder_requests,
+        )
+
+        for job in folders:
+            jobs.remove(job)
+            jobs += self._flatten_folder(
+                self._folder_path(self.baseurl, job), contents
+            )
 
         return jobs
 
-    def process_job_folder(self, folder, folder_path):
-        logger.debug("Processing folder %s in %s", folder["name"], folder_path)
-        folder_path += "/job/%s" % quote(folder["name"])
+    @staticmethod
+    def _folder_path(parent_path, folder):
+        return "%s/job/%s" % (parent_path, quote(folder["name"]))
+
+    @staticmethod
+    def _folder_tree(depth):
+        tree = "name,color"
+        for _ in range(depth):
+            tree = "name,color,jobs[%s]" % tree
+        return "jobs[%s]" % tree
+
+    def _collect_folders(self, parent_path, jobs, contents):
+        """
+        Record the contents of the folders in jobs which came with a
+        nested jobs list, and return the paths of all folders found.
+        """
+        paths = []
+        for job in jobs:
+            if "color" in job.keys():
+                continue
+            path = self._folder_path(parent_path, job)
+            paths.append(path)
+            if "jobs" in job:
+                children = job.pop("jobs")
+                contents[path] = children
+                paths += self._collect_folders(path, children, contents)
+        return paths
+
+    def _list_folders(self, paths, contents):
+        """
+        List the folders at paths, level by level, into contents
+        """
+        workers = max(config.FOLDER_WORKERS, 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while paths:
+                if workers > 1 and len(paths) > 1:
+                    results = list(executor.map(self._list_folder, paths))
+                else:
+                    results = [self._list_folder(path) for path in paths]
+                self.folder_requests += len(paths)
+                next_paths = []
+                for path, children in zip(paths, results):
+                    contents[path] = children
+                    next_paths += [
+                        self._folder_path(path, job)
+                        for job in children
+                        if "color" not in job.keys()
+                    ]
+                paths = next_paths
+
+    def _list_folder(self, folder_path):
+        logger.debug("Processing folder %s", folder_path)
         data = self.get_data(
             self.python_api_url(folder_path), tree="jobs[name,color]"
         )
+        return data.get("jobs", [])
 
+    def _flatten_folder(self, folder_path, contents):
         result = []
-        for job in data.get("jobs", []):
+        for job in contents.get(folder_path, []):
             if "color" not in job.keys():
-                result += self.process_job_folder(job, folder_path)
+                result += self._flatten_folder(
+                    self._folder_path(folder_path, job), contents
+                )
             else:
                 job["url"] = "%s/job/%s" % (folder_path, quote(job["name"]))
                 result.append(job)
-
         return result
 
+    def process_job_folder(self, folder, folder_path):
+        """
+        Return the jobs of folder, found in folder_path, and of all the
+        folders below it, listing the folders level by level.
+        """
+        path = self._folder_path(folder_path, folder)
+        contents = {}
+        self._list_folders([path], contents)
+        return self._flatten_folder(path, contents)
+
     @classmethod
     def python_api_url(cls, url: str) -> str:
-        if url.endswith(config.JENKINS_API):
+        if url.endswith(config.JENKINS_API) or url.endswith(
+            config.JENKINS_PYTHON_API
+        ):
             return url
         else:
             if url.endswith(r"/"):
@@ -136,3 +271,27 @@ class JenkinsBase(object):
             else:
                 fmt = "%s/%s"
             return fmt % (url, config.JENKINS_API)
+
+    @staticmethod
+    def split_tree(tree: str) -> list:
+        """
+        Split a tree expression into its top level fields, e.g.
+        "number,actions[parameters[name]]" gives
+        ["number", "actions[parameters[name]]"]
+        """
+        fields = []
+        depth = 0
+        field = ""
+        for char in tree:
+            if char == "," and depth == 0:
+                fields.append(field.strip())
+                field = ""
+                continue
+            if char in "[{":
+                depth += 1
+            elif char in "]}":
+                depth -= 1
+            field += char
+        if field.strip():
+            fields.append(field.strip())
+        return fields
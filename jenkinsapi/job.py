@@ -6,10 +6,12 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 import xml.etree.ElementTree as ET
 import urllib.parse as urlparse
 
 from collections import defaultdict
+from requests import HTTPError
 from jenkinsapi.build import Build
 from jenkinsapi.custom_exceptions import (
     NoBuildData,
@@ -23,7 +25,7 @@ from jenkinsapi.custom_exceptions import (
 from jenkinsapi.jenkinsbase import JenkinsBase
 from jenkinsapi.mutable_jenkins_thing import MutableJenkinsThing
 from jenkinsapi.queue import QueueItem
-
+from jenkinsapi.test_history import TestHistory, get_test_history
 
 SVN_URL = "./scm/locations/hudson.scm.SubversionSCM_-ModuleLocation/remote"
 GIT_URL = "./scm/userRemoteConfigs/hudson.plugins.git.UserRemoteConfig/url"
@@ -41,10 +43,25 @@ class Job(JenkinsBase, MutableJenkinsThing):
     A job can hold N builds which are the actual execution environments
     """
 
-    def __init__(self, url: str, name: str, jenkins_obj: "Jenkins") -> None:
+    # Build fields fetched by get_builds() when no tree is given
+    BUILDS_TREE = (
+        "number,url,result,building,duration,timestamp,fullDisplayName,"
+        "changeSet[kind],changeSets[kind],"
+        "actions[_class,parameters[name,value],lastBuiltRevision[SHA1]]"
+    )
+
+    def __init__(
+        self, url: str, name: str, jenkins_obj: "Jenkins", poll: bool = True
+    ) -> None:
         self.name: str = name
         self.jenkins: "Jenkins" = jenkins_obj
         self._revmap = None
+        self._build_index = None
+        self._build_index_key = None
+        self.polls_avoided = 0
+        # Guards the lazily built build index and config, which are
+        # replaced rather than modified once published
+        self._lock = threading.RLock()
         self._config = None
         self._element_tree = None
         self._scm_prefix = ""
@@ -71,7 +88,7 @@ class Job(JenkinsBase, MutableJenkinsThing):
             None: lambda element_tree: [],
         }
         self.url: str = url
-        JenkinsBase.__init__(self, self.url)
+        JenkinsBase.__init__(self, self.url, poll=poll)
 
     def __str__(self) -> str:
         return self.name
@@ -111,33 +128,40 @@ class Job(JenkinsBase, MutableJenkinsThing):
         all builds information. This method checks if all builds are loaded
         in the data object and updates it with the missing builds if needed.
         """
-        if not data.get("builds"):
+        if self._all_builds_loaded(data):
             return data
+        response = self.poll(tree="allBuilds[number,url]")
+        data["builds"] = response["allBuilds"]
+        return data
+
+    def _all_builds_loaded(self, data):
+        """
+        Return True unless data lacks builds older than the first one
+        reported by Jenkins.
+        """
+        if not data.get("builds"):
+            return True
         # do not call _buildid_for_type here: it would poll and do an infinite
         # loop
         oldest_loaded_build_number = data["builds"][-1]["number"]
-        if "firstBuild" not in self._data or not self._data["firstBuild"]:
+        if not (self._data or {}).get("firstBuild"):
             first_build_number = oldest_loaded_build_number
         else:
             first_build_number = self._data["firstBuild"]["number"]
-        all_builds_loaded = oldest_loaded_build_number == first_build_number
-        if all_builds_loaded:
-            return data
-        response = self.poll(tree="allBuilds[number,url]")
-        data["builds"] = response["allBuilds"]
-        return data
+        return oldest_loaded_build_number == first_build_number
 
     def _get_config_element_tree(self):
         """
         The ElementTree objects creation is unnecessary, it can be
         a singleton per job
         """
-        if self._config is None:
-            self.load_config()
+        with self._lock:
+            if self._config is None:
+                self.load_config()
 
-        if self._element_tree is None:
-            self._element_tree = ET.fromstring(self._config)
-        return self._element_tree
+            if self._element_tree is None:
+                self._element_tree = ET.fromstring(self._config)
+            return self._element_tree
 
     def get_build_triggerurl(self) -> str:
         if not self.has_params():
@@ -188,6 +212,44 @@ class Job(JenkinsBase, MutableJenkinsThing):
         quiet_period=None,
     ) -> QueueItem:
         assert isinstance(block, bool)
+        redirect_url = self._trigger(
+            securitytoken, build_params, cause, files, quiet_period
+        )
+        qi = QueueItem(redirect_url, self.jenkins)
+        if block:
+            qi.block_until_complete(delay=delay)
+        return qi
+
+    def _trigger(
+        self,
+        securitytoken=None,
+        build_params=None,
+        cause=None,
+        files=None,
+        quiet_period=None,
+    ):
+        """
+        Trigger a build and return the url of its queue item.
+        """
+        url, data, params = self._prepare_invoke(
+            securitytoken, build_params, cause, files, quiet_period
+        )
+        response = self.jenkins.requester.post_and_confirm_status(
+            url,
+            data=data,
+            params=params,
+            files=files,
+            valid=[200, 201, 303],
+            allow_redirects=False,
+        )
+        return self._get_queue_item_url(response.headers["location"])
+
+    def _prepare_invoke(
+        self, securitytoken, build_params, cause, files, quiet_period
+    ):
+        """
+        Return the url, form data and query params triggering a build.
+        """
         if build_params and (not self.has_params()):
             raise BadParams("This job does not support parameters")
 
@@ -215,18 +277,12 @@ class Job(JenkinsBase, MutableJenkinsThing):
             "json": self.mk_json_from_build_parameters(build_params, files)
         }
         data.update(build_params)
+        return url, data, params
 
-        response = self.jenkins.requester.post_and_confirm_status(
-            url,
-            data=data,
-            params=params,
-            files=files,
-            valid=[200, 201, 303],
-            allow_redirects=False,
-        )
-
-        redirect_url = response.headers["location"]
-
+    def _get_queue_item_url(self, redirect_url):
+        """
+        Check that a build trigger redirected to a queue item.
+        """
         #
         # Enterprise Jenkins implementations such as CloudBees locate their
         # queue REST API base https://server.domain.com/jenkins/queue/api/
@@ -251,11 +307,7 @@ class Job(JenkinsBase, MutableJenkinsThing):
                 break
         if not redirect_url_valid:
             raise ValueError("Not a Queue URL: %s" % redirect_url)
-
-        qi = QueueItem(redirect_url, self.jenkins)
-        if block:
-            qi.block_until_complete(delay=delay)
-        return qi
+        return redirect_url
 
     def _buildid_for_type(self, buildtype):
         """
@@ -315,13 +367,92 @@ class Job(JenkinsBase, MutableJenkinsThing):
         """
         return self._buildid_for_type("lastCompletedBuild")
 
-    def get_build_dict(self):
+    def get_build_dict(self, cached=False):
+        """
+        Return a dict of build numbers to build urls.
+
+        The index is kept between calls: nextBuildNumber is polled, and
+        the builds only fetched again when it changed. Then the numbers
+        of all builds are fetched to drop those deleted since, and the
+        urls of the new builds only. polls_avoided counts the requests
+        saved that way.
+
+        :param cached: return the index as of the last call without
+            polling nextBuildNumber, bool
+        """
+        return dict(self._get_build_index(cached=cached))
+
+    def _get_build_index(self, cached=False):
+        """
+        Return the build index, updating it when nextBuildNumber moved.
+        nextBuildNumber is polled first, unless cached and an index was
+        already made.
+        """
+        with self._lock:
+            if cached and self._build_index is not None:
+                # builds, lastBuild and nextBuildNumber were not polled
+                self.polls_avoided += 2
+                return self._build_index
+            data = self.poll(tree="nextBuildNumber")
+            next_build_number = data.get("nextBuildNumber")
+            if self._data is not None and next_build_number is not None:
+                self._data["nextBuildNumber"] = next_build_number
+
+            if self._build_index is None:
+                self._build_index = self._load_build_dict()
+            elif next_build_number == self._build_index_key:
+                # builds, lastBuild and possibly allBuilds were not polled
+                self.polls_avoided += 2
+            elif (
+                isinstance(next_build_number, int)
+                and isinstance(self._build_index_key, int)
+                and 0 < next_build_number - self._build_index_key <= 100
+            ):
+                new_builds = self.poll(
+                    tree="allBuilds[number,url]{0,%d}"
+                    % (next_build_number - self._build_index_key)
+                )
+                # Builds may have been deleted, e.g. by log rotation
+                listed = self.poll(tree="allBuilds[number]")
+                numbers = {b["number"] for b in listed.get("allBuilds") or []}
+                index = {
+                    number: url
+                    for number, url in self._build_index.items()
+                    if number in numbers
+                }
+                for build in new_builds.get("allBuilds") or []:
+                    index[build["number"]] = build["url"]
+                self._build_index = index
+            else:
+                self._build_index = self._load_build_dict()
+            self._build_index_key = next_build_number
+            return self._build_index
+
+    def _get_build_url(self, buildnumber):
+        """
+        Look a build up in the index, refreshing it once on a miss in
+        case the build was started after the index was made.
+        """
+        index = self._get_build_index(cached=True)
+        if buildnumber not in index:
+            index = self._get_build_index()
+        return index[buildnumber]
+
+    def _load_build_dict(self):
         builds = self.poll(tree="builds[number,url]")
         if not builds:
             raise NoBuildData(repr(self))
         builds = self._add_missing_builds(builds)
         builds = builds["builds"]
         last_build = self.poll(tree="lastBuild[number,url]")["lastBuild"]
+        return self._make_build_dict(builds, last_build)
+
+    @staticmethod
+    def _make_build_dict(builds, last_build):
+        """
+        Map build numbers to urls, including a last build which the
+        builds list may not contain yet.
+        """
         if (
             builds
             and last_build
@@ -333,19 +464,62 @@ class Job(JenkinsBase, MutableJenkinsThing):
         # understand the test above.
         return dict((build["number"], build["url"]) for build in builds)
 
+    def get_builds(self, builds=None, tree=None, page_size=100):
+        """
+        Fetch many builds in as few requests as possible, using the
+        {start,end} range of the allBuilds tree.
+
+        :param builds: range of positions in the build history, newest
+            first (0 is the last build), all builds if None
+        :param tree: build fields to fetch, BUILDS_TREE if None. number
+            and url are always fetched
+        :param page_size: maximum number of builds per request, int
+        :return: list of lazy Build objects, newest first, holding the
+            fetched fields
+        """
+        if builds is not None and builds.step != 1:
+            raise ValueError("Build ranges must have a step of 1")
+        fields = self.split_tree(tree or self.BUILDS_TREE)
+        for field in ("url", "number"):
+            if field not in fields:
+                fields.insert(0, field)
+        tree = ",".join(fields)
+
+        start = builds.start if builds is not None else 0
+        stop = builds.stop if builds is not None else None
+        result = []
+        while stop is None or start < stop:
+            end = start + page_size
+            if stop is not None:
+                end = min(end, stop)
+            data = self.poll(tree="allBuilds[%s]{%d,%d}" % (tree, start, end))
+            rows = data.get("allBuilds") or []
+            result.extend(self._make_build(row, fields) for row in rows)
+            if len(rows) < end - start:
+                break
+            start = end
+        return result
+
+    def _make_build(self, row, fields):
+        """
+        Lazy Build populated from a row of a builds tree, without polling
+        """
+        build = Build(row["url"], row["number"], job=self, lazy=True)
+        build._merge_fields(fields, row)
+        return build
+
     def get_build_by_params(self, build_params, order=1):
-        first_build_number = self.get_first_buildnumber()
-        last_build_number = self.get_last_buildnumber()
         if order != 1 and order != -1:
             raise ValueError(
                 "Direction should be ascending or descending (1/-1)"
             )
 
-        for number in range(first_build_number, last_build_number + 1)[
-            ::order
-        ]:
-            build = self.get_build(number)
+        builds = self.get_builds(
+            tree="number,url,actions[_class,parameters[name,value]]"
+        )
+        for build in builds[::-order]:
             if build.get_params() == build_params:
+                build.poll()
                 return build
 
         raise NoBuildData(
@@ -360,10 +534,8 @@ class Job(JenkinsBase, MutableJenkinsThing):
         revs = defaultdict(list)
         if "builds" not in self._data:
             raise NoBuildData(repr(self))
-        for buildnumber in self.get_build_ids():
-            revs[self.get_build(buildnumber).get_revision()].append(
-                buildnumber
-            )
+        for build in self.get_builds(tree=Build.VCS_TREE):
+            revs[build.get_revision()].append(build.get_number())
         return revs
 
     def get_build_ids(self):
@@ -372,6 +544,25 @@ class Job(JenkinsBase, MutableJenkinsThing):
         """
         return reversed(sorted(self.get_build_dict().keys()))
 
+    def get_test_history(
+        self, builds=100, workers=None, cache_dir=None
+    ) -> TestHistory:
+        """
+        Fetch the outcomes of the tests of completed builds concurrently,
+        e.g. to find flaky tests with get_test_history(200).flaky().
+
+        :param builds: number of last completed builds, running builds
+            not counted, or build numbers
+        :param workers: reports fetched at a time, default
+            config.TEST_HISTORY_WORKERS
+        :param cache_dir: directory to keep the reports of completed
+            builds in, so that only new builds are fetched next time
+        :return: TestHistory
+        """
+        return get_test_history(
+            self, builds=builds, workers=workers, cache_dir=cache_dir
+        )
+
     def get_next_build_number(self):
         """
         Return the next build number that Jenkins will assign.
@@ -436,13 +627,30 @@ class Job(JenkinsBase, MutableJenkinsThing):
         except KeyError:
             raise NotFound("Couldn't find a build with that revision")
 
-    def get_build(self, buildnumber):
+    def get_build(self, buildnumber, lazy=False):
+        """
+        Get a build by number. A lazy build is not polled: its accessors
+        only fetch the fields they need.
+        """
         assert isinstance(buildnumber, int)
         try:
-            url = self.get_build_dict()[buildnumber]
-            return Build(url, buildnumber, job=self)
+            url = self._get_build_url(buildnumber)
+            return Build(url, buildnumber, job=self, lazy=lazy)
         except KeyError:
             raise NotFound("Build #%s not found" % buildnumber)
+        except HTTPError as err:
+            if err.response is None or err.response.status_code != 404:
+                raise
+            # Deleted since the index was made
+            self._forget_build(buildnumber)
+            raise NotFound("Build #%s not found" % buildnumber)
+
+    def _forget_build(self, buildnumber):
+        with self._lock:
+            if self._build_index is not None:
+                index = dict(self._build_index)
+                index.pop(buildnumber, None)
+                self._build_index = index
 
     def delete_build(self, build_number):
         """
@@ -452,9 +660,10 @@ class Job(JenkinsBase, MutableJenkinsThing):
         :raises NotFound:           When build is not found
         """
         try:
-            url = self.get_build_dict()[build_number]
+            url = self._get_build_url(build_number)
             url = "%s/doDelete" % url
             self.jenkins.requester.post_and_confirm_status(url, data="")
+            self._forget_build(build_number)
             self.jenkins.poll()
         except KeyError:
             raise NotFound("Build #%s not found" % build_number)
@@ -469,7 +678,7 @@ class Job(JenkinsBase, MutableJenkinsThing):
             raise ValueError('Parameter "buildNumber" must be int')
 
         try:
-            url = self.get_build_dict()[buildnumber]
+            url = self._get_build_url(buildnumber)
             return Build(url, buildnumber, job=self, depth=0)
         except KeyError:
             raise NotFound("Build #%s not found" % buildnumber)
@@ -481,7 +690,7 @@ class Job(JenkinsBase, MutableJenkinsThing):
         return self.get_build(buildnumber)
 
     def __len__(self):
-        return len(self.get_build_dict())
+        return len(self._get_build_index())
 
     def is_queued_or_running(self):
         return self.is_queued() or self.is_running()
@@ -6,7 +6,9 @@ interface for all of the jobs defined on a single Jenkins server.
 from __future__ import annotations
 
 from typing import Iterator
+from urllib.parse import quote
 import logging
+import threading
 import time
 
 from jenkinsapi.job import Job
@@ -25,18 +27,126 @@ class Jobs(object):
 
     def __init__(self, jenkins: "Jenkins") -> None:
         self.jenkins = jenkins
+        # Guards polling and updates of the rows and their index. Readers
+        # never take it: updates publish new lists and dicts instead of
+        # modifying the ones other threads may be reading.
+        self._lock = threading.RLock()
         self._data = []
 
+    @property
+    def _data(self) -> list[dict]:
+        return self._rows
+
+    @_data.setter
+    def _data(self, rows: list[dict]) -> None:
+        # The index is rebuilt on the next lookup
+        self._rows = rows
+        self._indexes = None
+
+    def _load_rows(self) -> list[dict]:
+        rows = self._data
+        if not rows:
+            with self._lock:
+                rows = self._data
+                if not rows:
+                    rows = self.poll().get("jobs", [])
+                    self._data = rows
+        return rows
+
+    def _get_indexes(self) -> tuple[dict[str, dict], dict[str, dict]]:
+        """
+        Return the rows of the polled jobs keyed by job name (full name for
+        jobs in folders) and by short name, built once per poll.
+        """
+        indexes = self._indexes
+        if indexes is None:
+            with self._lock:
+                indexes = self._indexes
+                if indexes is None:
+                    indexes = ({}, {})
+                    for row in self._data:
+                        self._index_row(indexes, row)
+                    self._indexes = indexes
+        return indexes
+
+    def _get_index(self) -> dict[str, dict]:
+        return self._get_indexes()[0]
+
+    def _index_row(self, indexes, row: dict) -> None:
+        indexes[0].setdefault(self._job_row_name(row), row)
+        indexes[1].setdefault(row["name"], row)
+
+    def _unindex_row(self, indexes, row: dict) -> None:
+        for index, key in (
+            (indexes[0], self._job_row_name(row)),
+            (indexes[1], row["name"]),
+        ):
+            if index.get(key) is row:
+                del index[key]
+
+    def _update_data(self, old_row: dict | None, new_row: dict | None):
+        """
+        Replace, add (old_row is None) or remove (new_row is None) a row,
+        publishing a new copy of the rows and indexes.
+        """
+        with self._lock:
+            rows = list(self._data)
+            indexes = tuple(dict(index) for index in self._get_indexes())
+            if old_row is not None:
+                position = rows.index(old_row)
+                self._unindex_row(indexes, old_row)
+                if new_row is None:
+                    del rows[position]
+                else:
+                    rows[position] = new_row
+            elif new_row is not None:
+                rows.append(new_row)
+            if new_row is not None:
+                self._index_row(indexes, new_row)
+            if old_row is not None and new_row is None:
+                # another job in a folder may have the same short name
+                for other in rows:
+                    indexes[1].setdefault(other["name"], other)
+            self._rows = rows
+            self._indexes = indexes
+
     def _del_data(self, job_name: str) -> None:
         if not self._data:
             return
-        for num, job_data in enumerate(self._data):
-            if job_data["name"] == job_name:
-                del self._data[num]
-                return
+        row = self._find_job_row(job_name)
+        if row is not None:
+            self._update_data(row, None)
+
+    def _add_data(self, job_name: str) -> None:
+        """
+        Index a job created at the top level of the server, unless jobs
+        were not polled yet.
+        """
+        if not self._data:
+            return
+        row = {
+            "name": job_name,
+            "url": "%s/job/%s/" % (self.jenkins.baseurl, quote(job_name)),
+            "color": "notbuilt",
+        }
+        self._update_data(None, row)
+
+    def _rename_data(self, row: dict, new_job_name: str) -> dict:
+        """
+        Update a polled job row after renaming it in its folder, and
+        return the new row.
+        """
+        parent_url = row["url"].rstrip("/").rsplit("/", 1)[0]
+        new_row = dict(
+            row,
+            name=new_job_name,
+            url="%s/%s/" % (parent_url, quote(new_job_name)),
+        )
+        self._update_data(row, new_row)
+        return new_row
 
     def __len__(self) -> int:
-        return len(self.keys())
+        return len(self._load_rows())
 
     def poll(self, tree="jobs[name,color,url]"):
         return self.jenkins.poll(tree=tree)
@@ -81,19 +191,21 @@ class Jobs(object):
 
     def __getitem__(self, job_name: str) -> "Job":
         if job_name in self:
-            job_data = [
-                job_row
-                for job_row in self._data
-                if job_row["name"] == job_name
-                or Job.get_full_name_from_url_and_baseurl(
-                    job_row["url"], self.jenkins.baseurl
-                )
-                == job_name
-            ][0]
+            job_data = self._find_job_row(job_name)
             return Job(job_data["url"], job_data["name"], self.jenkins)
         else:
             raise UnknownJob(job_name)
 
+    def _find_job_row(self, job_name: str) -> dict | None:
+        """
+        Return the polled data of a job given its name or full name
+        """
+        index, short_index = self._get_indexes()
+        row = index.get(job_name)
+        if row is None:
+            row = short_index.get(job_name)
+        return row
+
     def iteritems(self) -> Iterator[str, "Job"]:
         """
         Iterate over the names & objects for all jobs
@@ -108,31 +220,32 @@ class Jobs(object):
         """
         True if job_name exists in Jenkins
         """
-        return job_name in self.keys()
+        self._load_rows()
+        return job_name in self._get_index()
 
     def iterkeys(self) -> Iterator[str]:
         """
         Iterate over the names of all available jobs
         """
-        if not self._data:
-            self._data = self.poll().get("jobs", [])
-        for row in self._data:
-            if row["name"] != Job.get_full_name_from_url_and_baseurl(
-                row["url"], self.jenkins.baseurl
-            ):
-                yield Job.get_full_name_from_url_and_baseurl(
-                    row["url"], self.jenkins.baseurl
-                )
-            else:
-                yield row["name"]
+        for row in self._load_rows():
+            yield self._job_row_name(row)
+
+    def _job_row_name(self, row: dict) -> str:
+        """
+        Return the key of a job: its full name when inside folders
+        """
+        full_name = Job.get_full_name_from_url_and_baseurl(
+            row["url"], self.jenkins.baseurl
+        )
+        if row["name"] != full_name:
+            return full_name
+        return row["name"]
 
     def itervalues(self) -> Iterator["Job"]:
         """
         Iterate over all available jobs
         """
-        if not self._data:
-            self._data = self.poll().get("jobs", [])
-        for row in self._data:
+        for row in self._load_rows():
             yield Job(row["url"], row["name"], self.jenkins)
 
     def keys(self) -> list[str]:
@@ -162,8 +275,7 @@ class Jobs(object):
         self.jenkins.requester.post_xml_and_confirm_status(
             self.jenkins.get_create_url(), data=config, params=params
         )
-        # Reset to get it refreshed from Jenkins
-        self._data = []
+        self._add_data(job_name)
 
         return self[job_name]
 
@@ -239,8 +351,7 @@ class Jobs(object):
         self.jenkins.requester.post_and_confirm_status(
             self.jenkins.get_create_url(), params=params, data=""
         )
-
-        self._data = []
+        self._add_data(new_job_name)
 
         return self[new_job_name]
 
@@ -257,10 +368,9 @@ class Jobs(object):
         self.jenkins.requester.post_and_confirm_status(
             rename_job_url, params=params, data=""
         )
+        row = self._rename_data(self._find_job_row(job_name), new_job_name)
 
-        self._data = []
-
-        return self[new_job_name]
+        return Job(row["url"], row["name"], self.jenkins)
 
     def build(self, job_name: str, params=None, **kwargs) -> "QueueItem":
         """
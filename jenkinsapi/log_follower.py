@@ -0,0 +1,169 @@
+"""
+Follow the console log of a build as it grows.
+
+The log is read from logText/progressiveText in bounded chunks, so it
+never has to fit in memory, and the byte offset reached so far is kept so
+that following can be resumed later, e.g. by another process.
+"""
+
+from __future__ import annotations
+
+import codecs
+import logging
+from time import sleep
+from typing import IO, Any, Iterator
+
+log = logging.getLogger(__name__)
+
+
+class LogFollower(object):
+    """
+    Follows the console log of a build, see Build.follow_logs().
+
+    While Jenkins reports more data to come, the log is polled again
+    after an interval: min_interval when the last poll returned data,
+    multiplied by backoff after each poll which did not, up to
+    max_interval.
+
+    Every byte received is also written to tee, a binary file object or
+    a path. A path is appended to when resuming from an offset and
+    truncated otherwise.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        build: Any,
+        offset: int = 0,
+        min_interval: float = 0.5,
+        max_interval: float = 10.0,
+        backoff: float = 2.0,
+        chunk_size: int | None = None,
+        tee: IO[bytes] | str | None = None,
+    ) -> None:
+        self.build = build
+        self.url = "%s/logText/progressiveText" % build.baseurl
+        self.offset = offset
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = backoff
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.tee = tee
+        self.encoding: str | None = None
+        self.polls = 0
+        self.interval = min_interval
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_lines()
+
+    def _open_tee(self) -> tuple[IO[bytes] | None, bool]:
+        if self.tee is None:
+            return None, False
+        if isinstance(self.tee, str):
+            return open(self.tee, "ab" if self.offset else "wb"), True
+        return self.tee, False
+
+    def _follow(self, start: int) -> Iterator[bytes]:
+        """
+        Yield the log from byte start onwards as it is written, one chunk
+        at a time.
+        """
+        requester = self.build.job.jenkins.requester
+        tee, close_tee = self._open_tee()
+        position = start
+        try:
+            while True:
+                response = requester.get_and_confirm_status(
+                    self.url, params={"start": position}, stream=True
+                )
+                self.polls += 1
+                received = 0
+                try:
+                    self.encoding = response.encoding or self.encoding
+                    for chunk in response.iter_content(self.chunk_size):
+                        if not chunk:
+                            continue
+                        received += len(chunk)
+                        if tee is not None:
+                            tee.write(chunk)
+                        yield chunk
+                    headers = response.headers
+                finally:
+                    response.close()
+                position += received
+                position = int(headers.get("X-Text-Size", position))
+                if not headers.get("X-More-Data"):
+                    return
+                self.interval = self._next_interval(received)
+                log.debug(
+                    "%s: %i bytes received, next poll in %.1fs",
+                    self.url,
+                    received,
+                    self.interval,
+                )
+                sleep(self.interval)
+        finally:
+            if close_tee:
+                tee.close()
+            elif tee is not None:
+                tee.flush()
+
+    def _next_interval(self, received: int) -> float:
+        if received:
+            return self.min_interval
+        return min(self.interval * self.backoff, self.max_interval)
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """
+        Yield the raw log in chunks of at most chunk_size bytes until the
+        build has finished. offset is advanced past every chunk yielded.
+        """
+        for chunk in self._follow(self.offset):
+            self.offset += len(chunk)
+            yield chunk
+
+    def iter_text(self, encoding: str | None = None) -> Iterator[str]:
+        """
+        Yield the log decoded, characters split across chunks are kept
+        whole. The encoding defaults to the one of the response.
+        """
+        decoder = None
+        for chunk in self.iter_bytes():
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(
+                    encoding or self.encoding or "ISO-8859-1"
+                )(errors="replace")
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        if decoder is not None:
+            text = decoder.decode(b"", final=True)
+            if text:
+                yield text
+
+    def iter_lines(self, encoding: str = "utf-8") -> Iterator[str]:
+        """
+        Yield the log one line at a time, without line endings. offset is
+        only advanced past complete lines, so that following can be
+        resumed at the start of the first line which was not yielded.
+        """
+        pending = b""
+        for chunk in self._follow(self.offset):
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                self.offset += len(line) + 1
+                yield line.rstrip(b"\r").decode(encoding, "replace")
+        if pending:
+            self.offset += len(pending)
+            yield pending.rstrip(b"\r").decode(encoding, "replace")
+
+    def drain(self) -> int:
+        """
+        Follow the log until the build has finished without keeping any of
+        it, e.g. to only write it to tee. Returns the final offset.
+        """
+        for _ in self.iter_bytes():
+            pass
+        return self.offset
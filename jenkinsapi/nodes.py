@@ -4,12 +4,14 @@ Module for jenkinsapi nodes
 
 from __future__ import annotations
 
-from typing import Iterator
+from typing import Any, Callable, Iterator
 
+import time
 import logging
 
 from urllib.parse import urlencode
 from jenkinsapi.node import Node
+from jenkinsapi.executor import ExecutorRecord
 from jenkinsapi.jenkinsbase import JenkinsBase
 from jenkinsapi.custom_exceptions import JenkinsAPIException
 from jenkinsapi.custom_exceptions import UnknownNode
@@ -18,6 +20,184 @@ from jenkinsapi.custom_exceptions import PostRequired
 log: logging.Logger = logging.getLogger(__name__)
 
 
+class NodeRecord(object):
+    """
+    The state of one node in a NodesSnapshot, with its monitor data
+    flattened into attributes. Values of monitors which did not report,
+    as on offline nodes, are None.
+    """
+
+    # Attribute: (monitor, field of its data or None for the whole data)
+    MONITORS = {
+        "architecture": ("ArchitectureMonitor", None),
+        "available_physical_memory": (
+            "SwapSpaceMonitor",
+            "availablePhysicalMemory",
+        ),
+        "total_physical_memory": ("SwapSpaceMonitor", "totalPhysicalMemory"),
+        "available_swap_space": ("SwapSpaceMonitor", "availableSwapSpace"),
+        "total_swap_space": ("SwapSpaceMonitor", "totalSwapSpace"),
+        "workspace_path": ("DiskSpaceMonitor", "path"),
+        "workspace_size": ("DiskSpaceMonitor", "size"),
+        "temp_path": ("TemporarySpaceMonitor", "path"),
+        "temp_size": ("TemporarySpaceMonitor", "size"),
+        "response_time": ("ResponseTimeMonitor", "average"),
+        "clock_difference": ("ClockMonitor", "diff"),
+    }
+    FIELDS = (
+        "name",
+        "offline",
+        "temporarily_offline",
+        "offline_reason",
+        "idle",
+        "jnlp_agent",
+        "num_executors",
+        "busy_executors",
+    ) + tuple(MONITORS)
+
+    __slots__ = FIELDS + ("monitor_data", "executors")
+
+    def __init__(self, row: dict) -> None:
+        self.name: str = row["displayName"]
+        self.offline: bool = row.get("offline", False)
+        self.temporarily_offline: bool = row.get("temporarilyOffline", False)
+        self.offline_reason: str | None = row.get("offlineCauseReason")
+        self.idle: bool = row.get("idle", True)
+        self.jnlp_agent: bool = row.get("jnlpAgent", False)
+        self.num_executors: int = row.get("numExecutors", 0)
+        self.executors: list[ExecutorRecord] = [
+            ExecutorRecord(self.name, executor or {}, one_off=one_off)
+            for key, one_off in (
+                ("executors", False),
+                ("oneOffExecutors", True),
+            )
+            for executor in row.get(key, [])
+        ]
+        self.busy_executors: int = sum(
+            1 for executor in self.executors if not executor.idle
+        )
+        self.monitor_data: dict = row.get("monitorData") or {}
+        for attribute, (monitor, field) in self.MONITORS.items():
+            data = self.get_monitor(monitor)
+            if field is not None:
+                data = data.get(field) if isinstance(data, dict) else None
+            setattr(self, attribute, data)
+
+    def __repr__(self) -> str:
+        return "<%s.%s %s>" % (
+            self.__class__.__module__,
+            self.__class__.__name__,
+            self.name,
+        )
+
+    def is_online(self) -> bool:
+        return not self.offline
+
+    def get_monitor(self, monitor_name: str) -> Any:
+        """
+        Return the data of a monitor, such as "SwapSpaceMonitor", or None.
+        """
+        return self.monitor_data.get(
+            "hudson.node_monitors.{0}".format(monitor_name)
+        )
+
+
+class NodesSnapshot(object):
+    """
+    The state of all nodes, fetched with a single request.
+
+    Records are looked up by node name, filtered with filter() and can be
+    turned into columns, e.g. for pandas.DataFrame(snapshot.columns()).
+    """
+
+    EXECUTOR_TREE = ExecutorRecord.TREE
+    TREE = (
+        "computer[displayName,offline,temporarilyOffline,offlineCauseReason,"
+        "idle,jnlpAgent,numExecutors,monitorData[*],"
+        "executors[%s],oneOffExecutors[%s]]" % (EXECUTOR_TREE, EXECUTOR_TREE)
+    )
+
+    def __init__(self, rows: list[dict], taken_at: float | None = None):
+        self.taken_at = time.time() if taken_at is None else taken_at
+        self.records = [NodeRecord(row) for row in rows]
+        self._by_name = {record.name: record for record in self.records}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[NodeRecord]:
+        return iter(self.records)
+
+    def __contains__(self, node_name: str) -> bool:
+        return node_name in self._by_name
+
+    def __getitem__(self, node_name: str) -> NodeRecord:
+        try:
+            return self._by_name[node_name]
+        except KeyError:
+            raise UnknownNode(node_name)
+
+    def keys(self) -> list[str]:
+        return [record.name for record in self.records]
+
+    def filter(
+        self, predicate: Callable[[NodeRecord], bool] | None = None, **fields
+    ) -> list[NodeRecord]:
+        """
+        Return the records matching predicate and whose attributes equal
+        the given values, e.g. filter(offline=True, jnlp_agent=True).
+        """
+        return [
+            record
+            for record in self.records
+            if all(getattr(record, k) == v for k, v in fields.items())
+            and (predicate is None or predicate(record))
+        ]
+
+    def executors(self) -> list[ExecutorRecord]:
+        """
+        Return the executors of all nodes, one-off executors included.
+        """
+        return [
+            executor
+            for record in self.records
+            for executor in record.executors
+        ]
+
+    def find_idle(self, include_offline=False) -> list[ExecutorRecord]:
+        """
+        Return the idle executors, by default only those of online nodes
+        which can take a build.
+        """
+        return [
+            executor
+            for record in self.records
+            if include_offline or not record.offline
+            for executor in record.executors
+            if executor.idle and not executor.one_off
+        ]
+
+    def find_stuck(self) -> list[ExecutorRecord]:
+        """
+        Return the executors whose build is likely stuck.
+        """
+        return [
+            executor for executor in self.executors() if executor.likely_stuck
+        ]
+
+    def columns(self, fields: tuple | list | None = None) -> dict[str, list]:
+        """
+        Return the records as one list of values per attribute.
+
+        :param fields: attributes to include, default NodeRecord.FIELDS
+        """
+        fields = fields or NodeRecord.FIELDS
+        return {
+            field: [getattr(record, field) for record in self.records]
+            for field in fields
+        }
+
+
 class Nodes(JenkinsBase):
     """
     Class to hold information on a collection of nodes
@@ -46,6 +226,15 @@ class Nodes(JenkinsBase):
     def __contains__(self, node_name: str) -> bool:
         return node_name in self.keys()
 
+    def snapshot(self) -> NodesSnapshot:
+        """
+        Fetch the state, monitor data and executors of every node in one
+        request, rather than one or more per node.
+        """
+        return NodesSnapshot(
+            self._poll(tree=NodesSnapshot.TREE).get("computer", [])
+        )
+
     def iterkeys(self) -> Iterator[str]:
         """
         Return an iterator over the container's node names.
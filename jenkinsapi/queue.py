@@ -4,7 +4,7 @@ Queue module for jenkinsapi
 
 from __future__ import annotations
 
-from typing import Iterator, Tuple
+from typing import Dict, Iterator, List, Tuple
 import logging
 import time
 from requests import HTTPError
@@ -17,8 +17,19 @@ log: logging.Logger = logging.getLogger(__name__)
 class Queue(JenkinsBase):
     """
     Class that represents the Jenkins queue
+
+    The items are read from one snapshot of the queue, indexed by id and
+    by job name, and QueueItem objects are built from it without polling
+    each of them. Call refresh() for a new snapshot.
     """
 
+    # Fields of the items used by Queue and QueueItem
+    ITEMS_TREE = (
+        "items[id,url,why,blocked,buildable,stuck,inQueueSince,params,"
+        "task[name,url,color],"
+        "actions[parameters[name,value],causes[shortDescription,userId]]]"
+    )
+
     def __init__(self, baseurl: str, jenkins_obj: "Jenkins") -> None:
         """
         Init the Jenkins queue object
@@ -28,29 +39,72 @@ class Queue(JenkinsBase):
         self.jenkins: "Jenkins" = jenkins_obj
         JenkinsBase.__init__(self, baseurl)
 
+    @property
+    def _data(self) -> dict | None:
+        return self._snapshot
+
+    @_data.setter
+    def _data(self, data: dict | None) -> None:
+        # The indexes are rebuilt on the next lookup
+        self._snapshot = data
+        self._indexes = None
+
+    def _poll(self, tree=None):
+        return super()._poll(tree=tree or self.ITEMS_TREE)
+
+    def refresh(self) -> "Queue":
+        """
+        Fetch a new snapshot of the queue, only with the fields of
+        ITEMS_TREE.
+        """
+        self.poll()
+        return self
+
+    def _get_indexes(
+        self,
+    ) -> Tuple[Dict[int, dict], Dict[str, List[dict]]]:
+        """
+        Return the rows of the snapshot keyed by id and grouped by job
+        name, built once per snapshot.
+        """
+        indexes = self._indexes
+        if indexes is None:
+            by_id: Dict[int, dict] = {}
+            by_job: Dict[str, List[dict]] = {}
+            for row in self._data["items"]:
+                by_id[row["id"]] = row
+                name = row.get("task", {}).get("name")
+                if name is not None:
+                    by_job.setdefault(name, []).append(row)
+            indexes = self._indexes = (by_id, by_job)
+        return indexes
+
+    def _item(self, row: dict) -> "QueueItem":
+        item = QueueItem(
+            self.get_queue_item_url(row), jenkins_obj=self.jenkins, poll=False
+        )
+        item._data = row
+        return item
+
     def __str__(self) -> str:
         return self.baseurl
 
     def get_jenkins_obj(self) -> "Jenkins":
         return self.jenkins
 
-    def iteritems(self) -> Iterator[Tuple[str, "QueueItem"]]:
-        for item in self._data["items"]:
-            queue_id = item["id"]
-            item_baseurl = "%s/item/%i" % (self.baseurl, queue_id)
-            yield item["id"], QueueItem(
-                baseurl=item_baseurl, jenkins_obj=self.jenkins
-            )
+    def iteritems(self) -> Iterator[Tuple[int, "QueueItem"]]:
+        for row in self._data["items"]:
+            yield row["id"], self._item(row)
 
-    def iterkeys(self) -> Iterator[str]:
-        for item in self._data["items"]:
-            yield item["id"]
+    def iterkeys(self) -> Iterator[int]:
+        for row in self._data["items"]:
+            yield row["id"]
 
     def itervalues(self) -> Iterator["QueueItem"]:
-        for item in self._data["items"]:
-            yield QueueItem(self.jenkins, **item)
+        for row in self._data["items"]:
+            yield self._item(row)
 
-    def keys(self) -> list[str]:
+    def keys(self) -> list[int]:
         return list(self.iterkeys())
 
     def values(self) -> list["QueueItem"]:
@@ -59,40 +113,51 @@ class Queue(JenkinsBase):
     def __len__(self) -> int:
         return len(self._data["items"])
 
-    def __getitem__(self, item_id: str) -> "QueueItem":
-        self_as_dict = dict(self.iteritems())
-        if item_id in self_as_dict:
-            return self_as_dict[item_id]
-        else:
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._get_indexes()[0]
+
+    def __getitem__(self, item_id: int) -> "QueueItem":
+        row = self._get_indexes()[0].get(item_id)
+        if row is None:
             raise UnknownQueueItem(item_id)
+        return self._item(row)
 
     def _get_queue_items_for_job(self, job_name: str) -> Iterator["QueueItem"]:
-        for item in self._data["items"]:
-            if "name" in item["task"] and item["task"]["name"] == job_name:
-                yield QueueItem(
-                    self.get_queue_item_url(item), jenkins_obj=self.jenkins
-                )
+        for row in self._get_indexes()[1].get(job_name, []):
+            yield self._item(row)
 
     def get_queue_items_for_job(self, job_name: str):
         return list(self._get_queue_items_for_job(job_name))
 
-    def get_queue_item_url(self, item: str) -> str:
+    def get_queue_item_url(self, item: dict) -> str:
         return "%s/item/%i" % (self.baseurl, item["id"])
 
     def delete_item(self, queue_item: "QueueItem"):
         self.delete_item_by_id(queue_item.queue_id)
 
-    def delete_item_by_id(self, item_id: str):
+    def delete_item_by_id(self, item_id: int):
         deleteurl: str = "%s/cancelItem?id=%s" % (self.baseurl, item_id)
         self.get_jenkins_obj().requester.post_url(deleteurl)
+        if self._data is not None:
+            # Publish a new snapshot without it rather than polling again
+            self._data = dict(
+                self._data,
+                items=[
+                    row
+                    for row in self._data["items"]
+                    if str(row["id"]) != str(item_id)
+                ],
+            )
 
 
 class QueueItem(JenkinsBase):
     """An individual item in the queue"""
 
-    def __init__(self, baseurl: str, jenkins_obj: "Jenkins") -> None:
+    def __init__(
+        self, baseurl: str, jenkins_obj: "Jenkins", poll: bool = True
+    ) -> None:
         self.jenkins: "Jenkins" = jenkins_obj
-        JenkinsBase.__init__(self, baseurl)
+        JenkinsBase.__init__(self, baseurl, poll=poll)
 
     @property
     def queue_id(self):
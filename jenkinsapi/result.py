@@ -3,6 +3,13 @@ Module for jenkinsapi Result
 """
 
 
+def case_identifier(case: dict) -> str:
+    """
+    Calculate the ID of a test case from its data.
+    """
+    return f"{case['className']}.{case['name']}"
+
+
 class Result(object):
     """
     Result class
@@ -24,4 +31,4 @@ class Result(object):
         """
         Calculate an ID for this object.
         """
-        return f"{self.className}.{self.name}"
+        return case_identifier(self.__dict__)
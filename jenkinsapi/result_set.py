@@ -4,23 +4,180 @@ Module for jenkinsapi ResultSet
 
 from __future__ import annotations
 
+from array import array
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+from jenkinsapi import config
 from jenkinsapi.jenkinsbase import JenkinsBase
-from jenkinsapi.result import Result
+from jenkinsapi.result import Result, case_identifier
+from jenkinsapi.utils.json_stream import iter_array_items
+
+
+class CaseTable(object):
+    """
+    Compact store of the identifier, status and duration of test cases,
+    the statuses and durations being kept in arrays.
+    """
+
+    # Statuses of hudson.tasks.junit.CaseResult
+    STATUSES = ("PASSED", "SKIPPED", "FAILED", "FIXED", "REGRESSION")
+
+    __slots__ = ("identifiers", "statuses", "durations", "status_names")
+
+    def __init__(self) -> None:
+        self.identifiers: list[str] = []
+        self.statuses = array("B")
+        self.durations = array("d")
+        self.status_names: list[str] = list(self.STATUSES)
+
+    @classmethod
+    def from_cases(cls, cases: Iterable[Dict[str, Any]]) -> "CaseTable":
+        table = cls()
+        for case in cases:
+            table.append(case)
+        return table
+
+    def append(self, case: Dict[str, Any]) -> None:
+        status = case.get("status")
+        try:
+            code = self.status_names.index(status)
+        except ValueError:
+            code = len(self.status_names)
+            self.status_names.append(status)
+        self.identifiers.append(case_identifier(case))
+        self.statuses.append(code)
+        self.durations.append(case.get("duration") or 0.0)
+
+    def __len__(self) -> int:
+        return len(self.identifiers)
+
+    def __iter__(self) -> Iterator[Tuple[str, str, float]]:
+        """
+        Iterate over (identifier, status, duration) of the cases.
+        """
+        names = self.status_names
+        for identifier, code, duration in zip(
+            self.identifiers, self.statuses, self.durations
+        ):
+            yield identifier, names[code], duration
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Return the number of cases of each status found.
+        """
+        counts = [0] * len(self.status_names)
+        for code in self.statuses:
+            counts[code] += 1
+        return {
+            name: count
+            for name, count in zip(self.status_names, counts)
+            if count
+        }
+
+    def with_status(self, *statuses: str) -> list[str]:
+        """
+        Return the identifiers of the cases with any of the statuses.
+        """
+        codes = {
+            code
+            for code, name in enumerate(self.status_names)
+            if name in statuses
+        }
+        return [
+            identifier
+            for identifier, code in zip(self.identifiers, self.statuses)
+            if code in codes
+        ]
 
 
 class ResultSet(JenkinsBase):
     """
     Represents a result from a completed Jenkins run.
+
+    Cases are indexed by identifier once per poll, and Result objects
+    are only created for the cases looked up or iterated over.
     """
 
-    def __init__(self, url: str, build: "Build") -> None:
+    SUMMARY_FIELDS = ("failCount", "passCount", "skipCount", "duration")
+    # Case fields needed to tell cases apart and why they failed
+    FAILURE_FIELDS = (
+        "className",
+        "name",
+        "status",
+        "errorDetails",
+        "errorStackTrace",
+    )
+    FAILED_STATUSES = ("FAILED", "REGRESSION")
+
+    def __init__(
+        self,
+        url: str,
+        build: "Build",
+        poll: bool = True,
+        fields: Iterable[str] | None = None,
+        statuses: Iterable[str] | None = None,
+        summary: bool = False,
+    ) -> None:
         """
         Init a resultset
         :param url: url for a build, str
         :param build: build obj
+        :param poll: set to False to only stream the report with
+            iter_stream() or stream_table(), without loading it
+        :param fields: only fetch these fields of the cases, see
+            get_tree()
+        :param statuses: only keep the cases with these statuses
+        :param summary: only fetch the counts, without any case
         """
         self.build: "Build" = build
-        JenkinsBase.__init__(self, url)
+        self.tree: str | None = self.get_tree(fields, summary, statuses)
+        self.statuses = frozenset(statuses) if statuses else None
+        JenkinsBase.__init__(self, url, poll=poll)
+
+    @classmethod
+    def get_tree(
+        cls,
+        fields: Iterable[str] | None = None,
+        summary: bool = False,
+        statuses: Iterable[str] | None = None,
+    ) -> str | None:
+        """
+        Return the tree projecting a test report on the summary counts
+        and the given fields of its cases, or None for the whole report.
+        className and name are always fetched, to identify the cases,
+        and status too when the cases are filtered by statuses.
+        """
+        summary_tree = ",".join(cls.SUMMARY_FIELDS)
+        if summary:
+            return summary_tree
+        if fields is None:
+            return None
+        fields = list(fields)
+        if statuses and "status" not in fields:
+            fields.append("status")
+        for field in ("name", "className"):
+            if field not in fields:
+                fields.insert(0, field)
+        suites_tree = "suites[cases[%s]]" % ",".join(fields)
+        return "%s,%s,childReports[child[number,url],result[%s,%s]]" % (
+            summary_tree,
+            suites_tree,
+            summary_tree,
+            suites_tree,
+        )
+
+    def _poll(self, tree=None):
+        return super()._poll(tree=tree or self.tree)
+
+    @property
+    def _data(self) -> dict | None:
+        return self._report
+
+    @_data.setter
+    def _data(self, data: dict | None) -> None:
+        # The index is rebuilt on the next lookup
+        self._report = data
+        self._index = None
 
     def get_jenkins_obj(self) -> "Jenkins":
         return self.build.job.get_jenkins_obj()
@@ -32,28 +189,111 @@ class ResultSet(JenkinsBase):
     def name(self):
         return str(self)
 
-    def keys(self) -> list[str]:
-        return [a[0] for a in self.iteritems()]
-
-    def items(self):
-        return [a for a in self.iteritems()]
+    def get_counts(self) -> Dict[str, int]:
+        """
+        Return the failCount, passCount and skipCount of the report.
+        """
+        return {
+            key: self._data.get(key, 0)
+            for key in ("failCount", "passCount", "skipCount")
+        }
 
-    def iteritems(self):
+    def _iter_all_cases(self) -> Iterator[Dict[str, Any]]:
         for suite in self._data.get("suites", []):
-            for case in suite["cases"]:
-                result = Result(**case)
-                yield result.identifier(), result
+            yield from suite["cases"]
 
         for report_set in self._data.get("childReports", []):
             if report_set["result"]:
                 for suite in report_set["result"]["suites"]:
-                    for case in suite["cases"]:
-                        result = Result(**case)
-                        yield result.identifier(), result
+                    yield from suite["cases"]
+
+    def _iter_cases(self) -> Iterator[Dict[str, Any]]:
+        return self._filter(self._iter_all_cases())
+
+    def _filter(
+        self, cases: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        if self.statuses is None:
+            return iter(cases)
+        return (case for case in cases if case["status"] in self.statuses)
+
+    def _get_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the cases keyed by identifier, built once per poll. Of
+        cases with the same identifier, the last one is kept.
+        """
+        index = self._index
+        if index is None:
+            index = {
+                case_identifier(case): case for case in self._iter_cases()
+            }
+            self._index = index
+        return index
+
+    def keys(self) -> list[str]:
+        return [case_identifier(case) for case in self._iter_cases()]
+
+    def items(self):
+        return [a for a in self.iteritems()]
+
+    def iteritems(self):
+        for case in self._iter_cases():
+            yield case_identifier(case), Result(**case)
 
     def __len__(self):
-        return len(self.items())
+        return sum(1 for _ in self._iter_cases())
+
+    def __contains__(self, key) -> bool:
+        return key in self._get_index()
 
     def __getitem__(self, key):
-        self_as_dict = dict(self.iteritems())
-        return self_as_dict[key]
+        return Result(**self._get_index()[key])
+
+    def table(self) -> CaseTable:
+        """
+        Return the identifier, status and duration of all cases as a
+        CaseTable.
+        """
+        return CaseTable.from_cases(self._iter_cases())
+
+    def _stream_cases(
+        self, chunk_size: int | None = None
+    ) -> Iterator[Dict[str, Any]]:
+        url = self.baseurl
+        if url.endswith(config.JENKINS_PYTHON_API):
+            # Only JSON can be parsed incrementally
+            url = url[: -len(config.JENKINS_PYTHON_API)] + "api/json"
+        response = self.get_jenkins_obj().requester.get_and_confirm_status(
+            self.python_api_url(url),
+            params={"tree": self.tree} if self.tree else None,
+            stream=True,
+        )
+        try:
+            yield from self._filter(
+                iter_array_items(
+                    response.iter_content(
+                        chunk_size=chunk_size or config.ARTIFACT_CHUNK_SIZE
+                    ),
+                    "cases",
+                )
+            )
+        finally:
+            response.close()
+
+    def iter_stream(
+        self, chunk_size: int | None = None
+    ) -> Iterator[Tuple[str, Result]]:
+        """
+        Iterate over the identifiers and results of the cases while the
+        report is being downloaded, holding one case at a time in memory
+        rather than the whole report.
+        """
+        for case in self._stream_cases(chunk_size):
+            yield case_identifier(case), Result(**case)
+
+    def stream_table(self, chunk_size: int | None = None) -> CaseTable:
+        """
+        Same as table(), reading the report while it is being downloaded
+        rather than from the polled data.
+        """
+        return CaseTable.from_cases(self._stream_cases(chunk_size))
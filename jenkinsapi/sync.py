@@ -0,0 +1,289 @@
+"""
+Keep a local model of a Jenkins server up to date, incrementally.
+
+Instead of polling every job again, a JenkinsSync fetches cheap change
+indicators on each sync: the color and last build of all jobs in one
+request, the ids of the queue items and the state of the nodes. The
+builds of a job are only fetched when the indicators cannot tell what
+happened to them, e.g. several builds started since the last sync.
+What changed is sent as SyncEvent to the subscribers.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterable, List, Set
+
+log = logging.getLogger(__name__)
+
+JOB_ADDED = "job_added"
+JOB_REMOVED = "job_removed"
+JOB_CHANGED = "job_changed"
+BUILD_STARTED = "build_started"
+BUILD_FINISHED = "build_finished"
+QUEUE_ITEM_ADDED = "queue_item_added"
+QUEUE_ITEM_REMOVED = "queue_item_removed"
+NODE_ADDED = "node_added"
+NODE_REMOVED = "node_removed"
+NODE_ONLINE = "node_online"
+NODE_OFFLINE = "node_offline"
+
+# kind of change, name of the job or node, number of the build or id of
+# the queue item, and the data received about it
+SyncEvent = namedtuple("SyncEvent", "kind name number data")
+
+
+class JobState(object):
+    """What is known of a job: its color and builds."""
+
+    __slots__ = ("name", "url", "color", "last_build", "running")
+
+    def __init__(self, name: str, url: str, color: str | None) -> None:
+        self.name = name
+        self.url = url
+        self.color = color
+        self.last_build = 0
+        self.running: Set[int] = set()
+
+
+class JenkinsSync(object):
+    """
+    Local model of the jobs, running builds, queue and nodes of a Jenkins
+    server, brought up to date by sync().
+
+    The first sync only fills the model, events are sent for what
+    changed from then on.
+
+    :param folder_depth: levels of folders whose jobs are synced
+    :param builds_window: most builds of a job fetched when several
+        changed since the last sync
+    """
+
+    BUILD_TREE = "number,building,result"
+    QUEUE_TREE = "items[id,task[name,url]]"
+    NODES_TREE = "computer[displayName,offline]"
+
+    def __init__(
+        self, jenkins: Any, folder_depth: int = 2, builds_window: int = 50
+    ) -> None:
+        self.jenkins = jenkins
+        self.folder_depth = folder_depth
+        self.builds_window = builds_window
+        self.jobs: Dict[str, JobState] = {}
+        self.queue: Dict[int, Dict[str, Any]] = {}
+        self.nodes: Dict[str, bool] = {}
+        self.synced = False
+        self.requests = 0
+        self._subscribers: List[tuple] = []
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def subscribe(
+        self,
+        callback: Callable[[SyncEvent], Any],
+        kinds: Iterable[str] | None = None,
+    ) -> None:
+        """
+        Call callback with every event of the given kinds, or of any
+        kind, from the thread syncing.
+        """
+        with self._lock:
+            self._subscribers.append(
+                (callback, frozenset(kinds) if kinds else None)
+            )
+
+    def unsubscribe(self, callback: Callable[[SyncEvent], Any]) -> None:
+        with self._lock:
+            self._subscribers = [
+                (subscriber, kinds)
+                for subscriber, kinds in self._subscribers
+                if subscriber != callback
+            ]
+
+    def _get(self, url: str, tree: str) -> Dict[str, Any]:
+        self.requests += 1
+        return self.jenkins.get_data(
+            self.jenkins.python_api_url(url), tree=tree
+        )
+
+    def jobs_tree(self) -> str:
+        tree = "name,url,color,lastBuild[%s]" % self.BUILD_TREE
+        fields = tree
+        for _ in range(self.folder_depth):
+            tree = "%s,jobs[%s]" % (fields, tree)
+        return "jobs[%s]" % tree
+
+    def _flatten_jobs(
+        self, jobs: List[Dict[str, Any]], prefix: str = ""
+    ) -> Iterable[Dict[str, Any]]:
+        for job in jobs:
+            if "color" not in job:
+                yield from self._flatten_jobs(
+                    job.get("jobs") or [], prefix + job["name"] + "/"
+                )
+            else:
+                job["name"] = prefix + job["name"]
+                yield job
+
+    def sync(self) -> List[SyncEvent]:
+        """
+        Bring the model up to date, send the events to the subscribers
+        and return them.
+        """
+        with self._lock:
+            events: List[SyncEvent] = []
+            self._sync_jobs(events)
+            self._sync_queue(events)
+            self._sync_nodes(events)
+            if not self.synced:
+                self.synced = True
+                events = []
+            subscribers = list(self._subscribers)
+        for event in events:
+            for callback, kinds in subscribers:
+                if kinds is None or event.kind in kinds:
+                    try:
+                        callback(event)
+                    except Exception:  # pylint: disable=broad-except
+                        log.exception("Subscriber %r failed", callback)
+        return events
+
+    def _sync_jobs(self, events: List[SyncEvent]) -> None:
+        data = self._get(self.jenkins.baseurl, self.jobs_tree())
+        seen = set()
+        for row in self._flatten_jobs(data.get("jobs", [])):
+            url = row["url"]
+            seen.add(url)
+            state = self.jobs.get(url)
+            if state is None:
+                state = self.jobs[url] = JobState(
+                    row["name"], url, row["color"]
+                )
+                events.append(SyncEvent(JOB_ADDED, state.name, None, row))
+                # Builds are followed from now on, those which started
+                # before only send BUILD_FINISHED
+                last = row.get("lastBuild") or {}
+                state.last_build = last.get("number", 0)
+                if last.get("building"):
+                    state.running.add(state.last_build)
+                continue
+            elif state.color != row["color"]:
+                state.color = row["color"]
+                events.append(SyncEvent(JOB_CHANGED, state.name, None, row))
+            self._sync_builds(state, row.get("lastBuild"), events)
+        for url in sorted(set(self.jobs) - seen):
+            state = self.jobs.pop(url)
+            events.append(SyncEvent(JOB_REMOVED, state.name, None, None))
+
+    def _sync_builds(
+        self,
+        state: JobState,
+        last: Dict[str, Any] | None,
+        events: List[SyncEvent],
+    ) -> None:
+        number = last["number"] if last else 0
+        if number < state.last_build:
+            # Builds were deleted
+            state.last_build = number
+            state.running &= set(range(number + 1))
+        if number > state.last_build + 1 or state.running - {number}:
+            # More than the last build changed, fetch the recent ones
+            oldest = min(state.running | {state.last_build + 1})
+            count = min(number - oldest + 1, self.builds_window)
+            data = self._get(
+                state.url, "builds[%s]{0,%i}" % (self.BUILD_TREE, count)
+            )
+            builds = sorted(data.get("builds", []), key=lambda b: b["number"])
+            numbers = {build["number"] for build in builds}
+            # Running builds out of the window are not followed anymore
+            state.running &= numbers
+        else:
+            builds = [last] if last else []
+        for build in builds:
+            self._sync_build(state, build, events)
+
+    @staticmethod
+    def _sync_build(
+        state: JobState, build: Dict[str, Any], events: List[SyncEvent]
+    ) -> None:
+        number = build["number"]
+        if number > state.last_build:
+            state.last_build = number
+            events.append(SyncEvent(BUILD_STARTED, state.name, number, build))
+            if build["building"]:
+                state.running.add(number)
+            else:
+                events.append(
+                    SyncEvent(BUILD_FINISHED, state.name, number, build)
+                )
+        elif number in state.running and not build["building"]:
+            state.running.discard(number)
+            events.append(SyncEvent(BUILD_FINISHED, state.name, number, build))
+
+    def _sync_queue(self, events: List[SyncEvent]) -> None:
+        data = self._get(self.jenkins.get_queue_url(), self.QUEUE_TREE)
+        items = {item["id"]: item for item in data.get("items", [])}
+        for queue_id in sorted(items.keys() - self.queue.keys()):
+            item = items[queue_id]
+            events.append(
+                SyncEvent(
+                    QUEUE_ITEM_ADDED, item["task"]["name"], queue_id, item
+                )
+            )
+        for queue_id in sorted(self.queue.keys() - items.keys()):
+            item = self.queue[queue_id]
+            events.append(
+                SyncEvent(
+                    QUEUE_ITEM_REMOVED, item["task"]["name"], queue_id, item
+                )
+            )
+        self.queue = items
+
+    def _sync_nodes(self, events: List[SyncEvent]) -> None:
+        data = self._get("%s/computer" % self.jenkins.baseurl, self.NODES_TREE)
+        nodes = {
+            node["displayName"]: node["offline"]
+            for node in data.get("computer", [])
+        }
+        for name, offline in nodes.items():
+            if name not in self.nodes:
+                events.append(SyncEvent(NODE_ADDED, name, None, None))
+            elif self.nodes[name] != offline:
+                kind = NODE_OFFLINE if offline else NODE_ONLINE
+                events.append(SyncEvent(kind, name, None, None))
+        for name in sorted(self.nodes.keys() - nodes.keys()):
+            events.append(SyncEvent(NODE_REMOVED, name, None, None))
+        self.nodes = nodes
+
+    def start(self, interval: float = 30.0) -> None:
+        """
+        Sync every interval seconds in a daemon thread, until stop().
+        """
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(interval,),
+                    name="JenkinsSync",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sync()
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Syncing %s failed", self.jenkins.baseurl)
+            self._stop.wait(interval)
@@ -0,0 +1,297 @@
+"""
+Test results of a job across many builds.
+
+The reports of the builds are fetched concurrently, each one streamed
+with only the identifier and status of its cases, and folded into one
+row of outcomes per test: a bytearray with one byte per build. Failure
+rates and flips between passing and failing are then counted over the
+rows with bytes operations, rather than test by test and build by build.
+
+Reports of completed builds never change, so they can be cached on disk
+to only fetch those of new builds the next time.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Tuple
+
+from requests import RequestException
+
+from jenkinsapi import config
+from jenkinsapi.build import Build
+from jenkinsapi.result_set import CaseTable, ResultSet
+from jenkinsapi.custom_exceptions import JenkinsAPIException
+
+log = logging.getLogger(__name__)
+
+# Outcome of a test in a build, one byte of its row
+NOT_RUN = 0
+PASSED = 1
+FAILED = 2
+SKIPPED = 3
+OUTCOMES = {
+    "PASSED": PASSED,
+    "FIXED": PASSED,
+    "FAILED": FAILED,
+    "REGRESSION": FAILED,
+    "SKIPPED": SKIPPED,
+}
+OUTCOME_NAMES = ("NOT_RUN", "PASSED", "FAILED", "SKIPPED")
+
+BUILDS_TREE = "allBuilds[number,url,building]"
+
+
+class TestHistory(object):
+    """
+    Outcomes of every test of a job (rows) in a range of builds
+    (columns, oldest first).
+    """
+
+    # Not a test case, whatever pytest thinks of the name
+    __test__ = False
+
+    def __init__(self, builds: Iterable[int]) -> None:
+        self.builds: List[int] = sorted(builds)
+        self.tests: List[str] = []
+        self.rows: List[bytearray] = []
+        self._columns = {number: i for i, number in enumerate(self.builds)}
+        self._index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.tests)
+
+    def __contains__(self, identifier: str) -> bool:
+        return identifier in self._index
+
+    def add(self, number: int, table: CaseTable) -> None:
+        """
+        Record the outcomes of the cases of a build.
+        """
+        column = self._columns[number]
+        codes = [OUTCOMES.get(name, NOT_RUN) for name in table.status_names]
+        for identifier, code in zip(table.identifiers, table.statuses):
+            row = self._index.get(identifier)
+            if row is None:
+                row = self._index[identifier] = len(self.tests)
+                self.tests.append(identifier)
+                self.rows.append(bytearray(len(self.builds)))
+            self.rows[row][column] = codes[code]
+
+    def outcomes(self, identifier: str) -> bytearray:
+        return self.rows[self._index[identifier]]
+
+    def history(self, identifier: str) -> List[Tuple[int, str]]:
+        """
+        Return (build number, outcome name) of a test in every build.
+        """
+        return [
+            (number, OUTCOME_NAMES[code])
+            for number, code in zip(self.builds, self.outcomes(identifier))
+        ]
+
+    def failure_rates(self) -> Dict[str, float]:
+        """
+        Return the share of the builds a test passed or failed in where
+        it failed, for every test which passed or failed at least once.
+        """
+        rates = {}
+        for identifier, row in zip(self.tests, self.rows):
+            failed = row.count(FAILED)
+            runs = failed + row.count(PASSED)
+            if runs:
+                rates[identifier] = failed / runs
+        return rates
+
+    def flip_counts(self) -> Dict[str, int]:
+        """
+        Return how many times every test went from passing to failing or
+        back, between builds it passed or failed in.
+        """
+        passed_failed = bytes((PASSED, FAILED))
+        failed_passed = bytes((FAILED, PASSED))
+        flips = {}
+        for identifier, row in zip(self.tests, self.rows):
+            runs = row.translate(None, bytes((NOT_RUN, SKIPPED)))
+            flips[identifier] = runs.count(passed_failed) + runs.count(
+                failed_passed
+            )
+        return flips
+
+    def flaky(self, min_flips: int = 2) -> List[Tuple[str, int, float]]:
+        """
+        Return (identifier, flips, failure rate) of the tests which
+        flipped at least min_flips times, the most flipping first.
+        """
+        rates = self.failure_rates()
+        return sorted(
+            (
+                (identifier, flips, rates[identifier])
+                for identifier, flips in self.flip_counts().items()
+                if flips >= min_flips
+            ),
+            key=lambda flaky: (-flaky[1], flaky[0]),
+        )
+
+    def to_numpy(self):
+        """
+        Return the outcomes as a 2-D numpy array of int8, one row per
+        test. Requires numpy.
+        """
+        import numpy
+
+        matrix = numpy.frombuffer(b"".join(self.rows), dtype=numpy.int8)
+        return matrix.reshape(len(self.rows), len(self.builds))
+
+
+class ReportCache(object):
+    """
+    Test reports of completed builds of one job, one JSON file per build
+    in a directory named after the url of the job.
+    """
+
+    def __init__(self, cache_dir: str, job_url: str) -> None:
+        digest = hashlib.sha1(job_url.encode("utf-8")).hexdigest()[:16]
+        self.dirpath = os.path.join(cache_dir, digest)
+
+    def _path(self, number: int) -> str:
+        return os.path.join(self.dirpath, "%i.json" % number)
+
+    def get(self, number: int) -> CaseTable | None:
+        try:
+            with open(self._path(number)) as cache_file:
+                data = json.load(cache_file)
+            table = CaseTable()
+            table.status_names = data["status_names"]
+            table.identifiers = data["identifiers"]
+            table.statuses.extend(data["statuses"])
+            table.durations.extend(data["durations"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            log.warning("Ignoring unreadable %s: %s", self._path(number), err)
+            return None
+        return table
+
+    def put(self, number: int, table: CaseTable) -> None:
+        os.makedirs(self.dirpath, exist_ok=True)
+        handle, tmppath = tempfile.mkstemp(
+            prefix="%i." % number, dir=self.dirpath
+        )
+        try:
+            with os.fdopen(handle, "w") as cache_file:
+                json.dump(
+                    {
+                        "status_names": table.status_names,
+                        "identifiers": table.identifiers,
+                        "statuses": table.statuses.tolist(),
+                        "durations": table.durations.tolist(),
+                    },
+                    cache_file,
+                )
+            os.replace(tmppath, self._path(number))
+        except OSError as err:
+            log.warning("Could not write %s: %s", self._path(number), err)
+            if os.path.exists(tmppath):
+                os.remove(tmppath)
+
+
+def _fetch_report(job: "Job", row: dict) -> CaseTable:
+    build = Build(row["url"], row["number"], job, lazy=True)
+    build._merge_fields(["number", "url"], row)
+    result_set = ResultSet(
+        build.get_result_url(), build, poll=False, fields=("status",)
+    )
+    return result_set.stream_table()
+
+
+def _completed_builds(
+    job: "Job", builds: int | Iterable[int]
+) -> List[Dict[str, Any]]:
+    """
+    Return the number, url and building of the completed builds wanted,
+    newest first. allBuilds is paged through rather than builds, which
+    Jenkins cuts at 100, until enough builds which are not running were
+    found.
+    """
+    url = job.python_api_url(job.baseurl)
+    if not isinstance(builds, int):
+        wanted = set(builds)
+        data = job.get_data(url, tree=BUILDS_TREE)
+        return [
+            row
+            for row in data.get("allBuilds", [])
+            if not row.get("building") and row["number"] in wanted
+        ]
+    rows: List[Dict[str, Any]] = []
+    start = 0
+    while len(rows) < builds:
+        end = start + builds - len(rows)
+        page = job.get_data(
+            url, tree="%s{%i,%i}" % (BUILDS_TREE, start, end)
+        ).get("allBuilds", [])
+        rows += [row for row in page if not row.get("building")]
+        if len(page) < end - start:
+            break
+        start = end
+    return rows
+
+
+def get_test_history(
+    job: "Job",
+    builds: int | Iterable[int] = 100,
+    workers: int | None = None,
+    cache_dir: str | None = None,
+) -> TestHistory:
+    """
+    Fetch the test outcomes of completed builds of a job.
+
+    :param builds: number of last completed builds, running builds not
+        counted, or build numbers
+    :param workers: reports fetched at a time, default
+        config.TEST_HISTORY_WORKERS
+    :param cache_dir: directory to cache the reports in, none by default
+    :return: TestHistory of the builds
+    """
+    rows = _completed_builds(job, builds)
+    history = TestHistory(row["number"] for row in rows)
+    cache = ReportCache(cache_dir, job.baseurl) if cache_dir else None
+
+    missing = []
+    for row in rows:
+        table = cache.get(row["number"]) if cache else None
+        if table is None:
+            missing.append(row)
+        else:
+            history.add(row["number"], table)
+    log.info(
+        "Fetching %i test reports of %s, %i cached",
+        len(missing),
+        job.name,
+        len(rows) - len(missing),
+    )
+
+    with ThreadPoolExecutor(
+        max_workers=workers or config.TEST_HISTORY_WORKERS
+    ) as pool:
+        futures = {
+            pool.submit(_fetch_report, job, row): row["number"]
+            for row in missing
+        }
+        for future in as_completed(futures):
+            number = futures[future]
+            try:
+                table = future.result()
+            except (JenkinsAPIException, RequestException) as err:
+                # No report, or not now: not run as far as we know
+                log.debug("No test report for %s #%i: %s", job, number, err)
+                continue
+            history.add(number, table)
+            if cache is not None:
+                cache.put(number, table)
+    return history
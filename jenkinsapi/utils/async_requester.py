@@ -0,0 +1,372 @@
+"""
+Module for jenkinsapi asyncio requester (which is a wrapper around aiohttp)
+
+aiohttp is an optional dependency, install it to use the asyncio client:
+
+    pip install jenkinsapi[async]
+"""
+
+import ssl
+import logging
+import urllib.parse as urlparse
+
+import requests
+
+try:
+    import aiohttp
+    from multidict import CIMultiDict
+except ImportError as err:
+    raise ImportError(
+        "The asyncio client of jenkinsapi requires aiohttp, install it "
+        "with: pip install jenkinsapi[async]"
+    ) from err
+
+from jenkinsapi import config
+from jenkinsapi.custom_exceptions import JenkinsAPIException, PostRequired
+from jenkinsapi.utils.json_decoder import get_decoder, get_decoder_for_url
+from jenkinsapi.utils.requester import Requester
+from jenkinsapi.utils.single_flight import AsyncSingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncResponse(object):
+    """
+    The parts of a requests.Response which jenkinsapi relies on, built
+    from a fully read aiohttp response.
+    """
+
+    def __init__(self, url, status_code, headers, content, encoding=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", "replace")
+
+    def json(self):
+        return get_decoder()(self.text)
+
+    def raise_for_status(self):
+        if 400 <= self.status_code < 600:
+            raise requests.HTTPError(
+                "%s Error for url: %s" % (self.status_code, self.url),
+                response=self,
+            )
+
+
+class AsyncRequester(object):
+    """
+    A class which carries out HTTP requests with asyncio. It mirrors the
+    interface of Requester, but every request method is a coroutine.
+
+    All requests share one aiohttp connection pool, bounded by
+    pool_maxsize connections in total and pool_maxsize_per_host per host
+    (0 means no per-host limit). With coalesce, identical GET requests
+    made by several coroutines at once share one response.
+    """
+
+    VALID_STATUS_CODES = [
+        200,
+    ]
+
+    def __init__(
+        self,
+        username=None,
+        password=None,
+        ssl_verify=True,
+        cert=None,
+        baseurl=None,
+        timeout=10,
+        pool_maxsize=100,
+        pool_maxsize_per_host=0,
+        coalesce=False,
+    ):
+        self.base_scheme = (
+            urlparse.urlsplit(baseurl).scheme if baseurl else None
+        )
+        self.username = username
+        self.password = password
+        if bool(self.username) != bool(self.password):
+            raise ValueError(
+                "Please provide both username and password "
+                "or don't provide them at all"
+            )
+        self.ssl_verify = ssl_verify
+        self.cert = cert
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.pool_maxsize_per_host = pool_maxsize_per_host
+        self.session = None
+        if coalesce is True:
+            coalesce = AsyncSingleFlight()
+        self.single_flight = coalesce or None
+
+    _update_url_scheme = Requester._update_url_scheme
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_ssl(self):
+        if self.ssl_verify is False:
+            return False
+        if self.ssl_verify is True and not self.cert:
+            return True
+        cafile = None if self.ssl_verify is True else self.ssl_verify
+        context = ssl.create_default_context(cafile=cafile)
+        if self.cert:
+            if isinstance(self.cert, (list, tuple)):
+                context.load_cert_chain(*self.cert)
+            else:
+                context.load_cert_chain(self.cert)
+        return context
+
+    def _get_session(self):
+        # The session must be created from within the running event loop
+        if self.session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_maxsize,
+                limit_per_host=self.pool_maxsize_per_host,
+                ssl=self._get_ssl(),
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self.session
+
+    def get_request_dict(
+        self, params=None, data=None, files=None, headers=None
+    ):
+        requestKwargs = {}
+        if self.username:
+            requestKwargs["auth"] = aiohttp.BasicAuth(
+                self.username, self.password
+            )
+
+        if params:
+            assert isinstance(
+                params, dict
+            ), "Params must be a dict, got %s" % repr(params)
+            requestKwargs["params"] = {k: str(v) for k, v in params.items()}
+
+        headers = dict(headers) if headers else {}
+        if Requester.AUTH_COOKIE:
+            headers["Cookie"] = Requester.AUTH_COOKIE
+        if headers:
+            requestKwargs["headers"] = headers
+
+        if files:
+            form = aiohttp.FormData()
+            for name, value in (data or {}).items():
+                form.add_field(name, value)
+            for name, fileobj in files.items():
+                form.add_field(name, fileobj, filename=name)
+            requestKwargs["data"] = form
+        elif data:
+            # It may seem odd, but some Jenkins operations require posting
+            # an empty string.
+            requestKwargs["data"] = data
+
+        return requestKwargs
+
+    async def _request(self, method, url, allow_redirects, **requestKwargs):
+        session = self._get_session()
+        async with session.request(
+            method,
+            self._update_url_scheme(url),
+            allow_redirects=allow_redirects,
+            **requestKwargs,
+        ) as response:
+            content = await response.read()
+            return AsyncResponse(
+                str(response.url),
+                response.status,
+                CIMultiDict(response.headers),
+                content,
+                response.charset,
+            )
+
+    async def get_url(
+        self, url, params=None, headers=None, allow_redirects=True
+    ):
+        requestKwargs = self.get_request_dict(params=params, headers=headers)
+        if self.single_flight is not None:
+            key = self.single_flight.make_key(
+                self._update_url_scheme(url), params, headers, allow_redirects
+            )
+            return await self.single_flight.do(
+                key,
+                lambda: self._request(
+                    "GET", url, allow_redirects, **requestKwargs
+                ),
+            )
+        return await self._request(
+            "GET", url, allow_redirects, **requestKwargs
+        )
+
+    async def post_url(
+        self,
+        url,
+        params=None,
+        data=None,
+        files=None,
+        headers=None,
+        allow_redirects=True,
+    ):
+        requestKwargs = self.get_request_dict(
+            params=params, data=data, files=files, headers=headers
+        )
+        return await self._request(
+            "POST", url, allow_redirects, **requestKwargs
+        )
+
+    async def post_xml_and_confirm_status(
+        self, url, params=None, data=None, valid=None
+    ):
+        headers = {"Content-Type": "text/xml"}
+        return await self.post_and_confirm_status(
+            url, params=params, data=data, headers=headers, valid=valid
+        )
+
+    async def post_and_confirm_status(
+        self,
+        url,
+        params=None,
+        data=None,
+        files=None,
+        headers=None,
+        valid=None,
+        allow_redirects=True,
+    ):
+        valid = valid or self.VALID_STATUS_CODES
+        if not headers and not files:
+            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
+        assert data is not None, "Post messages must have data"
+
+        response = await self.post_url(
+            url, params, data, files, headers, allow_redirects
+        )
+        if response.status_code not in valid:
+            raise JenkinsAPIException(
+                "Operation failed. url={0}, data={1}, headers={2}, "
+                "status={3}, text={4}".format(
+                    response.url,
+                    data,
+                    headers,
+                    response.status_code,
+                    response.text.encode("UTF-8"),
+                )
+            )
+        return response
+
+    async def get_and_confirm_status(
+        self, url, params=None, headers=None, valid=None
+    ):
+        valid = valid or self.VALID_STATUS_CODES
+        response = await self.get_url(url, params, headers)
+        if response.status_code not in valid:
+            if response.status_code == 405:  # POST required
+                raise PostRequired("POST required for url {0}".format(url))
+
+            raise JenkinsAPIException(
+                "Operation failed. url={0}, headers={1}, status={2}, "
+                "text={3}".format(
+                    response.url,
+                    headers,
+                    response.status_code,
+                    response.text.encode("UTF-8"),
+                )
+            )
+        return response
+
+
+class AsyncCrumbRequester(AsyncRequester):
+    """Adapter for AsyncRequester inserting the crumb in every request."""
+
+    def __init__(self, *args, **kwargs):
+        super(AsyncCrumbRequester, self).__init__(*args, **kwargs)
+        self._baseurl = kwargs["baseurl"]
+        self._last_crumb_data = None
+
+    async def post_url(
+        self,
+        url,
+        params=None,
+        data=None,
+        files=None,
+        headers=None,
+        allow_redirects=True,
+    ):
+        if self._last_crumb_data:
+            # first try request with previous crumb if available
+            response = await self._post_url_with_crumb(
+                self._last_crumb_data,
+                url,
+                params,
+                data,
+                files,
+                headers,
+                allow_redirects,
+            )
+            # code 403 might indicate that the crumb is not valid anymore
+            if response.status_code != 403:
+                return response
+
+        # fetch new crumb (if server has crumbs enabled)
+        if self._last_crumb_data is not False:
+            self._last_crumb_data = await self._get_crumb_data()
+
+        return await self._post_url_with_crumb(
+            self._last_crumb_data,
+            url,
+            params,
+            data,
+            files,
+            headers,
+            allow_redirects,
+        )
+
+    async def _get_crumb_data(self):
+        url = "%s/crumbIssuer/%s" % (self._baseurl, config.JENKINS_API)
+        response = await self.get_url(url)
+        if response.status_code in [404]:
+            logger.warning("The Jenkins master does not require a crumb")
+            return False
+        if response.status_code not in [200]:
+            raise RuntimeError("Failed to fetch crumb: %s" % response.text)
+        crumb_issuer_response = get_decoder_for_url(url)(response.text)
+        crumb_request_field = crumb_issuer_response["crumbRequestField"]
+        crumb = crumb_issuer_response["crumb"]
+        logger.debug("Fetched crumb: %s", crumb)
+        return {crumb_request_field: crumb}
+
+    async def _post_url_with_crumb(
+        self,
+        crumb_data,
+        url,
+        params,
+        data,
+        files,
+        headers,
+        allow_redirects,
+    ):
+        if crumb_data:
+            headers = dict(headers or {})
+            headers.update(crumb_data)
+
+        return await super(AsyncCrumbRequester, self).post_url(
+            url, params, data, files, headers, allow_redirects
+        )
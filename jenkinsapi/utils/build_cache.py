@@ -0,0 +1,228 @@
+"""
+Module for the persistent cache of completed builds used by JenkinsBase.
+
+A build never changes once it completed, apart from its description and
+whether it is kept forever, so what the remote access API returns for it
+and for anything under its url (test report, artifacts, ...) can be kept
+on disk across runs. Data is stored decoded, in a SQLite database keyed
+by user, url, ``tree`` and ``depth``, and the least recently used
+entries are evicted once the database exceeds its size budget. The two
+fields which may change are stored as well: Build.toggle_keep() and
+Build.set_description() drop the build from the cache. With
+``live_fields`` they are not stored but fetched again whenever a build
+is served from the cache, at the cost of a request per build.
+
+A response is only stored when its url is under the url of a build
+which was seen with ``building`` false, so that running builds, jobs,
+queues and nodes are always fetched from the server.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Tuple
+
+from jenkinsapi.utils.response_cache import CACHEABLE_PARAMS
+
+log = logging.getLogger(__name__)
+
+# Url of the build an api url belongs to, permalinks such as lastBuild
+# excluded
+BUILD_URL = re.compile(r"^(.*/job/[^/]+(?:/job/[^/]+)*/\d+)/")
+DEFAULT_MAX_BYTES = 256 * 2**20
+# Fields of a build which may change after it completed
+VOLATILE_FIELDS = ("description", "keepLog")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    url TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    build TEXT NOT NULL,
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    volatile TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_build ON entries (build);
+"""
+
+
+class BuildCache(object):
+    """
+    Decoded API data of completed builds, in a SQLite database.
+
+    :param path: file of the database, ":memory:" to keep it in memory
+    :param max_bytes: total size of the data kept, in bytes of JSON
+    :param live_fields: fetch the description and keepLog of builds
+        served from the cache again rather than storing them
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        live_fields: bool = False,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.live_fields = live_fields
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+            (self._size,) = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._db.execute(
+                "SELECT COUNT(*) FROM entries"
+            ).fetchone()
+        return count
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def make_key(url: str, params=None, username=None) -> str | None:
+        """
+        Return a cache key or None when the request is not cacheable.
+        """
+        params = params or {}
+        if any(name not in CACHEABLE_PARAMS for name in params):
+            return None
+        if not BUILD_URL.match(url):
+            return None
+        return json.dumps(
+            [
+                username,
+                url,
+                params.get("tree"),
+                str(params["depth"]) if "depth" in params else None,
+            ]
+        )
+
+    def get(self, key: str, url: str) -> Tuple[Any, List[str]] | None:
+        """
+        Return the data stored for key and the names of the volatile
+        fields stripped from it, or None.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data, volatile FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._db:
+                self._db.execute(
+                    "UPDATE entries SET accessed = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+        log.debug("Serving %s from the build cache", url)
+        return json.loads(row[0]), [f for f in row[1].split(",") if f]
+
+    def put(self, key: str, url: str, data: Any) -> bool:
+        """
+        Store the data of url if it belongs to a completed build, which
+        it tells when it is the build itself. The volatile fields of the
+        build are left out with live_fields. Returns whether it was
+        stored.
+        """
+        build = BUILD_URL.match(url).group(1)
+        own = isinstance(data, dict) and url.startswith(build + "/api/")
+        volatile = []
+        if own and self.live_fields:
+            volatile = [f for f in VOLATILE_FIELDS if f in data]
+        completed = own and data.get("building") is False
+        if volatile:
+            data = {k: v for k, v in data.items() if k not in volatile}
+        with self._lock:
+            with self._db:
+                if completed:
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO builds VALUES (?)", (build,)
+                    )
+                elif not self._db.execute(
+                    "SELECT 1 FROM builds WHERE url = ?", (build,)
+                ).fetchone():
+                    return False
+                text = json.dumps(data)
+                if len(text) > self.max_bytes:
+                    log.debug("Data of %s is too large to cache", url)
+                    return False
+                old = self._db.execute(
+                    "SELECT size FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        build,
+                        text,
+                        len(text),
+                        time.time(),
+                        ",".join(volatile),
+                    ),
+                )
+                self._size += len(text) - (old[0] if old else 0)
+                self._evict()
+        return True
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes:
+            key, size = self._db.execute(
+                "SELECT key, size FROM entries ORDER BY accessed LIMIT 1"
+            ).fetchone()
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._size -= size
+            self.evictions += 1
+
+    def invalidate(self, build_url: str | None = None) -> None:
+        """
+        Drop everything stored for the build at build_url, or the whole
+        cache if build_url is None.
+        """
+        with self._lock, self._db:
+            if build_url is None:
+                self._db.execute("DELETE FROM entries")
+                self._db.execute("DELETE FROM builds")
+            else:
+                build_url = build_url.rstrip("/")
+                self._db.execute(
+                    "DELETE FROM entries WHERE build = ?", (build_url,)
+                )
+                self._db.execute(
+                    "DELETE FROM builds WHERE url = ?", (build_url,)
+                )
+            (self._size,) = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self),
+            "bytes": self._size,
+        }
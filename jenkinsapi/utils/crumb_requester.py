@@ -1,7 +1,9 @@
 # Code from https://github.com/ros-infrastructure/ros_buildfarm
 # (c) Open Source Robotics Foundation
-import ast
 import logging
+import threading
+from jenkinsapi import config
+from jenkinsapi.utils.json_decoder import get_decoder_for_url
 from jenkinsapi.utils.requester import Requester
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,8 @@ class CrumbRequester(Requester):
         super(CrumbRequester, self).__init__(*args, **kwargs)
         self._baseurl = kwargs["baseurl"]
         self._last_crumb_data = None
+        # Only one thread refreshes the crumb, the others reuse it
+        self._crumb_lock = threading.Lock()
 
     def post_url(
         self,
@@ -25,10 +29,11 @@ class CrumbRequester(Requester):
         allow_redirects=True,
         **kwargs,
     ):
-        if self._last_crumb_data:
+        crumb_data = self._last_crumb_data
+        if crumb_data:
             # first try request with previous crumb if available
             response = self._post_url_with_crumb(
-                self._last_crumb_data,
+                crumb_data,
                 url,
                 params,
                 data,
@@ -42,8 +47,13 @@ class CrumbRequester(Requester):
                 return response
 
         # fetch new crumb (if server has crumbs enabled)
-        if self._last_crumb_data is not False:
-            self._last_crumb_data = self._get_crumb_data()
+        with self._crumb_lock:
+            # unless another thread did while we were waiting
+            if (
+                self._last_crumb_data is not False
+                and self._last_crumb_data is crumb_data
+            ):
+                self._last_crumb_data = self._get_crumb_data()
 
         return self._post_url_with_crumb(
             self._last_crumb_data,
@@ -57,13 +67,14 @@ class CrumbRequester(Requester):
         )
 
     def _get_crumb_data(self):
-        response = self.get_url(self._baseurl + "/crumbIssuer/api/python")
+        url = "%s/crumbIssuer/%s" % (self._baseurl, config.JENKINS_API)
+        response = self.get_url(url)
         if response.status_code in [404]:
             logger.warning("The Jenkins master does not require a crumb")
             return False
         if response.status_code not in [200]:
             raise RuntimeError("Failed to fetch crumb: %s" % response.text)
-        crumb_issuer_response = ast.literal_eval(response.text)
+        crumb_issuer_response = get_decoder_for_url(url)(response.text)
         crumb_request_field = crumb_issuer_response["crumbRequestField"]
         crumb = crumb_issuer_response["crumb"]
         logger.debug("Fetched crumb: %s", crumb)
@@ -81,10 +92,8 @@ class CrumbRequester(Requester):
         **kwargs,
     ):
         if crumb_data:
-            if headers is None:
-                headers = crumb_data
-            else:
-                headers.update(crumb_data)
+            headers = dict(headers or {})
+            headers.update(crumb_data)
 
         return super(CrumbRequester, self).post_url(
             url, params, data, files, headers, allow_redirects, **kwargs
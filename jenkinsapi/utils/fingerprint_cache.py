@@ -0,0 +1,155 @@
+"""
+Module for the sidecar cache of artifact checksums.
+
+Each directory artifacts are saved to gets a small JSON file recording,
+per file, the size and mtime it had when its MD5 was computed and the
+builds its fingerprint was validated for. As long as size and mtime are
+unchanged, the file is neither hashed nor validated again.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import logging
+import tempfile
+import threading
+from typing import Any, Dict
+
+log = logging.getLogger(__name__)
+
+_caches: Dict[str, "FingerprintCache"] = {}
+_caches_lock = threading.Lock()
+
+
+class FingerprintCache(object):
+    """
+    Checksums and fingerprint validations of the files in one directory.
+
+    Use for_path() to share one instance per directory between threads.
+    """
+
+    FILENAME = ".jenkinsapi-fingerprints.json"
+    VERSION = 1
+
+    def __init__(self, dirpath: str) -> None:
+        self.dirpath = dirpath
+        self.path = os.path.join(dirpath, self.FILENAME)
+        self._files: Dict[str, Dict[str, Any]] | None = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def for_path(cls, fspath: str) -> "FingerprintCache":
+        """
+        Return the shared cache of the directory containing fspath.
+        """
+        dirpath = os.path.dirname(os.path.abspath(fspath))
+        with _caches_lock:
+            cache = _caches.get(dirpath)
+            if cache is None:
+                cache = _caches[dirpath] = cls(dirpath)
+            return cache
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._files is None:
+            files: Dict[str, Dict[str, Any]] = {}
+            try:
+                with open(self.path) as cache_file:
+                    data = json.load(cache_file)
+                if data.get("version") == self.VERSION:
+                    files = data["files"]
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError, AttributeError) as err:
+                log.warning("Ignoring unreadable %s: %s", self.path, err)
+            self._files = files
+        return self._files
+
+    def _save(self) -> None:
+        handle, tmppath = tempfile.mkstemp(
+            prefix=self.FILENAME, dir=self.dirpath
+        )
+        try:
+            with os.fdopen(handle, "w") as cache_file:
+                json.dump(
+                    {"version": self.VERSION, "files": self._files},
+                    cache_file,
+                )
+            os.replace(tmppath, self.path)
+        except OSError as err:
+            log.warning("Could not write %s: %s", self.path, err)
+            if os.path.exists(tmppath):
+                os.remove(tmppath)
+
+    def _entry(self, fspath: str) -> Dict[str, Any] | None:
+        """
+        Return the entry of fspath if the file is unchanged since.
+        """
+        try:
+            stat = os.stat(fspath)
+        except OSError:
+            return None
+        entry = self._load().get(os.path.basename(fspath))
+        if (
+            entry is None
+            or entry["size"] != stat.st_size
+            or entry["mtime_ns"] != stat.st_mtime_ns
+        ):
+            return None
+        return entry
+
+    def get_md5(self, fspath: str) -> str | None:
+        with self._lock:
+            entry = self._entry(fspath)
+            return entry["md5"] if entry else None
+
+    def put_md5(self, fspath: str, md5: str) -> None:
+        """
+        Record the MD5 of fspath as it is now. Validations recorded for
+        a different MD5 are forgotten.
+        """
+        try:
+            stat = os.stat(fspath)
+        except OSError:
+            return
+        with self._lock:
+            files = self._load()
+            name = os.path.basename(fspath)
+            old = files.get(name)
+            validated = old["validated"] if old and old["md5"] == md5 else []
+            files[name] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "md5": md5,
+                "validated": validated,
+            }
+            self._save()
+
+    def is_validated(
+        self, fspath: str, md5: str, job: str, build: int, strict: bool
+    ) -> bool:
+        """
+        Return True if the fingerprint of fspath was validated for the
+        build before. Validations of fingerprints unknown to Jenkins
+        only count when not strict.
+        """
+        with self._lock:
+            entry = self._entry(fspath)
+            if entry is None or entry["md5"] != md5:
+                return False
+            return any(
+                (v_job, v_build) == (job, build) and not (strict and unknown)
+                for v_job, v_build, unknown in entry["validated"]
+            )
+
+    def put_validated(
+        self, fspath: str, md5: str, job: str, build: int, unknown: bool
+    ) -> None:
+        with self._lock:
+            entry = self._entry(fspath)
+            if entry is None or entry["md5"] != md5:
+                return
+            entry["validated"] = [
+                v for v in entry["validated"] if (v[0], v[1]) != (job, build)
+            ] + [[job, build, unknown]]
+            self._save()
@@ -0,0 +1,94 @@
+"""
+Decoders for the payloads returned by the Jenkins remote access API.
+
+Jenkins serves the same data as JSON (``api/json``) and as a Python literal
+(``api/python``). JSON is much cheaper to parse, so it is the default; the
+fastest JSON library available is picked automatically. orjson and ujson
+are optional, the standard library ``json`` module is always available.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+from typing import Any, Callable, Dict
+
+from jenkinsapi import config
+
+Decoder = Callable[[Any], Any]
+
+
+def _load_orjson() -> Decoder:
+    import orjson
+
+    return orjson.loads
+
+
+def _load_ujson() -> Decoder:
+    import ujson
+
+    return ujson.loads
+
+
+def _load_json() -> Decoder:
+    return json.loads
+
+
+def _load_python() -> Decoder:
+    return ast.literal_eval
+
+
+DECODER_LOADERS: Dict[str, Callable[[], Decoder]] = {
+    "orjson": _load_orjson,
+    "ujson": _load_ujson,
+    "json": _load_json,
+    "python": _load_python,
+}
+
+# Order in which JSON decoders are tried when none is configured
+PREFERRED_JSON_DECODERS = ["orjson", "ujson", "json"]
+
+# Decoders loaded so far by name, None for the resolved default
+_decoder_cache: Dict[str | None, Decoder] = {}
+
+
+def get_decoder(name: str | None = None) -> Decoder:
+    """
+    Return a callable turning a response body into Python objects.
+
+    :param name: one of the keys of DECODER_LOADERS, or None to use
+        the fastest JSON decoder that is installed
+    :raises ValueError: when the decoder is unknown
+    :raises ImportError: when the requested library is not installed
+    """
+    if name is None:
+        if None not in _decoder_cache:
+            for candidate in PREFERRED_JSON_DECODERS:
+                try:
+                    _decoder_cache[None] = get_decoder(candidate)
+                    break
+                except ImportError:
+                    continue
+        return _decoder_cache[None]
+
+    if name not in DECODER_LOADERS:
+        raise ValueError("Unknown decoder: %s" % name)
+
+    if name not in _decoder_cache:
+        _decoder_cache[name] = DECODER_LOADERS[name]()
+    return _decoder_cache[name]
+
+
+def get_decoder_for_url(url: str) -> Decoder:
+    """
+    Return the decoder matching the API flavour of the given url.
+
+    Urls pointing at ``api/python`` are always parsed as Python literals,
+    everything else is decoded with config.JSON_DECODER, which may be
+    a decoder name, a callable or None for automatic selection.
+    """
+    if config.JENKINS_PYTHON_API in url:
+        return get_decoder("python")
+    if callable(config.JSON_DECODER):
+        return config.JSON_DECODER
+    return get_decoder(config.JSON_DECODER)
@@ -0,0 +1,144 @@
+"""
+Module for reading the elements of arrays out of a JSON document while it
+is being downloaded.
+
+Only what is around the arrays is tokenized in Python; every element is
+decoded by json.JSONDecoder.raw_decode once it was received in full, so
+that memory is bounded by the largest element rather than the document.
+"""
+
+from __future__ import annotations
+
+import re
+import json
+import codecs
+from typing import Any, Iterable, Iterator
+
+# A whole string, or any other character which is not whitespace
+_TOKEN = re.compile(r'\s*("[^"\\]*(?:\\.[^"\\]*)*"|[^\s"])', re.DOTALL)
+_WHITESPACE = re.compile(r"\s*")
+_DELIMITER = re.compile(r"[\s,\]}]")
+
+# Consumed text is dropped once it is this long
+COMPACT_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+
+
+class _TextBuffer(object):
+    """
+    Text decoded from an iterable of byte chunks, read from a position.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int = 1) -> bool:
+        """
+        Read at least size more characters, unless the end of the stream
+        is reached first. Returns False at the end of the stream.
+        """
+        if self.eof:
+            return False
+        pos = self.pos
+        if pos >= COMPACT_SIZE:
+            self.text = self.text[pos:]
+            self.pos = 0
+        parts = [self.text]
+        target = len(self.text) + size
+        length = len(self.text)
+        while length < target:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                parts.append(self._decoder.decode(b"", final=True))
+                self.eof = True
+                break
+            part = self._decoder.decode(chunk)
+            parts.append(part)
+            length += len(part)
+        self.text = "".join(parts)
+        return True
+
+    def token(self) -> str | None:
+        """
+        Return the next string or structural character, or None at the
+        end of the stream.
+        """
+        while True:
+            match = _TOKEN.match(self.text, self.pos)
+            # A string may be cut at the end of the text read so far
+            if match and (match.end() < len(self.text) or self.eof):
+                self.pos = match.end()
+                return match.group(1)
+            if not self.fill(max(1, len(self.text) - self.pos)):
+                if _WHITESPACE.match(self.text, self.pos).end() == len(
+                    self.text
+                ):
+                    return None
+                start, end = self.pos, self.pos + 20
+                raise ValueError("Invalid JSON at %r" % self.text[start:end])
+
+    def peek(self) -> str | None:
+        """
+        Return the next character which is not whitespace, without
+        consuming it, or None at the end of the stream.
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return None
+
+    def value(self) -> Any:
+        """
+        Decode the JSON value at the current position.
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # A number may be cut by the end of the text read so far,
+                # valid values are always followed by a delimiter
+                if self.eof or _DELIMITER.match(self.text, end):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow geometrically, not to decode a large value many times
+            self.fill(max(1, len(self.text) - self.pos))
+
+
+def iter_array_items(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """
+    Yield the elements of every array stored under key, at any depth, in
+    a UTF-8 JSON document read from an iterable of byte chunks.
+    """
+    buffer = _TextBuffer(chunks)
+    quoted_key = json.dumps(key)
+    previous = None
+    depth = 0
+    while True:
+        token = buffer.token()
+        if token is None:
+            if depth:
+                raise ValueError("Truncated JSON document")
+            return
+        if token == ":" and previous == quoted_key and buffer.peek() == "[":
+            buffer.token()
+            token = buffer.token() if buffer.peek() == "]" else ","
+            while token == ",":
+                yield buffer.value()
+                token = buffer.token()
+            if token != "]":
+                raise ValueError("Invalid JSON array under %s" % quoted_key)
+        elif token in ("{", "["):
+            depth += 1
+        elif token in ("}", "]"):
+            depth -= 1
+        previous = token
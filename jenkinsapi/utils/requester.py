@@ -4,8 +4,12 @@ Module for jenkinsapi requester (which is a wrapper around python-requests)
 
 import requests
 import urllib.parse as urlparse
+from urllib3 import Retry
 
+from jenkinsapi import config
 from jenkinsapi.custom_exceptions import JenkinsAPIException, PostRequired
+from jenkinsapi.utils.response_cache import get_shared_cache
+from jenkinsapi.utils.single_flight import SingleFlight
 
 # import logging
 
@@ -28,6 +32,29 @@ from jenkinsapi.custom_exceptions import JenkinsAPIException, PostRequired
 requests.adapters.DEFAULT_RETRIES = 5
 
 
+def retry_policy(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+):
+    """
+    Return a retry policy for the max_retries argument of Requester.
+
+    Failed connections and the given statuses are retried up to total
+    times, sleeping backoff_factor * 2 ** (retry - 1) seconds in between.
+    Only idempotent methods are retried by default: add "POST" to
+    allowed_methods to retry build triggers as well.
+    """
+    return Retry(
+        total=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        allowed_methods=allowed_methods,
+        raise_on_status=False,
+    )
+
+
 class Requester(object):
     """
     A class which carries out HTTP requests. You can replace this
@@ -35,6 +62,16 @@ class Requester(object):
     way to access Jenkins.
 
     This default class can handle simple authentication only.
+
+    Connections are kept alive in pools of the underlying session:
+    pool_connections is the number of hosts pools are kept for,
+    pool_maxsize the number of connections kept per host and pool_block
+    makes threads wait for a free connection instead of opening one which
+    is discarded afterwards. max_retries takes a number of retries or a
+    retry policy, see retry_policy().
+
+    With coalesce, identical GET requests made from several threads at
+    once share the response of the first one, see single_flight.
     """
 
     VALID_STATUS_CODES = [
@@ -86,12 +123,71 @@ class Requester(object):
         self.timeout = kwargs.get("timeout", timeout)
         self.session = requests.Session()
         self.max_retries = kwargs.get("max_retries")
+        self.pool_connections = (
+            kwargs.get("pool_connections")
+            or requests.adapters.DEFAULT_POOLSIZE
+        )
+        self.pool_maxsize = (
+            kwargs.get("pool_maxsize") or requests.adapters.DEFAULT_POOLSIZE
+        )
+        self.pool_block = kwargs.get(
+            "pool_block", requests.adapters.DEFAULT_POOLBLOCK
+        )
+        adapter_kwargs = {
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "pool_block": self.pool_block,
+        }
         if self.max_retries is not None:
-            retry_adapter = requests.adapters.HTTPAdapter(
-                max_retries=self.max_retries
-            )
-            self.session.mount("http://", retry_adapter)
-            self.session.mount("https://", retry_adapter)
+            adapter_kwargs["max_retries"] = self.max_retries
+        adapter = requests.adapters.HTTPAdapter(**adapter_kwargs)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Responses of the remote access API may be cached: pass True to
+        # use the process-wide cache or a ResponseCache of your own.
+        cache = kwargs.get("cache")
+        if cache is True:
+            cache = get_shared_cache()
+        elif cache is False:
+            cache = None
+        self.cache = cache
+
+        # Identical concurrent GETs may share one request: pass True or a
+        # SingleFlight of your own, its stats() tell how many were shared.
+        single_flight = kwargs.get("coalesce")
+        if single_flight is True:
+            single_flight = SingleFlight()
+        elif single_flight is False:
+            single_flight = None
+        self.single_flight = single_flight
+
+    def connection_stats(self):
+        """
+        Return connection reuse per host, e.g.
+        {"https://jenkins:443": {"requests": 20, "connections": 2,
+        "reused": 18}}. Hosts whose pool was dropped, because more than
+        pool_connections hosts were used, are not reported.
+        """
+        stats = {}
+        adapters = {id(a): a for a in self.session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                try:
+                    pool = pools[key]
+                except KeyError:
+                    continue
+                host = "%s://%s:%s" % (pool.scheme, pool.host, pool.port)
+                host_stats = stats.setdefault(
+                    host, {"requests": 0, "connections": 0, "reused": 0}
+                )
+                host_stats["requests"] += pool.num_requests
+                host_stats["connections"] += pool.num_connections
+                host_stats["reused"] += max(
+                    pool.num_requests - pool.num_connections, 0
+                )
+        return stats
 
     def get_request_dict(
         self, params=None, data=None, files=None, headers=None, **kwargs
@@ -163,7 +259,50 @@ class Requester(object):
             allow_redirects=allow_redirects,
             stream=stream,
         )
-        return self.session.get(self._update_url_scheme(url), **requestKwargs)
+        url = self._update_url_scheme(url)
+        if self.single_flight is not None and not stream:
+            key = self.single_flight.make_key(
+                url, params, headers, allow_redirects
+            )
+            return self.single_flight.do(
+                key, lambda: self._get_url(url, params, requestKwargs)
+            )
+        return self._get_url(url, params, requestKwargs, stream)
+
+    def _get_url(self, url, params, requestKwargs, stream=False):
+        if self.cache is not None and not stream and self._is_api_url(url):
+            key = self.cache.make_key(url, params, self.username)
+            if key is not None:
+                return self._get_url_cached(key, url, requestKwargs)
+        return self.session.get(url, **requestKwargs)
+
+    @staticmethod
+    def _is_api_url(url):
+        return config.JENKINS_API in url or config.JENKINS_PYTHON_API in url
+
+    def _get_url_cached(self, key, url, requestKwargs):
+        """
+        Serve a GET from the response cache, revalidating stale entries
+        with the validators Jenkins sent along with the cached response.
+        """
+        entry = self.cache.get(key)
+        if entry is not None:
+            if self.cache.is_fresh(key, entry):
+                self.cache.record_hit()
+                return entry.response
+            headers = dict(requestKwargs.get("headers") or {})
+            headers.update(entry.validators())
+            requestKwargs["headers"] = headers
+
+        response = self.session.get(url, **requestKwargs)
+        if entry is not None and response.status_code == 304:
+            self.cache.touch(key)
+            return entry.response
+
+        self.cache.record_miss()
+        if response.status_code in self.VALID_STATUS_CODES:
+            self.cache.put(key, response)
+        return response
 
     def post_url(
         self,
@@ -183,7 +322,12 @@ class Requester(object):
             allow_redirects=allow_redirects,
             **kwargs,
         )
-        return self.session.post(self._update_url_scheme(url), **requestKwargs)
+        url = self._update_url_scheme(url)
+        if self.cache is not None:
+            # Whatever was posted to has most likely changed: forget the
+            # object the url belongs to, not the ones below it.
+            self.cache.invalidate_object(url.split("?")[0].rsplit("/", 1)[0])
+        return self.session.post(url, **requestKwargs)
 
     def post_xml_and_confirm_status(
         self, url, params=None, data=None, valid=None
@@ -0,0 +1,274 @@
+"""
+Module for the HTTP response cache used by jenkinsapi Requester.
+
+Responses of the remote access API are kept in a bounded LRU, keyed by
+user, url, ``tree`` and ``depth``. Entries are served without touching
+the server until the TTL of their url class expires, then revalidated
+with ``If-None-Match`` / ``If-Modified-Since`` when Jenkins sent an ETag
+or Last-Modified header.
+
+Builds are only given a long TTL once a response for them reported
+``building`` false at its top level: running builds, or builds whose
+state was not fetched, are revalidated on every request like the queue.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from jenkinsapi.utils.json_decoder import get_decoder_for_url
+
+log = logging.getLogger(__name__)
+
+# Parameters which may be part of a cache key. Requests carrying any
+# other parameter are never cached.
+CACHEABLE_PARAMS = ("tree", "depth")
+
+# (url regex, ttl in seconds), first match wins.
+DEFAULT_TTLS: List[Tuple[str, float]] = [
+    (r"/queue/", 0),
+    (r"/computer/", 5),
+    (r"/job/[^/]+/(job/[^/]+/)*\d+/", 0),
+]
+DEFAULT_TTL = 5
+# ttl of anything under the url of a build seen with building false
+COMPLETED_BUILD_TTL = 60
+# Most builds remembered as completed, least recently used are forgotten
+MAX_COMPLETED_BUILDS = 4096
+
+# Url of the build an api url belongs to
+BUILD_URL = re.compile(r"^(.*/job/[^/]+(?:/job/[^/]+)*/\d+)/")
+# building false anywhere, in JSON or in the Python literal of api/python,
+# e.g. in the runs of a matrix build: only a hint to decode the body
+_NOT_BUILDING = re.compile(rb"""["']building["']\s*:\s*(?:false|False)\b""")
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+def _reports_completed(url: str, content: bytes) -> bool:
+    """
+    Return whether the api response of a build says, at its top level,
+    that the build is not building anymore.
+    """
+    if not _NOT_BUILDING.search(content):
+        return False
+    try:
+        data = get_decoder_for_url(url)(content.decode("utf-8"))
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return isinstance(data, dict) and data.get("building") is False
+
+
+class CacheEntry(object):
+    """A cached response and the metadata needed to revalidate it."""
+
+    __slots__ = (
+        "response",
+        "ttl",
+        "size",
+        "stored_at",
+        "etag",
+        "last_modified",
+    )
+
+    def __init__(self, response, ttl: float) -> None:
+        self.response = response
+        self.ttl = ttl
+        self.size: int = len(response.content or b"")
+        self.stored_at: float = time.monotonic()
+        self.etag: str | None = response.headers.get("ETag")
+        self.last_modified: str | None = response.headers.get("Last-Modified")
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache(object):
+    """
+    Bounded LRU of HTTP responses with a total size budget in bytes.
+
+    :param max_bytes: total size of response bodies kept in memory
+    :param ttls: list of (url regex, seconds) pairs, first match wins
+    :param default_ttl: ttl for urls not matching any of the ttls
+    :param completed_build_ttl: ttl for urls under a build which was
+        seen with building false
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: List[Tuple[str, float]] | None = None,
+        default_ttl: float = DEFAULT_TTL,
+        completed_build_ttl: float = COMPLETED_BUILD_TTL,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttls = [
+            (re.compile(pattern), ttl)
+            for pattern, ttl in (DEFAULT_TTLS if ttls is None else ttls)
+        ]
+        self.default_ttl = default_ttl
+        self.completed_build_ttl = completed_build_ttl
+        self._completed: OrderedDict = OrderedDict()
+        self._entries: OrderedDict = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @staticmethod
+    def make_key(url: str, params=None, username=None):
+        """
+        Return a cache key or None when the request is not cacheable.
+        """
+        params = params or {}
+        if any(name not in CACHEABLE_PARAMS for name in params):
+            return None
+        return (
+            username,
+            url,
+            params.get("tree"),
+            str(params["depth"]) if "depth" in params else None,
+        )
+
+    def ttl_for(self, url: str, response=None) -> float:
+        """
+        Return the ttl of a response for url. A response for a build
+        itself saying it is not building marks the build as completed.
+        """
+        match = BUILD_URL.match(url)
+        if match is not None:
+            build = match.group(1)
+            if (
+                response is not None
+                and url.startswith(build + "/api/")
+                and _reports_completed(url, response.content or b"")
+            ):
+                self._completed[build] = True
+                while len(self._completed) > MAX_COMPLETED_BUILDS:
+                    self._completed.popitem(last=False)
+            if build in self._completed:
+                self._completed.move_to_end(build)
+                return self.completed_build_ttl
+        for pattern, ttl in self.ttls:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key) -> CacheEntry | None:
+        """
+        Return the entry for key, whether fresh or stale, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, key, entry: CacheEntry) -> bool:
+        age = time.monotonic() - entry.stored_at
+        return age < entry.ttl
+
+    def put(self, key, response) -> None:
+        with self._lock:
+            ttl = self.ttl_for(key[1], response)
+        entry = CacheEntry(response, ttl)
+        if entry.size > self.max_bytes:
+            log.debug("Response for %s is too large to cache", key[1])
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old.size
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+
+    def touch(self, key) -> None:
+        """Mark an entry as fresh again after a 304 Not Modified."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.stored_at = time.monotonic()
+                # The build may have been seen completed since
+                entry.ttl = self.ttl_for(key[1])
+            self.revalidations += 1
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def invalidate_object(self, url: str) -> None:
+        """
+        Drop the entries of the api of the object at url, and forget it
+        was a completed build, leaving the objects below it alone.
+        """
+        url = url.rstrip("/")
+        api = url + "/api/"
+        with self._lock:
+            self._completed.pop(url, None)
+            for key in [k for k in self._entries if k[1].startswith(api)]:
+                self._size -= self._entries.pop(key).size
+
+    def invalidate(self, prefix: str | None = None) -> None:
+        """
+        Drop all entries whose url starts with prefix, or the whole cache
+        if prefix is None.
+        """
+        with self._lock:
+            if prefix is None:
+                self._entries.clear()
+                self._completed.clear()
+                self._size = 0
+                return
+            for key in [k for k in self._entries if k[1].startswith(prefix)]:
+                self._size -= self._entries.pop(key).size
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._size,
+        }
+
+
+_shared_cache: ResponseCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> ResponseCache:
+    """
+    Return the process-wide ResponseCache, creating it on first use.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
@@ -0,0 +1,137 @@
+"""
+Module for coalescing identical concurrent GET requests.
+
+When several threads, or coroutines, ask for the same url with the same
+parameters while a request for it is in flight, they wait for that
+request and share its response rather than each sending their own.
+Nothing is kept once the request completed: unlike the response cache,
+a GET sent after the previous one returned always reaches the server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+log = logging.getLogger(__name__)
+
+
+def make_key(url, params=None, headers=None, allow_redirects=True):
+    """
+    Return the key of a GET request, equal for identical requests.
+    """
+    return (
+        url,
+        tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())),
+        tuple(sorted((headers or {}).items())),
+        allow_redirects,
+    )
+
+
+class _Call(object):
+    """A request in flight and its outcome."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class _Stats(object):
+    def __init__(self) -> None:
+        self.requests = 0
+        self.coalesced = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of requests sent, of requests which shared the
+        response of one in flight instead, and of requests in flight.
+        """
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+
+class SingleFlight(_Stats):
+    """
+    Coalesces identical calls made from several threads at once.
+    """
+
+    make_key = staticmethod(make_key)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Return the result of function, or of the call of it in flight
+        for key. Its exception is raised in every thread sharing it.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.requests += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            log.debug("Waiting for the request in flight for %s", key[0])
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight(_Stats):
+    """
+    Coalesces identical calls made from several coroutines at once, in
+    one event loop.
+    """
+
+    make_key = staticmethod(make_key)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(
+        self, key: Hashable, function: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the result of awaiting function(), or of the call of it in
+        flight for key. A coroutine cancelled while waiting does not
+        cancel the call for the others.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(function())
+            self.requests += 1
+
+            def forget(_):
+                if self._calls.get(key) is task:
+                    del self._calls[key]
+
+            task.add_done_callback(forget)
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
@@ -0,0 +1,238 @@
+"""
+Module for extracting a zip archive while it is being downloaded.
+
+zipfile needs to seek to the central directory at the end of an archive.
+Jenkins writes the archives it serves on the fly, so the local header in
+front of each entry is read instead, and entries whose sizes are only
+known after their data, from the data descriptor, are inflated until the
+end of their deflate stream.
+"""
+
+from __future__ import annotations
+
+import os
+import zlib
+import struct
+import logging
+from zipfile import BadZipFile
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+
+log = logging.getLogger(__name__)
+
+LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+# Records following the last entry
+END_SIGNATURES = (b"PK\x01\x02", b"PK\x05\x06", b"PK\x06\x06")
+
+FLAG_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+ZIP64_EXTRA = 0x0001
+STORED = 0
+DEFLATED = 8
+
+INFLATE_INPUT_SIZE = 64 * 1024
+
+
+class _ChunkReader(object):
+    """
+    Reads exact amounts of bytes from an iterable of byte chunks.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._buffer = b""
+        self._pos = 0
+
+    def read_chunk(self, size: int | None = None) -> bytes:
+        """
+        Return the next bytes available, at most size of them, or b"" at
+        the end of the stream.
+        """
+        while self._pos >= len(self._buffer):
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return b""
+            self._pos = 0
+        start = self._pos
+        if size is None:
+            end = len(self._buffer)
+        else:
+            end = min(start + size, len(self._buffer))
+        self._pos = end
+        return self._buffer[start:end]
+
+    def read(self, size: int) -> bytes:
+        chunks = []
+        while size:
+            chunk = self.read_chunk(size)
+            if not chunk:
+                raise BadZipFile("Truncated zip stream")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def unread(self, data: bytes) -> None:
+        """
+        Push back the last bytes read.
+        """
+        if self._pos >= len(data):
+            # Still in the current chunk, no need to copy
+            self._pos -= len(data)
+        else:
+            pos = self._pos
+            self._buffer = data + self._buffer[pos:]
+            self._pos = 0
+
+
+def _is_zip64(extra: bytes) -> bool:
+    while len(extra) >= 4:
+        header_id, size = struct.unpack("<HH", extra[:4])
+        if header_id == ZIP64_EXTRA:
+            return True
+        end = 4 + size
+        extra = extra[end:]
+    return False
+
+
+def _iter_data(
+    reader: _ChunkReader, method: int, flags: int, compressed_size: int
+) -> Iterator[bytes]:
+    if method not in (STORED, DEFLATED):
+        raise BadZipFile("Unsupported compression method %i" % method)
+    inflater = zlib.decompressobj(-15) if method == DEFLATED else None
+    if flags & FLAG_DESCRIPTOR:
+        if inflater is None:
+            raise BadZipFile("Stored entry of unknown size")
+        while not inflater.eof:
+            # Bounded, as the input left over is copied to unused_data
+            chunk = reader.read_chunk(INFLATE_INPUT_SIZE)
+            if not chunk:
+                raise BadZipFile("Truncated zip stream")
+            data = inflater.decompress(chunk)
+            if data:
+                yield data
+        reader.unread(inflater.unused_data)
+        return
+    remaining = compressed_size
+    while remaining:
+        chunk = reader.read_chunk(remaining)
+        if not chunk:
+            raise BadZipFile("Truncated zip stream")
+        remaining -= len(chunk)
+        data = inflater.decompress(chunk) if inflater else chunk
+        if data:
+            yield data
+    if inflater is not None:
+        data = inflater.flush()
+        if data:
+            yield data
+
+
+def iter_zip_stream(
+    chunks: Iterable[bytes],
+) -> Iterator[Tuple[str, Iterator[bytes]]]:
+    """
+    Yield (name, data) for every entry of a zip archive read from an
+    iterable of byte chunks, data being an iterator of its uncompressed
+    bytes. Data must be consumed before the next entry is read, whatever
+    is left of it is skipped. A CRC mismatch raises BadZipFile once the
+    data of an entry was consumed.
+    """
+    reader = _ChunkReader(chunks)
+    while True:
+        signature = reader.read(4)
+        if signature in END_SIGNATURES:
+            return
+        if signature != LOCAL_HEADER_SIGNATURE:
+            raise BadZipFile("Bad local header signature %r" % signature)
+        reader.unread(signature)
+        (
+            _,
+            _,
+            flags,
+            method,
+            _,
+            _,
+            crc,
+            compressed_size,
+            _,
+            name_length,
+            extra_length,
+        ) = LOCAL_HEADER.unpack(reader.read(LOCAL_HEADER.size))
+        raw_name = reader.read(name_length)
+        extra = reader.read(extra_length)
+        name = raw_name.decode("utf-8" if flags & FLAG_UTF8 else "cp437")
+        if compressed_size == 0xFFFFFFFF and not flags & FLAG_DESCRIPTOR:
+            raise BadZipFile("Zip64 sizes in local header of %s" % name)
+
+        state = {"crc": 0}
+
+        def data(
+            method: int = method,
+            flags: int = flags,
+            size: int = compressed_size,
+        ) -> Iterator[bytes]:
+            for chunk in _iter_data(reader, method, flags, size):
+                state["crc"] = zlib.crc32(chunk, state["crc"])
+                yield chunk
+
+        entry_data = data()
+        yield name, entry_data
+        for _ in entry_data:
+            pass
+
+        if flags & FLAG_DESCRIPTOR:
+            descriptor = reader.read(4)
+            if descriptor == DESCRIPTOR_SIGNATURE:
+                descriptor = reader.read(4)
+            crc = struct.unpack("<I", descriptor)[0]
+            reader.read(16 if _is_zip64(extra) else 8)
+        if state["crc"] != crc:
+            raise BadZipFile("Bad CRC-32 for %s" % name)
+
+
+def _safe_path(dirpath: str, name: str) -> str | None:
+    parts = [part for part in name.replace("\\", "/").split("/") if part]
+    if not parts or ".." in parts or name.startswith(("/", "\\")):
+        return None
+    if os.path.splitdrive(parts[0])[0]:
+        return None
+    return os.path.join(dirpath, *parts)
+
+
+def extract_zip_stream(
+    chunks: Iterable[bytes],
+    dirpath: str,
+    include: Callable[[str], bool] | None = None,
+    strip_prefix: str = "",
+) -> Dict[str, str]:
+    """
+    Extract a zip archive read from an iterable of byte chunks into
+    dirpath, one chunk at a time.
+
+    :param include: callable returning whether an entry, by its name
+        without strip_prefix, is extracted; all are by default
+    :param strip_prefix: prefix removed from the names of the entries
+    :return: dict of the names extracted to the paths extracted to
+    """
+    extracted = {}
+    prefix_len = len(strip_prefix)
+    for name, data in iter_zip_stream(chunks):
+        if strip_prefix and name.startswith(strip_prefix):
+            name = name[prefix_len:]
+        if not name or name.endswith("/"):
+            continue
+        if include is not None and not include(name):
+            continue
+        fspath = _safe_path(dirpath, name)
+        if fspath is None:
+            log.warning("Not extracting %s outside of %s", name, dirpath)
+            continue
+        os.makedirs(os.path.dirname(fspath), exist_ok=True)
+        with open(fspath, "wb") as out:
+            for chunk in data:
+                out.write(chunk)
+        extracted[name] = fspath
+    return extracted
@@ -0,0 +1,171 @@
+"""
+Fetch thousands of small artifacts from a local stub, one request per
+artifact against a single archive.zip extracted while downloading.
+
+Run with:
+
+    python -m jenkinsapi_tests.benchmarks.bench_artifact_archive
+"""
+
+import argparse
+import io
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from jenkinsapi.artifact import Artifact
+from jenkinsapi.build import Build
+from jenkinsapi.utils.requester import Requester
+
+ARCHIVE = "/artifact/*zip*/archive.zip"
+
+
+class Unseekable(io.RawIOBase):
+    """Makes zipfile write data descriptors, as Jenkins does."""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+
+def make_artifacts(num_files, size):
+    line = b"<tr><td class='line'>covered</td></tr>\n"
+    content = (line * (size // len(line) + 1))[:size]
+    return {
+        "coverage/pkg%03i/file%05i.html" % (i % 100, i): content
+        for i in range(num_files)
+    }
+
+
+def make_archive(artifacts):
+    out = Unseekable()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path, content in artifacts.items():
+            archive.writestr("archive/" + path, content)
+    return out.buffer.getvalue()
+
+
+class ArtifactHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are sent separately, don't wait for delayed ACKs
+    disable_nagle_algorithm = True
+    artifacts = {}
+    archive = b""
+    latency = 0.0
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        path = unquote(urlsplit(self.path).path)
+        if path.endswith(ARCHIVE):
+            body = self.archive
+        else:
+            body = self.artifacts.get(path.split("/artifact/", 1)[-1])
+        if body is None:
+            self.send_error(404)
+            return
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Pooled connections being dropped by the client
+        pass
+
+
+class FakeJob(object):
+    def __init__(self, pool_maxsize):
+        self.jenkins = self
+        self.requester = Requester(timeout=60, pool_maxsize=pool_maxsize)
+
+    def get_jenkins_obj(self):
+        return self
+
+
+def bench(build, artifacts, workers):
+    objs = [
+        Artifact(
+            path.rsplit("/", 1)[1],
+            build.baseurl + "/artifact/" + path,
+            build,
+            relative_path=path,
+        )
+        for path in artifacts
+    ]
+    runs = [
+        (
+            "download_artifacts(workers=1)",
+            lambda d: build.download_artifacts(d, objs, workers=1),
+        ),
+        (
+            "download_artifacts(workers=%i)" % workers,
+            lambda d: build.download_artifacts(d, objs, workers=workers),
+        ),
+        ("extract_artifacts()", lambda d: build.extract_artifacts(d)),
+    ]
+    for label, run in runs:
+        dirpath = tempfile.mkdtemp(prefix="bench_archive")
+        try:
+            begin = time.perf_counter()
+            fetched = run(dirpath)
+            elapsed = time.perf_counter() - begin
+            assert len(fetched) == len(artifacts), len(fetched)
+        finally:
+            shutil.rmtree(dirpath)
+        print(
+            "  %-32s %8.2fs %8.0f files/s"
+            % (label, elapsed, len(artifacts) / elapsed)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=4096, help="bytes")
+    parser.add_argument(
+        "--latency", type=float, default=2.0, help="ms per request"
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    artifacts = make_artifacts(args.files, args.size)
+    ArtifactHandler.artifacts = artifacts
+    ArtifactHandler.archive = make_archive(artifacts)
+    ArtifactHandler.latency = args.latency / 1000.0
+    print(
+        "%i artifacts of %i bytes, archive.zip %.1f MiB, %.1fms per request"
+        % (
+            args.files,
+            args.size,
+            len(ArtifactHandler.archive) / 2.0**20,
+            args.latency,
+        )
+    )
+
+    server = QuietServer(("127.0.0.1", 0), ArtifactHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = "http://127.0.0.1:%i/job/bench/1" % server.server_port
+        build = Build(url, 1, FakeJob(args.workers), poll=False)
+        bench(build, artifacts, args.workers)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
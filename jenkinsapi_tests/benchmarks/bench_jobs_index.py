@@ -0,0 +1,83 @@
+"""
+Time job lookups in Jobs against the linear scan they replaced.
+
+Run with:
+
+    python -m jenkinsapi_tests.benchmarks.bench_jobs_index
+"""
+
+import timeit
+
+from jenkinsapi.job import Job
+from jenkinsapi.jobs import Jobs
+from jenkinsapi_tests.benchmarks.payloads import jenkins_payload
+
+BASEURL = "http://localhost:8080"
+LOOKUPS = 200
+
+
+class FakeJenkins(object):
+    baseurl = BASEURL
+
+    def __init__(self, num_jobs):
+        self.payload = jenkins_payload(num_jobs)
+
+    def poll(self, tree=None):  # pylint: disable=unused-argument
+        return self.payload
+
+
+def linear_find(jobs, job_name):
+    # What Jobs.__contains__ + __getitem__ did before the index
+    if job_name not in jobs.keys():
+        return None
+    for row in jobs._data:
+        if (
+            row["name"] == job_name
+            or Job.get_full_name_from_url_and_baseurl(row["url"], BASEURL)
+            == job_name
+        ):
+            return row
+    return None
+
+
+def indexed_find(jobs, job_name):
+    if job_name not in jobs:
+        return None
+    return jobs._find_job_row(job_name)
+
+
+def bench(num_jobs):
+    jobs = Jobs(FakeJenkins(num_jobs))
+    jobs._load_rows()
+    names = ["job_%i" % (i * num_jobs // LOOKUPS) for i in range(LOOKUPS)]
+
+    index_time = min(
+        timeit.repeat(
+            lambda: jobs._get_index(),
+            setup=lambda: setattr(jobs, "_indexes", None),
+            number=1,
+            repeat=3,
+        )
+    )
+    print("%i jobs, %i lookups" % (num_jobs, LOOKUPS))
+    print("  build index  %10.3fs" % index_time)
+    for label, find in (("indexed", indexed_find), ("linear", linear_find)):
+        # The linear scan is too slow to run for every name at 100k jobs
+        sample = names if find is indexed_find else names[:: LOOKUPS // 10]
+        elapsed = min(
+            timeit.repeat(
+                lambda: [find(jobs, name) for name in sample],
+                number=1,
+                repeat=3,
+            )
+        )
+        print("  %-8s %10.6fs per lookup" % (label, elapsed / len(sample)))
+
+
+def main():
+    for num_jobs in (10000, 100000):
+        bench(num_jobs)
+
+
+if __name__ == "__main__":
+    main()
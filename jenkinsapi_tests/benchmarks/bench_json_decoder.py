@@ -0,0 +1,43 @@
+"""
+Compare the legacy api/python + ast.literal_eval path with api/json.
+
+Run with:
+
+    python -m jenkinsapi_tests.benchmarks.bench_json_decoder
+"""
+
+import json
+import timeit
+
+from jenkinsapi.utils.json_decoder import DECODER_LOADERS, get_decoder
+from jenkinsapi_tests.benchmarks.payloads import build_payload
+from jenkinsapi_tests.benchmarks.payloads import jenkins_payload
+
+
+def bench(name, payload, repeat=3):
+    as_python = repr(payload)
+    as_json = json.dumps(payload)
+    print(
+        "%s: python %.1f MiB, json %.1f MiB"
+        % (name, len(as_python) / 2.0**20, len(as_json) / 2.0**20)
+    )
+    for decoder_name in DECODER_LOADERS:
+        try:
+            decoder = get_decoder(decoder_name)
+        except ImportError:
+            print("  %-8s not installed" % decoder_name)
+            continue
+        text = as_python if decoder_name == "python" else as_json
+        best = min(
+            timeit.repeat(lambda: decoder(text), number=1, repeat=repeat)
+        )
+        print("  %-8s %8.3fs" % (decoder_name, best))
+
+
+def main():
+    bench("Jenkins.poll() with 40k jobs", jenkins_payload())
+    bench("Build depth=1 with 5k actions", build_payload())
+
+
+if __name__ == "__main__":
+    main()
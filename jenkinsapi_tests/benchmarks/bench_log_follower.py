@@ -0,0 +1,139 @@
+"""
+Follow a multi-GB synthetic console log served by a local stub, and
+compare with loading it whole through Build.get_console().
+
+Run with:
+
+    python -m jenkinsapi_tests.benchmarks.bench_log_follower [--size MiB]
+"""
+
+import argparse
+import os
+import resource
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from jenkinsapi.build import Build
+from jenkinsapi.utils.requester import Requester
+
+MIB = 2**20
+LINE = b"[%08i] Running test_%05i ... ok" + b" " * 40
+BLOCK = b"".join(
+    (LINE % (i, i)).ljust(79) + b"\n" for i in range(MIB // 80 + 1)
+)
+
+
+def synthetic_log(start, end):
+    """
+    Yield bytes start to end of an endless log made of 80 byte lines.
+    """
+    while start < end:
+        offset = start % len(BLOCK)
+        stop = offset + end - start
+        piece = BLOCK[offset:stop]
+        start += len(piece)
+        yield piece
+
+
+class LogHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    size = 0
+    step = 0
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        url = urlsplit(self.path)
+        start = int(parse_qs(url.query).get("start", ["0"])[0])
+        headers = {}
+        if url.path.endswith("/logText/progressiveText"):
+            end = min(start + self.step, self.size)
+            headers["X-Text-Size"] = str(end)
+            if end < self.size:
+                headers["X-More-Data"] = "true"
+        elif url.path.endswith("/consoleText"):
+            start, end = 0, self.size
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain;charset=UTF-8")
+        self.send_header("Content-Length", str(end - start))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        for piece in synthetic_log(start, end):
+            self.wfile.write(piece)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class FakeJob(object):
+    def __init__(self):
+        self.jenkins = self
+        self.requester = Requester(timeout=60)
+
+
+def max_rss_mib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def report(label, size, elapsed):
+    print(
+        "  %-26s %8.2fs %8.1f MiB/s   max RSS %7.1f MiB"
+        % (label, elapsed, size / MIB / elapsed, max_rss_mib())
+    )
+
+
+def bench(build, size, console_size):
+    print(
+        "%i MiB log, served in %i MiB polls"
+        % (size // MIB, LogHandler.step // MIB)
+    )
+    LogHandler.size = size
+    runs = (
+        (
+            "follow_logs().iter_bytes()",
+            lambda f: sum(map(len, f.iter_bytes())),
+        ),
+        ("follow_logs().iter_lines()", lambda f: sum(1 for _ in f)),
+        ("follow_logs(tee=devnull)", lambda f: f.drain()),
+    )
+    for label, run in runs:
+        tee = os.devnull if "tee" in label else None
+        follower = build.follow_logs(min_interval=0, tee=tee)
+        begin = time.perf_counter()
+        run(follower)
+        report(label, size, time.perf_counter() - begin)
+        assert follower.offset == size, follower.offset
+
+    # Last: once the whole log was held in memory max RSS stays up
+    LogHandler.size = console_size
+    print("%i MiB log, loaded whole" % (console_size // MIB))
+    begin = time.perf_counter()
+    assert len(build.get_console()) == console_size
+    report("get_console()", console_size, time.perf_counter() - begin)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--size", type=int, default=2048, help="MiB")
+    parser.add_argument("--step", type=int, default=256, help="MiB")
+    parser.add_argument("--console-size", type=int, default=512, help="MiB")
+    args = parser.parse_args()
+    LogHandler.step = args.step * MIB
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LogHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = "http://127.0.0.1:%i/job/bench/1" % server.server_port
+        build = Build(url, 1, FakeJob(), poll=False)
+        bench(build, args.size * MIB, args.console_size * MIB)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
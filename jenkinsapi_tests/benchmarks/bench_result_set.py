@@ -0,0 +1,101 @@
+"""
+Time test case lookups in ResultSet against the dict rebuilt per lookup
+they replaced, and compare the peak memory of loading a large testReport
+with streaming it into a CaseTable.
+
+Run with:
+
+    python -m jenkinsapi_tests.benchmarks.bench_result_set [--cases N]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import mock
+
+from jenkinsapi.result_set import CaseTable, ResultSet
+from jenkinsapi_tests.benchmarks.payloads import test_report_payload
+
+LOOKUPS = 200
+
+
+def chunked(body, chunk_size):
+    for start in range(0, len(body), chunk_size):
+        end = start + chunk_size
+        yield body[start:end]
+
+
+def rebuild_find(result_set, key):
+    # What ResultSet.__getitem__ did before the index
+    return dict(result_set.iteritems())[key]
+
+
+def make_result_set(payload, body):
+    build = mock.MagicMock()
+    response = build.job.get_jenkins_obj().requester.get_and_confirm_status
+    response.return_value.iter_content.side_effect = lambda chunk_size: (
+        chunked(body, chunk_size)
+    )
+    result_set = ResultSet("http://localhost/testReport", build, poll=False)
+    result_set._data = payload
+    return result_set
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        begin = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - begin
+        return elapsed, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--cases", type=int, default=250000)
+    args = parser.parse_args()
+
+    payload = test_report_payload(args.cases)
+    body = json.dumps(payload).encode("utf-8")
+    result_set = make_result_set(payload, body)
+    keys = result_set.keys()
+    sample = keys[:: len(keys) // LOOKUPS]
+    print(
+        "%i cases, %.1f MiB of JSON, %i lookups"
+        % (len(keys), len(body) / 2.0**20, len(sample))
+    )
+
+    begin = time.perf_counter()
+    for key in sample:
+        result_set[key]
+    elapsed = time.perf_counter() - begin
+    print("  indexed      %10.6fs per lookup" % (elapsed / len(sample)))
+    begin = time.perf_counter()
+    for key in sample[:3]:
+        rebuild_find(result_set, key)
+    elapsed = time.perf_counter() - begin
+    print("  rebuilt      %10.6fs per lookup" % (elapsed / 3))
+
+    del payload, result_set
+    streaming = make_result_set(None, body)
+    for label, func in (
+        (
+            "json.loads + table()",
+            lambda: CaseTable.from_cases(
+                make_result_set(json.loads(body), body)._iter_cases()
+            ),
+        ),
+        ("stream_table()", lambda: streaming.stream_table()),
+    ):
+        elapsed, peak = peak_memory(func)
+        print(
+            "  %-22s %8.2fs %8.1f MiB peak" % (label, elapsed, peak / 2.0**20)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Synthetic payloads shaped like large Jenkins API responses.
+
+They mirror what a big controller returns for ``Jenkins.poll()`` and for
+a ``Build`` polled at depth=1, so the benchmarks can run without a server.
+"""
+
+
+def jenkins_payload(num_jobs=40000):
+    return {
+        "_class": "hudson.model.Hudson",
+        "jobs": [
+            {
+                "_class": "hudson.model.FreeStyleProject",
+                "name": "job_%i" % i,
+                "url": "http://localhost:8080/job/job_%i/" % i,
+                "color": "blue" if i % 3 else "red",
+            }
+            for i in range(num_jobs)
+        ],
+    }
+
+
+def build_payload(num_actions=5000):
+    return {
+        "_class": "hudson.model.FreeStyleBuild",
+        "actions": [
+            {
+                "_class": "hudson.model.ParametersAction",
+                "parameters": [
+                    {"name": "PARAM_%i" % i, "value": "value %i" % i},
+                ],
+            }
+            for i in range(num_actions)
+        ]
+        + [None],
+        "building": False,
+        "description": None,
+        "duration": 5782,
+        "fullDisplayName": "foo #1",
+        "keepLog": False,
+        "number": 1,
+        "result": "SUCCESS",
+        "timestamp": 1370042140000,
+        "url": "http://localhost:8080/job/foo/1/",
+    }
+
+
+def test_report_payload(num_cases=250000, cases_per_suite=1000):
+    return {
+        "_class": "hudson.tasks.junit.TestResult",
+        "duration": 3600.0,
+        "failCount": num_cases // 50,
+        "passCount": num_cases - num_cases // 50,
+        "skipCount": 0,
+        "suites": [
+            {
+                "cases": [
+                    {
+                        "age": 0,
+                        "className": "pkg.mod%i.TestCase" % (i // 20),
+                        "duration": (i % 100) / 100.0,
+                        "errorDetails": None,
+                        "errorStackTrace": None,
+                        "name": "test_%i" % i,
+                        "skipped": False,
+                        "status": "FAILED" if i % 50 == 0 else "PASSED",
+                        "stderr": None,
+                        "stdout": "collected 1 item\n",
+                    }
+                    for i in range(start, start + cases_per_suite)
+                ],
+                "duration": 1.0,
+                "name": "suite_%i" % (start // cases_per_suite),
+            }
+            for start in range(0, num_cases, cases_per_suite)
+        ],
+    }
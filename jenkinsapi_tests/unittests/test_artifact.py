@@ -1,10 +1,15 @@
+import hashlib
+import os
+
 import pytest
 from mock import Mock, patch, call
-from requests.exceptions import HTTPError
-from jenkinsapi.artifact import Artifact
+from requests.exceptions import ChunkedEncodingError, HTTPError
+from jenkinsapi import config
+from jenkinsapi.artifact import Artifact, DownloadStats
 from jenkinsapi.jenkinsbase import JenkinsBase
 from jenkinsapi.fingerprint import Fingerprint
 from jenkinsapi.custom_exceptions import ArtifactBroken
+from jenkinsapi.utils import fingerprint_cache
 
 try:
     import unittest2 as unittest
@@ -224,3 +229,189 @@ class ArtifactTest(unittest.TestCase):
         artifact._verify_download.assert_called_once_with(
             "/tmp/artifact.zip", False
         )
+
+
+class RangeResponse(object):
+    def __init__(self, content, start=0, fail_after=None, ranges=True):
+        self.status_code = 206 if start and ranges else 200
+        if not ranges:
+            start = 0
+        self.headers = {"Content-Length": str(len(content) - start)}
+        if self.status_code == 206:
+            self.headers["Content-Range"] = "bytes %i-%i/%i" % (
+                start,
+                len(content) - 1,
+                len(content),
+            )
+        if start and start >= len(content):
+            self.status_code = 416
+            self.headers = {"Content-Range": "bytes */%i" % len(content)}
+        self.body = content[start:]
+        self.fail_after = fail_after
+
+    def iter_content(self, chunk_size):
+        for num, pos in enumerate(range(0, len(self.body), chunk_size)):
+            if num == self.fail_after:
+                raise ChunkedEncodingError("connection broken")
+            end = pos + chunk_size
+            yield self.body[pos:end]
+
+    def close(self):
+        pass
+
+
+class RangeRequester(object):
+    def __init__(self, content, failures=(), ranges=True):
+        self.content = content
+        self.failures = list(failures)
+        self.ranges = ranges
+        self.starts = []
+
+    def get_url(self, url, headers=None, stream=False):
+        assert stream
+        start = 0
+        if headers:
+            start = int(headers["Range"].split("=", 1)[1].rstrip("-"))
+        self.starts.append(start)
+        fail_after = self.failures.pop(0) if self.failures else None
+        return RangeResponse(self.content, start, fail_after, self.ranges)
+
+
+@pytest.fixture()
+def ranged_artifact(mocker):
+    build = mocker.MagicMock()
+    build.get_jenkins_obj().requester = RangeRequester(b"0123456789" * 10)
+    return Artifact(
+        "artifact.zip",
+        "http://foo/job/TestJob/1/artifact/artifact.zip",
+        build,
+    )
+
+
+def test_download_resumes_interrupted_transfer(ranged_artifact, tmp_path):
+    requester = ranged_artifact.get_jenkins_obj().requester
+    requester.failures = [3, 2]
+    fspath = str(tmp_path / "artifact.zip")
+    seen = []
+
+    ranged_artifact.download(
+        fspath,
+        chunk_size=10,
+        resume=True,
+        progress=lambda stats: seen.append(stats.bytes_done),
+    )
+
+    with open(fspath, "rb") as f:
+        assert f.read() == requester.content
+    assert requester.starts == [0, 30, 50]
+    assert seen == list(range(10, 101, 10)) + [100]
+    assert not (tmp_path / "artifact.zip.part").exists()
+
+
+def test_download_continues_part(ranged_artifact, tmp_path):
+    requester = ranged_artifact.get_jenkins_obj().requester
+    (tmp_path / "artifact.zip.part").write_bytes(requester.content[:42])
+    fspath = str(tmp_path / "artifact.zip")
+    stats = DownloadStats(1)
+
+    ranged_artifact.download(fspath, resume=True, stats=stats)
+
+    with open(fspath, "rb") as f:
+        assert f.read() == requester.content
+    assert requester.starts == [42]
+    assert (stats.bytes_done, stats.bytes_resumed) == (100, 42)
+    assert (stats.bytes_total, stats.files_done) == (100, 1)
+
+
+def test_download_complete_part(ranged_artifact, tmp_path):
+    requester = ranged_artifact.get_jenkins_obj().requester
+    (tmp_path / "artifact.zip.part").write_bytes(requester.content)
+    fspath = str(tmp_path / "artifact.zip")
+
+    ranged_artifact.download(fspath, resume=True)
+
+    with open(fspath, "rb") as f:
+        assert f.read() == requester.content
+    assert requester.starts == [100]
+
+
+def test_download_without_range_support(ranged_artifact, tmp_path):
+    requester = ranged_artifact.get_jenkins_obj().requester
+    requester.ranges = False
+    requester.failures = [5]
+    fspath = str(tmp_path / "artifact.zip")
+    stats = DownloadStats(1)
+
+    ranged_artifact.download(fspath, chunk_size=10, resume=True, stats=stats)
+
+    with open(fspath, "rb") as f:
+        assert f.read() == requester.content
+    assert requester.starts == [0, 50]
+    assert stats.bytes_done == 100
+
+
+def test_download_does_not_resume_by_default(ranged_artifact, tmp_path):
+    ranged_artifact.get_jenkins_obj().requester.failures = [1]
+
+    with pytest.raises(ChunkedEncodingError):
+        ranged_artifact.download(str(tmp_path / "artifact.zip"), chunk_size=10)
+
+
+@pytest.fixture()
+def cached_artifact(ranged_artifact, monkeypatch):
+    monkeypatch.setattr(config, "ARTIFACT_FINGERPRINT_CACHE", True)
+    monkeypatch.setattr(fingerprint_cache, "_caches", {})
+    build = ranged_artifact.build
+    build.buildno = 1
+    build.job.get_full_name.return_value = "TestJob"
+    build.job.jenkins.baseurl = "http://foo"
+    validations = []
+
+    def fake_validate(fp, filename, job, buildno):
+        validations.append((fp.id_, filename, job, buildno))
+        return True
+
+    def fail_md5sum(self, fspath):
+        raise AssertionError("%s hashed again" % fspath)
+
+    monkeypatch.setattr(Fingerprint, "validate_for_build", fake_validate)
+    monkeypatch.setattr(Artifact, "_md5sum", fail_md5sum)
+    ranged_artifact.validations = validations
+    return ranged_artifact
+
+
+def test_save_hashes_while_downloading(cached_artifact, tmp_path):
+    content = cached_artifact.get_jenkins_obj().requester.content
+    fspath = str(tmp_path / "artifact.zip")
+
+    cached_artifact.save(fspath)
+
+    md5 = hashlib.md5(content).hexdigest()
+    assert cached_artifact.validations == [(md5, "artifact.zip", "TestJob", 1)]
+    assert fingerprint_cache.FingerprintCache.FILENAME in os.listdir(
+        str(tmp_path)
+    )
+
+
+def test_save_unchanged_file_uses_sidecar(cached_artifact, tmp_path):
+    requester = cached_artifact.get_jenkins_obj().requester
+    fspath = str(tmp_path / "artifact.zip")
+    cached_artifact.save(fspath)
+
+    # As if synced again by another process
+    fingerprint_cache._caches.clear()
+    again = Artifact(
+        cached_artifact.filename, cached_artifact.url, cached_artifact.build
+    )
+    assert again.save(fspath, strict_validation=True) == fspath
+    assert requester.starts == [0]
+    assert len(cached_artifact.validations) == 1
+
+    # A changed file is hashed and validated again
+    with open(fspath, "ab") as f:
+        f.write(b"changed")
+    hashed = []
+    again._md5sum = lambda path: hashed.append(path) or "0" * 32
+    again._verify_download(fspath, True)
+    assert hashed == [fspath]
+    assert cached_artifact.validations[-1][0] == "0" * 32
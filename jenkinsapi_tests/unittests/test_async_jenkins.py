@@ -0,0 +1,198 @@
+import sys
+import asyncio
+import importlib
+import json
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+# pylint: disable=wrong-import-position
+from jenkinsapi.async_jenkins import (  # noqa: E402
+    AsyncBuild,
+    AsyncJenkins,
+    AsyncJob,
+)
+from jenkinsapi.custom_exceptions import UnknownJob  # noqa: E402
+from jenkinsapi.utils.async_requester import (  # noqa: E402
+    AsyncRequester,
+    AsyncResponse,
+)
+
+BASE = "http://localhost:8080"
+
+PAYLOADS = {
+    BASE
+    + "/api/json": {
+        "jobs": [
+            {"name": "foo", "url": BASE + "/job/foo", "color": "blue"},
+            {"name": "folder", "url": BASE + "/job/folder"},
+        ]
+    },
+    BASE
+    + "/job/folder/api/json": {
+        "jobs": [{"name": "bar", "color": "red"}],
+    },
+    BASE
+    + "/job/foo/api/json": {
+        "name": "foo",
+        "color": "blue",
+        "builds": [{"number": 2, "url": BASE + "/job/foo/2/"}],
+        "firstBuild": {"number": 2, "url": BASE + "/job/foo/2/"},
+        "lastBuild": {"number": 2, "url": BASE + "/job/foo/2/"},
+    },
+    BASE
+    + "/job/folder/job/bar/api/json": {
+        "name": "bar",
+        "color": "red",
+        "builds": [],
+    },
+    BASE
+    + "/job/foo/2/api/json": {
+        "number": 2,
+        "building": False,
+        "result": "SUCCESS",
+        "actions": [],
+    },
+}
+
+
+class FakeAsyncRequester(AsyncRequester):
+    def __init__(self):
+        super(FakeAsyncRequester, self).__init__(baseurl=BASE)
+        self.calls = []
+
+    async def get_url(self, url, params=None, headers=None, **kwargs):
+        self.calls.append((url, params))
+        await asyncio.sleep(0)
+        if url not in PAYLOADS:
+            return AsyncResponse(url, 404, {}, b"")
+        return AsyncResponse(
+            url, 200, {}, json.dumps(PAYLOADS[url]).encode("utf-8")
+        )
+
+
+@pytest.fixture(scope="function")
+def jenkins():
+    return AsyncJenkins(BASE, requester=FakeAsyncRequester())
+
+
+def test_construction_does_not_poll(jenkins):
+    assert jenkins.requester.calls == []
+
+
+def test_response_decoding():
+    response = AsyncResponse("url", 200, {}, b'{"a": 1}')
+    assert response.text == '{"a": 1}'
+    assert response.json() == {"a": 1}
+
+
+def test_keys_resolve_folders(jenkins):
+    keys = asyncio.run(jenkins.get_jobs_list())
+    assert keys == ["foo", "folder/bar"]
+
+
+def test_values_are_polled_concurrently(jenkins):
+    jobs = asyncio.run(jenkins.jobs.values())
+
+    assert [job.name for job in jobs] == ["foo", "bar"]
+    assert all(isinstance(job, AsyncJob) for job in jobs)
+    assert jobs[1]._data["color"] == "red"
+
+
+def test_get_job(jenkins):
+    job = asyncio.run(jenkins.get_job("foo"))
+    assert job.name == "foo"
+    assert job._data["color"] == "blue"
+    assert asyncio.run(jenkins.has_job("folder/bar"))
+
+
+def test_get_unknown_job(jenkins):
+    with pytest.raises(UnknownJob):
+        asyncio.run(jenkins.get_job("nope"))
+
+
+def test_blocking_access_is_refused(jenkins):
+    with pytest.raises(TypeError):
+        jenkins.jobs["foo"]  # pylint: disable=pointless-statement
+
+
+def test_get_last_build(jenkins):
+    async def last_build():
+        job = await jenkins.get_job("foo")
+        return await job.get_last_build()
+
+    build = asyncio.run(last_build())
+
+    assert isinstance(build, AsyncBuild)
+    assert build.get_number() == 2
+    assert build.get_status() == "SUCCESS"
+    assert asyncio.run(build.is_good())
+
+
+def test_buildnumbers_are_coroutines(jenkins):
+    async def buildnumbers():
+        job = await jenkins.get_job("foo")
+        return (
+            await job.get_first_buildnumber(),
+            await job.get_last_buildnumber(),
+        )
+
+    assert asyncio.run(buildnumbers()) == (2, 2)
+
+
+def test_blocking_job_and_build_methods_are_refused(jenkins):
+    async def last_build():
+        job = await jenkins.get_job("foo")
+        return job, await job.get_last_build()
+
+    job, build = asyncio.run(last_build())
+
+    with pytest.raises(TypeError):
+        job[2]  # pylint: disable=pointless-statement
+    with pytest.raises(TypeError):
+        len(job)
+    with pytest.raises(TypeError):
+        job.get_config()
+    with pytest.raises(TypeError):
+        build.block()
+    with pytest.raises(TypeError):
+        build.get_resultset()
+
+
+def test_identical_concurrent_gets_are_coalesced():
+    class CountingRequester(AsyncRequester):
+        calls = 0
+
+        async def _request(self, method, url, allow_redirects, **kwargs):
+            CountingRequester.calls += 1
+            await asyncio.sleep(0.01)
+            return AsyncResponse(url, 200, {}, b"{}")
+
+    async def main():
+        requester = CountingRequester(baseurl=BASE, coalesce=True)
+        url = BASE + "/job/foo/api/json"
+        responses = await asyncio.gather(
+            *[requester.get_url(url) for _ in range(5)],
+            requester.get_url(url, params={"depth": 1}),
+        )
+        await requester.get_url(url)
+        return requester, responses
+
+    requester, responses = asyncio.run(main())
+
+    assert len({id(response) for response in responses[:5]}) == 1
+    assert CountingRequester.calls == 3
+    assert requester.single_flight.stats() == {
+        "requests": 3,
+        "coalesced": 4,
+        "in_flight": 0,
+    }
+
+
+def test_missing_aiohttp_is_reported(monkeypatch):
+    monkeypatch.setitem(sys.modules, "aiohttp", None)
+    monkeypatch.delitem(sys.modules, "jenkinsapi.utils.async_requester")
+
+    with pytest.raises(ImportError, match=r"jenkinsapi\[async\]"):
+        importlib.import_module("jenkinsapi.utils.async_requester")
@@ -3,6 +3,10 @@ import pytest
 import pytz
 from . import configs
 import datetime
+import io
+import zipfile
+import threading
+import time
 import warnings
 from typing import List
 from jenkinsapi.build import Build
@@ -313,6 +317,89 @@ def test_build_get_artifacts(build) -> None:
     assert list(afs)[0].filename == "foo.txt"
 
 
+def test_build_download_artifacts(build, mocker, tmp_path) -> None:
+    contents = {"foo.txt": b"foo", "dir/bar.txt": b"bar", "a/b/c.log": b"c"}
+    threads = set()
+
+    def fake_get_url(url, headers=None, stream=False):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.01)
+        response = mocker.MagicMock(status_code=200, headers={})
+        content = contents[url.split("/artifact/", 1)[1]]
+        response.iter_content.return_value = [content]
+        return response
+
+    build.get_jenkins_obj().requester.get_url = fake_get_url
+    artifacts = [
+        Artifact(
+            path.rsplit("/")[-1],
+            "http://jenkins/job/foo/1/artifact/" + path,
+            build,
+            relative_path=path,
+        )
+        for path in contents
+    ]
+    seen = []
+
+    downloaded = build.download_artifacts(
+        str(tmp_path), artifacts, workers=3, progress=seen.append
+    )
+
+    assert sorted(downloaded) == sorted(contents)
+    for path, content in contents.items():
+        assert downloaded[path] == str(tmp_path.joinpath(*path.split("/")))
+        with open(downloaded[path], "rb") as f:
+            assert f.read() == content
+    assert len(threads) == 3
+    stats = seen[-1]
+    assert (stats.files_done, stats.files_total) == (3, 3)
+    assert stats.bytes_done == 7
+
+
+def test_build_download_artifacts_stays_in_dirpath(build, mocker, tmp_path):
+    response = mocker.MagicMock(status_code=200, headers={})
+    response.iter_content.return_value = [b"x"]
+    build.get_jenkins_obj().requester.get_url = mocker.MagicMock(
+        return_value=response
+    )
+    dirpath = tmp_path / "out"
+    artifacts = [
+        Artifact(
+            path.rsplit("/")[-1],
+            "http://jenkins/job/foo/1/artifact/ok.txt",
+            build,
+            relative_path=path,
+        )
+        for path in ("ok.txt", "../evil.txt", "/tmp/evil.txt", "a/../../b")
+    ]
+
+    downloaded = build.download_artifacts(str(dirpath), artifacts)
+
+    assert list(downloaded) == ["ok.txt"]
+    assert sorted(p.name for p in tmp_path.rglob("*")) == ["ok.txt", "out"]
+
+
+def test_build_extract_artifacts(build, mocker, tmp_path) -> None:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zipped:
+        zipped.writestr("archive/foo.txt", b"foo")
+        zipped.writestr("archive/logs/test.log", b"log")
+        zipped.writestr("archive/logs/test.xml", b"<xml/>")
+    response = mocker.MagicMock()
+    response.iter_content.return_value = [archive.getvalue()]
+    requester = build.get_jenkins_obj().requester
+    requester.get_and_confirm_status.return_value = response
+
+    extracted = build.extract_artifacts(str(tmp_path), include="logs/*.log")
+
+    requester.get_and_confirm_status.assert_called_once_with(
+        "http:/artifact/*zip*/archive.zip", stream=True
+    )
+    assert extracted == {"logs/test.log": str(tmp_path / "logs" / "test.log")}
+    assert (tmp_path / "logs" / "test.log").read_bytes() == b"log"
+    assert response.close.called
+
+
 def test_build_get_upstream_job_name(build) -> None:
     assert build.get_upstream_job_name() == "parentBuild"
 
@@ -328,3 +415,52 @@ def test_build_get_master_job_name(build) -> None:
 
 def test_build_get_master_build_number(build) -> None:
     assert build.get_master_build_number() == 1
+
+
+@pytest.fixture(scope="function")
+def lazy_build(job, monkeypatch, mocker) -> Build:
+    def fake_poll(cls, tree=None):  # pylint: disable=unused-argument
+        if not tree:
+            return configs.BUILD_DATA
+        fields = [field.split("[")[0] for field in Build.split_tree(tree)]
+        return {k: v for k, v in configs.BUILD_DATA.items() if k in fields}
+
+    monkeypatch.setattr(Build, "_poll", fake_poll)
+    mocker.spy(Build, "_poll")
+
+    return Build("http://", 97, job, lazy=True)
+
+
+def test_lazy_build_does_not_poll(lazy_build) -> None:
+    assert lazy_build._data == {}
+    assert Build._poll.call_count == 0
+
+
+def test_lazy_build_fetches_fields_once(lazy_build) -> None:
+    assert lazy_build.get_status() == "SUCCESS"
+    assert lazy_build.get_duration().microseconds == 782000
+    assert lazy_build.get_status() == "SUCCESS"
+
+    trees = [call[1]["tree"] for call in Build._poll.call_args_list]
+    assert trees == ["result", "duration"]
+    assert set(lazy_build._data) == {"result", "duration"}
+
+
+def test_lazy_build_merges_actions(lazy_build) -> None:
+    assert lazy_build.get_params() == {}
+    assert lazy_build.get_causes() == [
+        {
+            "shortDescription": "Started by user anonymous",
+            "userId": None,
+            "userName": "anonymous",
+            "upstreamProject": "parentBuild",
+            "upstreamBuild": 1,
+        }
+    ]
+    assert Build._poll.call_count == 2
+
+
+def test_lazy_build_full_poll(lazy_build) -> None:
+    assert lazy_build.get_actions()["causes"]
+    lazy_build.get_timestamp()
+    assert Build._poll.call_count == 1
@@ -0,0 +1,163 @@
+import json
+
+import pytest
+
+from jenkinsapi.build import Build
+from jenkinsapi.jenkinsbase import JenkinsBase
+from jenkinsapi.utils.build_cache import BuildCache
+
+BUILD_URL = "http://localhost:8080/job/foo/5"
+
+
+class FakeResponse(object):
+    status_code = 200
+
+    def __init__(self, data):
+        self.text = json.dumps(data)
+
+
+class FakeJenkins(JenkinsBase):
+    def __init__(self, mocker, build_cache, responses):
+        self.username = "foo"
+        self.build_cache = build_cache
+        self.requester = mocker.MagicMock()
+        self.requester.get_url.side_effect = lambda url, params: (
+            FakeResponse(responses[url])
+        )
+        JenkinsBase.__init__(self, "http://localhost:8080", poll=False)
+
+    def get_jenkins_obj(self):
+        return self
+
+
+@pytest.fixture
+def responses():
+    return {
+        BUILD_URL + "/api/json": {"number": 5, "building": False},
+        BUILD_URL + "/testReport/api/json": {"failCount": 1},
+        "http://localhost:8080/job/foo/api/json": {"name": "foo"},
+    }
+
+
+def test_completed_build_is_cached_across_runs(mocker, tmp_path, responses):
+    path = str(tmp_path / "builds.db")
+    jenkins = FakeJenkins(mocker, BuildCache(path), responses)
+    for url in (BUILD_URL, BUILD_URL + "/testReport"):
+        jenkins.get_data(jenkins.python_api_url(url), params={"depth": 1})
+    jenkins.build_cache.close()
+
+    jenkins = FakeJenkins(mocker, BuildCache(path), responses)
+    assert jenkins.get_data(BUILD_URL + "/api/json", params={"depth": 1}) == {
+        "number": 5,
+        "building": False,
+    }
+    assert jenkins.get_data(
+        BUILD_URL + "/testReport/api/json", params={"depth": 1}
+    ) == {"failCount": 1}
+    assert jenkins.requester.get_url.call_count == 0
+    assert jenkins.build_cache.stats()["hits"] == 2
+
+    # Other trees are fetched once, then cached as well
+    jenkins.get_data(BUILD_URL + "/api/json", tree="number")
+    jenkins.get_data(BUILD_URL + "/api/json", tree="number")
+    assert jenkins.requester.get_url.call_count == 1
+
+
+def test_running_build_and_job_are_not_cached(mocker, responses):
+    responses[BUILD_URL + "/api/json"]["building"] = True
+    jenkins = FakeJenkins(mocker, BuildCache(":memory:"), responses)
+
+    for _ in range(2):
+        jenkins.get_data(BUILD_URL + "/testReport/api/json")
+        jenkins.get_data(BUILD_URL + "/api/json")
+        jenkins.get_data("http://localhost:8080/job/foo/api/json")
+        jenkins.get_data(BUILD_URL + "/api/json", params={"start": 0})
+
+    assert jenkins.requester.get_url.call_count == 8
+    assert len(jenkins.build_cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted(mocker, responses):
+    size = len(json.dumps(responses[BUILD_URL + "/api/json"]))
+    jenkins = FakeJenkins(
+        mocker, BuildCache(":memory:", max_bytes=2 * size), responses
+    )
+    for tree in ("a", "b", "a", "c"):
+        jenkins.get_data(BUILD_URL + "/api/json", tree=tree)
+
+    assert jenkins.build_cache.stats()["evictions"] == 1
+    assert jenkins.build_cache.size == 2 * size
+    jenkins.get_data(BUILD_URL + "/api/json", tree="a")
+    assert jenkins.requester.get_url.call_count == 3
+
+
+def test_invalidate_build(mocker, responses):
+    jenkins = FakeJenkins(mocker, BuildCache(":memory:"), responses)
+    jenkins.get_data(BUILD_URL + "/api/json")
+    jenkins.get_data(BUILD_URL + "/testReport/api/json")
+    assert len(jenkins.build_cache) == 2
+
+    jenkins.build_cache.invalidate(BUILD_URL + "/")
+
+    assert len(jenkins.build_cache) == 0
+    assert jenkins.build_cache.size == 0
+    # Not known to be completed anymore
+    jenkins.get_data(BUILD_URL + "/testReport/api/json")
+    assert len(jenkins.build_cache) == 0
+
+
+def test_live_fields_are_fetched_again(mocker, tmp_path, responses):
+    responses[BUILD_URL + "/api/json"].update(
+        description="first", keepLog=False
+    )
+    jenkins = FakeJenkins(
+        mocker, BuildCache(tmp_path / "builds.db", live_fields=True), responses
+    )
+    jenkins.get_data(BUILD_URL + "/api/json")
+    responses[BUILD_URL + "/api/json"].update(
+        description="second", keepLog=True
+    )
+
+    assert jenkins.get_data(BUILD_URL + "/api/json") == {
+        "number": 5,
+        "building": False,
+        "description": "second",
+        "keepLog": True,
+    }
+    jenkins.requester.get_url.assert_called_with(
+        BUILD_URL + "/api/json", {"tree": "description,keepLog"}
+    )
+    assert jenkins.build_cache.stats()["hits"] == 1
+    assert (
+        "second"
+        not in jenkins.build_cache._db.execute(
+            "SELECT data FROM entries"
+        ).fetchone()[0]
+    )
+
+
+def test_volatile_fields_are_stored_by_default(mocker, responses):
+    responses[BUILD_URL + "/api/json"].update(description="d", keepLog=False)
+    jenkins = FakeJenkins(mocker, BuildCache(":memory:"), responses)
+    for _ in range(3):
+        data = jenkins.get_data(BUILD_URL + "/api/json")
+
+    assert data["description"] == "d"
+    assert jenkins.requester.get_url.call_count == 1
+
+
+def test_set_description_drops_build(mocker, responses):
+    jenkins = FakeJenkins(mocker, BuildCache(":memory:"), responses)
+    job = mocker.MagicMock()
+    job.get_jenkins_obj.return_value = jenkins
+    build = Build(BUILD_URL + "/", 5, job)
+    assert len(jenkins.build_cache) == 1
+
+    responses[BUILD_URL + "/api/json"]["description"] = "new"
+    build.set_description("new")
+
+    jenkins.requester.post_and_confirm_status.assert_called_once_with(
+        BUILD_URL + "/submitDescription", data={"description": "new"}
+    )
+    assert build.get_description() == "new"
+    assert jenkins.requester.get_url.call_count == 2
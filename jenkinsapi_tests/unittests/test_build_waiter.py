@@ -0,0 +1,232 @@
+import threading
+import collections
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import pytest
+
+from jenkinsapi import build_waiter
+from jenkinsapi.build import Build
+from jenkinsapi.build_waiter import BuildWaiter
+from jenkinsapi.custom_exceptions import JenkinsAPIException, TimeOut
+from jenkinsapi.jenkinsbase import JenkinsBase
+from jenkinsapi.job import Job
+from jenkinsapi.queue import QueueItem
+
+BASEURL = "http://localhost:8080"
+EPOCH = 1700000000.0
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return EPOCH + self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeJenkins(object):
+    """
+    Serves the queue, executors and builds of jobs "a" and "b" as they
+    would look at the time of the clock.
+    """
+
+    baseurl = BASEURL
+    python_api_url = JenkinsBase.python_api_url
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.requests = collections.Counter()
+        # queue id: (job, left queue at, build number or None if cancelled)
+        self.items = {1: ("a", 3, 6), 2: ("a", 2, None), 3: ("b", 4, 1)}
+        # (job, number): (queue id, started at, finished at, estimate)
+        self.builds = {
+            ("a", 5): (0, -20, 30, 50),
+            ("a", 6): (1, 3, 10, 7),
+            ("b", 1): (3, 4, 100, 96),
+        }
+
+    def get_queue_url(self):
+        return BASEURL + "/queue"
+
+    def job_url(self, name):
+        return "%s/job/%s/" % (BASEURL, name)
+
+    def build_row(self, job, number):
+        queue_id, started, finished, estimate = self.builds[(job, number)]
+        building = self.clock.now < finished
+        return {
+            "number": number,
+            "url": "%s%i/" % (self.job_url(job), number),
+            "queueId": queue_id,
+            "building": building,
+            "result": None if building else "SUCCESS",
+            "timestamp": int((EPOCH + started) * 1000),
+            "estimatedDuration": estimate * 1000,
+        }
+
+    def get_data(self, url, tree=None):
+        path = url.replace(BASEURL, "", 1).rsplit("/api/", 1)[0]
+        self.requests[path] += 1
+        now = self.clock.now
+        if path == "/queue":
+            return {
+                "items": [
+                    {"id": queue_id}
+                    for queue_id, (_, left, _) in self.items.items()
+                    if now < left
+                ]
+            }
+        if path.startswith("/queue/item/"):
+            _, left, number = self.items[int(path.rsplit("/", 1)[1])]
+            return {"cancelled": number is None and now >= left}
+        if path == "/computer":
+            executors = [
+                {"currentExecutable": self.build_row(job, number)}
+                for (job, number), (_, started, finished, _) in sorted(
+                    self.builds.items()
+                )
+                if started <= now < finished
+            ]
+            return {"computer": [{"executors": executors + [{}]}]}
+        _, _, job, number = (path + "/").split("/", 3)
+        if number:
+            return self.build_row(job, int(number.strip("/")))
+        assert tree.startswith("builds[")
+        started = sorted(
+            (
+                number
+                for (name, number), build in self.builds.items()
+                if name == job and build[1] <= now
+            ),
+            reverse=True,
+        )
+        return {"builds": [self.build_row(job, n) for n in started]}
+
+
+@pytest.fixture(scope="function")
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(build_waiter, "time", fake_clock)
+    return fake_clock
+
+
+@pytest.fixture(scope="function")
+def jenkins(clock):
+    return FakeJenkins(clock)
+
+
+def make_queue_item(jenkins, queue_id, job):
+    item = QueueItem(
+        "%s/item/%i" % (jenkins.get_queue_url(), queue_id),
+        jenkins,
+        poll=False,
+    )
+    item._data = {
+        "id": queue_id,
+        "task": {"name": job, "url": jenkins.job_url(job)},
+    }
+    return item
+
+
+def test_waits_for_queue_items_and_builds(jenkins, clock):
+    waiter = BuildWaiter(jenkins, min_interval=1, max_interval=60)
+    job_a = Job(jenkins.job_url("a"), "a", jenkins, poll=False)
+    done_at = {}
+
+    def record(name):
+        return lambda future: done_at.setdefault(name, clock.now)
+
+    running = waiter.add_build(
+        Build(jenkins.job_url("a") + "5/", 5, job_a, lazy=True),
+        callback=record("a#5"),
+    )
+    queued = waiter.add_queue_item(
+        make_queue_item(jenkins, 1, "a"), callback=record("item 1")
+    )
+    cancelled = waiter.add_queue_item(make_queue_item(jenkins, 2, "a"))
+    starting = waiter.add_queue_item(
+        make_queue_item(jenkins, 3, "b"),
+        until="building",
+        callback=record("item 3"),
+    )
+
+    waiter.wait()
+
+    assert len(waiter) == 0
+    assert running.result().get_status() == "SUCCESS"
+    assert queued.result().buildno == 6
+    assert queued.result().get_status() == "SUCCESS"
+    assert starting.result().buildno == 1
+    assert starting.result()._data["building"]
+    with pytest.raises(JenkinsAPIException, match="cancelled"):
+        cancelled.result()
+
+    # a#6 and a#5 were polled right when their estimate said they'd end
+    assert done_at == {"item 3": 7, "item 1": 10, "a#5": 30}
+    # one queue snapshot per round, never one per item
+    assert jenkins.requests["/queue"] == 4
+    assert jenkins.requests["/queue/item/1"] == 0
+    assert jenkins.requests["/queue/item/2"] == 1
+    # builds which started are found on the executors, in one request
+    assert jenkins.requests["/job/b"] == 0
+    assert waiter.requests == sum(jenkins.requests.values())
+
+
+def test_wait_times_out(jenkins, clock):
+    waiter = BuildWaiter(jenkins, min_interval=1, max_interval=4)
+    job_b = Job(jenkins.job_url("b"), "b", jenkins, poll=False)
+    waiter.add_build(Build(jenkins.job_url("b") + "1/", 1, job_b, lazy=True))
+
+    with pytest.raises(TimeOut, match="builds of b"):
+        waiter.wait(timeout=20)
+    assert clock.now == 20
+
+
+def test_wait_times_out_on_the_futures_waited_on(jenkins, clock):
+    waiter = BuildWaiter(jenkins, min_interval=1, max_interval=4)
+    futures = {}
+    for name, number in (("a", 5), ("b", 1)):
+        job = Job(jenkins.job_url(name), name, jenkins, poll=False)
+        url = "%s%i/" % (jenkins.job_url(name), number)
+        futures[name] = waiter.add_build(Build(url, number, job, lazy=True))
+
+    with pytest.raises(TimeOut) as raised:
+        waiter.wait([futures["b"]], timeout=20)
+    assert str(raised.value) == "Waited too long for builds of b"
+    assert not futures["a"].done()
+
+
+def test_background_polling():
+    clock = FakeClock()
+    jenkins = FakeJenkins(clock)
+    waiter = BuildWaiter(jenkins, min_interval=0.01, max_interval=0.05)
+    waiter.start()
+    job_b = Job(jenkins.job_url("b"), "b", jenkins, poll=False)
+    future = waiter.add_build(
+        Build(jenkins.job_url("b") + "1/", 1, job_b, lazy=True)
+    )
+
+    with pytest.raises(FutureTimeout):
+        future.result(timeout=0.1)
+    clock.now = 200
+    assert future.result(timeout=5).get_status() == "SUCCESS"
+    waiter.wait(timeout=5)
+    assert len(waiter) == 0
+
+
+def test_wait_futures_leaves_no_callbacks():
+    pending, done = Future(), Future()
+    for _ in range(50):
+        BuildWaiter._wait_futures([pending], 0)
+    assert not pending._done_callbacks and not pending._waiters
+
+    threading.Timer(0.01, done.set_result, (None,)).start()
+    BuildWaiter._wait_futures([pending, done], 5)
+    assert done.done() and not pending.done()
@@ -279,3 +279,32 @@ def test_get_current_executable(jenkins, monkeypatch):
         single_executer.get_current_executable()["url"]
         == "http://localhost:8080/job/testjob/4168/"
     )
+
+
+def test_find_idle_and_stuck(jenkins, monkeypatch):
+    trees = []
+    stuck = dict(EXEC0, number=1, likelyStuck=True)
+
+    def fake_poll_extrs(cls, tree=None):
+        trees.append(tree)
+        return {"numExecutors": 3, "executors": [EXEC0, stuck, EXEC1]}
+
+    def fail_poll_extr(cls, tree=None):  # pylint: disable=unused-argument
+        raise AssertionError("Executors should not be polled one by one")
+
+    monkeypatch.setattr(Executors, "_poll", fake_poll_extrs)
+    monkeypatch.setattr(Executor, "_poll", fail_poll_extr)
+
+    exec_info = jenkins.get_executors("host0.host.com")
+    assert exec_info.count == 3
+    assert len(list(exec_info)) == 3
+
+    assert [e.number for e in exec_info.find_idle()] == [0]
+    stuck_records = exec_info.find_stuck()
+    assert [e.number for e in stuck_records] == [1]
+    assert stuck_records[0].nodename == "host0.host.com"
+    assert stuck_records[0].progress == 48
+    assert stuck_records[0].build_url == (
+        "http://localhost:8080/job/testjob/4168/"
+    )
+    assert trees == [None]
@@ -395,3 +395,108 @@ def test_get_use_auth_cookie(mocker, monkeypatch):
 
     jenkins.use_auth_cookie()
     assert Requester.AUTH_COOKIE == COOKIE_VALUE
+
+
+def test_build_jobs(mocker, monkeypatch):
+    posted = []
+    sleeps = []
+
+    class FakeClock(object):
+        def monotonic(self):
+            return 0.0
+
+        def sleep(self, seconds):
+            sleeps.append(seconds)
+
+    def fake_get_data(self, url, params=None, tree=None):
+        path = url.split("8080", 1)[1].rsplit("/api/", 1)[0]
+        if path == "":
+            return TWO_JOBS_DATA
+        if path == "/job/job_one":
+            return {"actions": [{}], "property": []}
+        if path == "/job/job_two":
+            return {
+                "actions": [{"parameterDefinitions": [{"name": "REF"}]}],
+                "property": [],
+            }
+        if path == "/queue":
+            return {"items": []}
+        assert path == "/computer", path
+        executors = [
+            {
+                "currentExecutable": {
+                    "number": 7,
+                    "url": "http://localhost:8080/job/job_one/7/",
+                    "queueId": 11,
+                    "building": True,
+                }
+            },
+            {
+                "currentExecutable": {
+                    "number": 3,
+                    "url": "http://localhost:8080/job/job_two/3/",
+                    "queueId": 12,
+                    "building": True,
+                }
+            },
+            {
+                "currentExecutable": {
+                    "number": 4,
+                    "url": "http://localhost:8080/job/job_two/4/",
+                    "queueId": 13,
+                    "building": True,
+                }
+            },
+        ]
+        return {"computer": [{"executors": executors}]}
+
+    def fake_post(url, params=None, data=None, **kwargs):
+        ref = (data or {}).get("REF")
+        if ref == "bad":
+            raise jenkinsapi.custom_exceptions.JenkinsAPIException(ref)
+        posted.append((url, data))
+        queue_id = {None: 11, "v1.0": 12, "v2.0": 13}[ref]
+        response = mocker.MagicMock()
+        response.headers = {
+            "location": "http://localhost:8080/queue/item/%i/" % queue_id
+        }
+        return response
+
+    monkeypatch.setattr(JenkinsBase, "get_data", fake_get_data)
+    monkeypatch.setattr(jenkinsapi.jenkins, "time", FakeClock())
+    requester = mocker.MagicMock()
+    requester.post_and_confirm_status.side_effect = fake_post
+    jenkins = Jenkins("http://localhost:8080", requester=requester)
+
+    builds = jenkins.build_jobs(
+        [
+            "job_one",
+            ("job_two", {"REF": "v1.0"}),
+            ("job_two", {"REF": "bad"}),
+            ("job_two", {"REF": "v2.0"}),
+        ],
+        rate=2,
+    )
+
+    # One entry per request, in order, failures included
+    assert [b.buildno for b in builds[:2]] == [7, 3]
+    assert isinstance(
+        builds[2], jenkinsapi.custom_exceptions.JenkinsAPIException
+    )
+    assert builds[3].buildno == 4
+    assert builds[1]._data["building"]
+    assert sorted(url for url, _ in posted) == [
+        "http://localhost:8080/job/job_one/build",
+        "http://localhost:8080/job/job_two/buildWithParameters",
+        "http://localhost:8080/job/job_two/buildWithParameters",
+    ]
+    # Two triggers a second: each one waits half a second more
+    assert sorted(sleeps) == [0.0, 0.5, 1.0, 1.5]
+
+
+def test_build_jobs_unknown_job(jenkins, monkeypatch):
+    monkeypatch.setattr(
+        Jenkins, "_poll", lambda self, tree=None: TWO_JOBS_DATA
+    )
+    with pytest.raises(jenkinsapi.custom_exceptions.UnknownJob):
+        jenkins.build_jobs(["job_one", "job_three"])
@@ -2,12 +2,13 @@
 import pytest
 import mock
 import json
+from requests import HTTPError
 from . import configs
 from jenkinsapi.job import Job
 from jenkinsapi.build import Build
 from jenkinsapi.jenkins import Jenkins
 from jenkinsapi.jenkinsbase import JenkinsBase
-from jenkinsapi.custom_exceptions import NoBuildData
+from jenkinsapi.custom_exceptions import NoBuildData, NotFound
 
 
 @pytest.fixture(scope="function")
@@ -150,6 +151,117 @@ def test_get_build_dict(job_tree):
     assert len(ret) == 4
 
 
+def test_build_index_is_cached(job, monkeypatch, mocker):
+    fake_poll = mocker.MagicMock(
+        side_effect=lambda tree=None: {
+            "builds": configs.JOB_DATA["builds"],
+            "lastBuild": configs.JOB_DATA["lastBuild"],
+        }
+    )
+    monkeypatch.setattr(job, "poll", fake_poll)
+
+    first = job.get_build_dict()
+    assert fake_poll.call_count == 3
+
+    # Only nextBuildNumber is polled again
+    assert job.get_build_dict() == first
+    assert len(job) == 4
+    assert fake_poll.call_count == 5
+    assert job.polls_avoided == 4
+
+    assert job.get_build_dict(cached=True) == first
+    assert fake_poll.call_count == 5
+
+
+def test_build_dict_sees_new_builds(job, monkeypatch, mocker):
+    new_build = {"number": 4, "url": "http://halob:8080/job/foo/4/"}
+    data = {
+        "builds": configs.JOB_DATA["builds"][1:],
+        "lastBuild": configs.JOB_DATA["builds"][1],
+        "allBuilds": [new_build],
+        "nextBuildNumber": 4,
+    }
+    monkeypatch.setattr(
+        job, "poll", mocker.MagicMock(side_effect=lambda tree=None: data)
+    )
+    assert 4 not in job.get_build_dict()
+
+    data["nextBuildNumber"] = 5
+    assert 4 not in job.get_build_dict(cached=True)
+    assert 4 in job.get_build_dict()
+    assert 4 in list(job.get_build_ids())
+
+
+def serve_builds(job, monkeypatch, mocker, listed):
+    """
+    Make the polls of job serve the builds listed, newest first, as
+    they are at the time of the poll.
+    """
+
+    def poll(tree=None):
+        if tree == "allBuilds[number]":
+            return {"allBuilds": [{"number": b["number"]} for b in listed]}
+        if tree and tree.startswith("allBuilds[number,url]{0,"):
+            count = int(tree.rsplit(",", 1)[1].rstrip("}"))
+            return {"allBuilds": listed[slice(0, count)]}
+        return {
+            "builds": list(listed),
+            "lastBuild": listed[0],
+            "nextBuildNumber": listed[0]["number"] + 1,
+        }
+
+    fake_poll = mocker.MagicMock(side_effect=poll)
+    monkeypatch.setattr(job, "poll", fake_poll)
+    return fake_poll
+
+
+def test_build_index_follows_next_build_number(job, monkeypatch, mocker):
+    new_build = {"number": 4, "url": "http://halob:8080/job/foo/4/"}
+    listed = configs.JOB_DATA["builds"][1:]
+    fake_poll = serve_builds(job, monkeypatch, mocker, listed)
+    assert 4 not in job.get_build_dict()
+    listed.insert(0, new_build)
+
+    # a miss polls nextBuildNumber, the build numbers and the new builds
+    fake_poll.reset_mock()
+    assert job._get_build_url(4) == new_build["url"]
+    trees = [call[1]["tree"] for call in fake_poll.call_args_list]
+    assert trees == [
+        "nextBuildNumber",
+        "allBuilds[number,url]{0,2}",
+        "allBuilds[number]",
+    ]
+
+
+def test_build_index_drops_rotated_builds(job, monkeypatch, mocker):
+    listed = configs.JOB_DATA["builds"][1:]
+    serve_builds(job, monkeypatch, mocker, listed)
+    assert sorted(job.get_build_dict()) == [1, 2]
+
+    # Build 1 is rotated away as builds 4 and 5 run
+    listed[:] = [
+        {"number": n, "url": "http://halob:8080/job/foo/%i/" % n}
+        for n in (5, 4, 2)
+    ]
+
+    assert sorted(job.get_build_dict()) == [2, 4, 5]
+    assert len(job) == 3
+
+
+def test_get_build_of_deleted_build(job, monkeypatch, mocker):
+    job.get_build_dict()
+    response = mocker.MagicMock(status_code=404)
+    monkeypatch.setattr(
+        Build,
+        "_poll",
+        mocker.MagicMock(side_effect=HTTPError(response=response)),
+    )
+
+    with pytest.raises(NotFound):
+        job.get_build(1)
+    assert 1 not in job.get_build_dict(cached=True)
+
+
 def test_get_build_metadata(job_tree):
     with pytest.raises(ValueError) as ve:
         job_tree.get_build_metadata("abc")
@@ -302,59 +414,101 @@ def test_wrong_mk_json_from_build_parameters(job):
     assert "Build parameters must be a dict" in str(ar.value)
 
 
-def test_get_build_by_params(jenkins, monkeypatch, mocker):
-    build_params = {"param1": "value1"}
-    fake_builds = (
-        mocker.Mock(get_params=lambda: {}),
-        mocker.Mock(get_params=lambda: {}),
-        mocker.Mock(get_params=lambda: build_params),
-    )
-
-    build_call_count = [0]
+def make_build_rows(params_list):
+    rows = []
+    for number, params in reversed(list(enumerate(params_list, 1))):
+        rows.append(
+            {
+                "number": number,
+                "url": "http://localhost/jobs/foo/%i/" % number,
+                "actions": [
+                    {
+                        "_class": "hudson.model.ParametersAction",
+                        "parameters": [
+                            {"name": k, "value": v} for k, v in params.items()
+                        ],
+                    }
+                ],
+            }
+        )
+    return rows
 
-    def fake_get_build(cls, number):  # pylint: disable=unused-argument
-        build_call_count[0] += 1
-        return fake_builds[number - 1]
 
-    monkeypatch.setattr(Job, "get_first_buildnumber", lambda x: 1)
-    monkeypatch.setattr(Job, "get_last_buildnumber", lambda x: 3)
-    monkeypatch.setattr(Job, "get_build", fake_get_build)
-    mocker.spy(Build, "get_params")
-    mocker.spy(Job, "get_build")
-
-    job = Job("http://localhost/jobs/foo", "foo", jenkins)
+def test_get_build_by_params(jenkins, monkeypatch, mocker):
+    build_params = {"param1": "value1"}
+    rows = make_build_rows([{}, build_params, build_params])
+    fake_poll = mocker.MagicMock(return_value={"allBuilds": rows})
+    job = Job("http://localhost/jobs/foo", "foo", jenkins, poll=False)
+    monkeypatch.setattr(job, "poll", fake_poll)
+    monkeypatch.setattr(Build, "poll", lambda self: self._data)
 
     result = job.get_build_by_params(build_params)
+    assert result.get_number() == 2
 
-    assert job.get_build.call_count == 3
-    assert build_call_count[0] == 3
-    assert result == fake_builds[2]
+    result = job.get_build_by_params(build_params, order=-1)
+    assert result.get_number() == 3
+
+    # one paged request per lookup instead of polling every build
+    assert fake_poll.call_count == 2
+    tree = fake_poll.call_args[1]["tree"]
+    assert tree.startswith("allBuilds[number,url,actions[")
+    assert tree.endswith("]{0,100}")
 
 
 def test_get_build_by_params_not_found(jenkins, monkeypatch, mocker):
     build_params = {"param1": "value1"}
-    fake_builds = (
-        mocker.Mock(get_params=lambda: {}),
-        mocker.Mock(get_params=lambda: {}),
-        mocker.Mock(get_params=lambda: {}),
-    )
-
-    build_call_count = [0]
-
-    def fake_get_build(cls, number):  # pylint: disable=unused-argument
-        build_call_count[0] += 1
-        return fake_builds[number - 1]
-
-    monkeypatch.setattr(Job, "get_first_buildnumber", lambda x: 1)
-    monkeypatch.setattr(Job, "get_last_buildnumber", lambda x: 3)
-    monkeypatch.setattr(Job, "get_build", fake_get_build)
-    mocker.spy(Build, "get_params")
-    mocker.spy(Job, "get_build")
-
-    job = Job("http://localhost/jobs/foo", "foo", jenkins)
+    rows = make_build_rows([{}, {}, {}])
+    fake_poll = mocker.MagicMock(return_value={"allBuilds": rows})
+    job = Job("http://localhost/jobs/foo", "foo", jenkins, poll=False)
+    monkeypatch.setattr(job, "poll", fake_poll)
 
     with pytest.raises(NoBuildData):
         job.get_build_by_params(build_params)
 
-    assert job.get_build.call_count == 3
-    assert build_call_count[0] == 3
+    assert fake_poll.call_count == 1
+
+
+def test_get_builds_pages(jenkins, monkeypatch, mocker):
+    rows = make_build_rows([{}] * 5)
+    trees = []
+
+    def fake_poll(tree=None):
+        trees.append(tree)
+        start, end = map(int, tree.rsplit("{", 1)[1][:-1].split(","))
+        return {"allBuilds": rows[slice(start, end)]}
+
+    job = Job("http://localhost/jobs/foo", "foo", jenkins, poll=False)
+    monkeypatch.setattr(job, "poll", fake_poll)
+
+    builds = job.get_builds(tree="result", page_size=2)
+
+    assert [b.get_number() for b in builds] == [5, 4, 3, 2, 1]
+    assert all(b.baseurl.endswith("/%i" % b.buildno) for b in builds)
+    assert trees == [
+        "allBuilds[number,url,result]{0,2}",
+        "allBuilds[number,url,result]{2,4}",
+        "allBuilds[number,url,result]{4,6}",
+    ]
+
+    trees[:] = []
+    builds = job.get_builds(range(1, 3), tree="number,url", page_size=10)
+    assert [b.get_number() for b in builds] == [4, 3]
+    assert trees == ["allBuilds[number,url]{1,3}"]
+
+
+def test_get_revision_dict_fetches_revisions_at_once(
+    jenkins, monkeypatch, mocker
+):
+    rows = make_build_rows([{}] * 3)
+    for row, sha in zip(rows, ["b", "a", "a"]):
+        row["actions"] = [{"lastBuiltRevision": {"SHA1": sha}}]
+    fake_poll = mocker.MagicMock(return_value={"allBuilds": rows})
+    job = Job("http://localhost/jobs/foo", "foo", jenkins, poll=False)
+    job._data = {"builds": rows}
+    monkeypatch.setattr(job, "poll", fake_poll)
+    build_poll = mocker.patch.object(Build, "_poll")
+
+    assert job.get_revision_dict() == {"b": [3], "a": [2, 1]}
+    assert fake_poll.call_count == 1
+    assert "lastBuiltRevision" in fake_poll.call_args[1]["tree"]
+    assert build_poll.call_count == 0
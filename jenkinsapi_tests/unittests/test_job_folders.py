@@ -1,10 +1,16 @@
+import threading
+import time
+
 import pytest
 import mock
+from jenkinsapi import config
 from jenkinsapi.jenkins import JenkinsBase
 
 
 @pytest.fixture(scope="function")
-def jenkinsbase():
+def jenkinsbase(monkeypatch):
+    # list folders sequentially so that the order of requests is stable
+    monkeypatch.setattr(config, "FOLDER_WORKERS", 1)
     return JenkinsBase("http://localhost:8080/", poll=False)
 
 
@@ -85,7 +91,7 @@ def test_empty_folder(jenkinsbase, monkeypatch, mocker):
 
     assert jenkinsbase.resolve_job_folders(jobs) == []
     spy.assert_called_once_with(
-        "http://localhost:8080/job/Folder1/api/python", tree="jobs[name,color]"
+        "http://localhost:8080/job/Folder1/api/json", tree="jobs[name,color]"
     )
 
 
@@ -130,7 +136,7 @@ def test_folder_job_mix(jenkinsbase, monkeypatch, mocker):
     ]
 
     spy.assert_called_once_with(
-        "http://localhost:8080/job/Folder1/api/python", tree="jobs[name,color]"
+        "http://localhost:8080/job/Folder1/api/json", tree="jobs[name,color]"
     )
 
 
@@ -189,11 +195,11 @@ def test_multiple_folders(jenkinsbase, monkeypatch, mocker):
 
     assert spy.call_args_list == [
         mock.call(
-            "http://localhost:8080/job/Folder1/api/python",
+            "http://localhost:8080/job/Folder1/api/json",
             tree="jobs[name,color]",
         ),
         mock.call(
-            "http://localhost:8080/job/Folder2/api/python",
+            "http://localhost:8080/job/Folder2/api/json",
             tree="jobs[name,color]",
         ),
     ]
@@ -269,11 +275,99 @@ def test_multiple_folder_levels(jenkinsbase, monkeypatch, mocker):
 
     assert spy.call_args_list == [
         mock.call(
-            "http://localhost:8080/job/Folder1/api/python",
+            "http://localhost:8080/job/Folder1/api/json",
             tree="jobs[name,color]",
         ),
         mock.call(
-            "http://localhost:8080/job/Folder1" "/job/Folder2/api/python",
+            "http://localhost:8080/job/Folder1" "/job/Folder2/api/json",
             tree="jobs[name,color]",
         ),
     ]
+
+
+def fake_folder_tree(cls, url, tree=None):  # pylint: disable=unused-argument
+    # Folder<i> holds Job<i>_0 and Job<i>_1, Folder<i>/Sub holds Job<i>_2
+    name = url.split("/job/")[1].split("/")[0]
+    if "/job/Sub/" in url:
+        return {"jobs": [{"name": name + "_2", "color": "blue"}]}
+    return {
+        "jobs": [
+            {"name": name + "_0", "color": "blue"},
+            {"name": "Sub"},
+            {"name": name + "_1", "color": "red"},
+        ]
+    }
+
+
+FOLDERS = [{"name": "Folder%i" % i} for i in range(10)]
+EXPECTED_NAMES = ["Folder%i_%i" % (i, j) for i in range(10) for j in (0, 2, 1)]
+
+
+def test_concurrent_folders(monkeypatch):
+    threads = set()
+
+    def fake_get_data(cls, url, tree=None):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.01)
+        return fake_folder_tree(cls, url, tree)
+
+    monkeypatch.setattr(config, "FOLDER_WORKERS", 4)
+    monkeypatch.setattr(JenkinsBase, "get_data", fake_get_data)
+    jenkinsbase = JenkinsBase("http://localhost:8080/", poll=False)
+
+    jobs = jenkinsbase.resolve_job_folders([dict(f) for f in FOLDERS])
+
+    assert [job["name"] for job in jobs] == EXPECTED_NAMES
+    assert jobs[1]["url"] == (
+        "http://localhost:8080/job/Folder0/job/Sub/job/Folder0_2"
+    )
+    assert jenkinsbase.folder_requests == 20
+    assert len(threads) > 1
+
+
+def test_deep_tree_folders(jenkinsbase, monkeypatch, mocker):
+    def fake_get_data(cls, url, tree=None):
+        if url == "http://localhost:8080/api/json":
+            return {
+                "jobs": [
+                    dict(
+                        f,
+                        jobs=fake_folder_tree(cls, "/job/%s/" % f["name"])[
+                            "jobs"
+                        ],
+                    )
+                    for f in FOLDERS
+                ]
+            }
+        return fake_folder_tree(cls, url, tree)
+
+    monkeypatch.setattr(config, "FOLDER_TREE_DEPTH", 1)
+    monkeypatch.setattr(JenkinsBase, "get_data", fake_get_data)
+    spy = mocker.spy(jenkinsbase, "get_data")
+
+    jobs = jenkinsbase.resolve_job_folders([dict(f) for f in FOLDERS])
+
+    assert [job["name"] for job in jobs] == EXPECTED_NAMES
+    # one deep request, then one per Sub folder beyond the requested depth
+    assert jenkinsbase.folder_requests == 11
+    assert spy.call_args_list[0] == mock.call(
+        "http://localhost:8080/api/json",
+        tree="jobs[name,color,jobs[name,color]]",
+    )
+
+
+def test_process_job_folder(jenkinsbase, monkeypatch):
+    monkeypatch.setattr(JenkinsBase, "get_data", fake_folder_tree)
+
+    jobs = jenkinsbase.process_job_folder(
+        {"name": "Folder3"}, "http://localhost:8080"
+    )
+
+    assert [job["name"] for job in jobs] == [
+        "Folder3_0",
+        "Folder3_2",
+        "Folder3_1",
+    ]
+    assert jobs[1]["url"] == (
+        "http://localhost:8080/job/Folder3/job/Sub/job/Folder3_2"
+    )
@@ -196,6 +196,12 @@ class TestJobGetAllBuilds(unittest.TestCase):
                     }
                 elif "allBuilds" in args["tree"]:
                     return TestJobGetAllBuilds.URL_DATA[(url, args["tree"])]
+                elif args["tree"] == "nextBuildNumber":
+                    return {
+                        "nextBuildNumber": TestJobGetAllBuilds.URL_DATA[url][
+                            "nextBuildNumber"
+                        ]
+                    }
                 elif "lastBuild" in args["tree"]:
                     return {
                         "lastBuild": TestJobGetAllBuilds.URL_DATA[url][
@@ -0,0 +1,78 @@
+import copy
+
+import pytest
+
+from jenkinsapi.jenkins import Jenkins
+from jenkinsapi.jobs import Jobs
+from jenkinsapi.job import Job
+from jenkinsapi.custom_exceptions import UnknownJob
+
+JOBS_DATA = {
+    "jobs": [
+        {
+            "name": "job_one",
+            "url": "http://localhost:8080/job/job_one/",
+            "color": "blue",
+        },
+        {
+            "name": "job_two",
+            "url": "http://localhost:8080/job/folder/job/job_two/",
+            "color": "blue",
+        },
+    ]
+}
+
+
+@pytest.fixture(scope="function")
+def jenkins(monkeypatch, mocker):
+    monkeypatch.setattr(
+        Jenkins, "_poll", lambda self, tree=None: copy.deepcopy(JOBS_DATA)
+    )
+    monkeypatch.setattr(Job, "_poll", lambda self, tree=None: {})
+    new_jenkins = Jenkins("http://localhost:8080/")
+    new_jenkins.requester = mocker.MagicMock()
+    mocker.spy(Jobs, "poll")
+    return new_jenkins
+
+
+def test_lookup_by_name_and_full_name(jenkins):
+    jobs = jenkins.jobs
+
+    assert "job_one" in jobs
+    assert "folder/job_two" in jobs
+    assert "job_two" not in jobs
+    assert "nope" not in jobs
+    assert jobs["folder/job_two"].name == "job_two"
+    with pytest.raises(UnknownJob):
+        jobs["nope"]  # pylint: disable=pointless-statement
+
+    assert Jobs.poll.call_count == 1
+
+
+def test_delete_updates_index(jenkins):
+    jobs = jenkins.jobs
+    del jobs["folder/job_two"]
+
+    assert "folder/job_two" not in jobs
+    assert jobs.keys() == ["job_one"]
+    assert Jobs.poll.call_count == 1
+
+
+def test_rename_updates_index(jenkins):
+    jobs = jenkins.jobs
+    jobs.rename("folder/job_two", "job_three")
+
+    assert "folder/job_two" not in jobs
+    assert jobs._find_job_row("folder/job_three")["url"] == (
+        "http://localhost:8080/job/folder/job/job_three/"
+    )
+    assert Jobs.poll.call_count == 1
+
+
+def test_create_updates_index(jenkins):
+    jobs = jenkins.jobs
+    jobs.create("job_new", "<project/>")
+
+    assert "job_new" in jobs
+    assert len(jobs) == 3
+    assert Jobs.poll.call_count == 1
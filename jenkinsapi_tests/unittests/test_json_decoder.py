@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from jenkinsapi import config
+from jenkinsapi.jenkinsbase import JenkinsBase
+from jenkinsapi.custom_exceptions import JenkinsAPIException
+from jenkinsapi.utils import json_decoder
+from jenkinsapi.utils.json_decoder import get_decoder, get_decoder_for_url
+
+# Captured at import time: other test modules leave JenkinsBase.get_data
+# patched once they have run.
+GET_DATA = JenkinsBase.get_data
+PAYLOAD = {"jobs": [{"name": "foo", "color": "blue"}], "useCrumbs": True}
+
+
+class FakeResponse(object):
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+        self.content = text.encode("utf-8")
+
+
+@pytest.fixture(scope="function")
+def jenkinsbase(mocker, monkeypatch):
+    monkeypatch.setattr(JenkinsBase, "get_data", GET_DATA)
+    base = JenkinsBase("http://localhost:8080/", poll=False)
+    base.get_jenkins_obj = mocker.MagicMock()
+    return base
+
+
+def test_default_decoder_parses_json():
+    assert get_decoder()(json.dumps(PAYLOAD)) == PAYLOAD
+
+
+def test_stdlib_decoder():
+    assert get_decoder("json") is json.loads
+
+
+def test_unknown_decoder_raises():
+    with pytest.raises(ValueError):
+        get_decoder("yaml")
+
+
+def test_missing_library_falls_back(monkeypatch):
+    def not_installed():
+        raise ImportError("not installed")
+
+    monkeypatch.setitem(json_decoder.DECODER_LOADERS, "orjson", not_installed)
+    monkeypatch.setitem(json_decoder.DECODER_LOADERS, "ujson", not_installed)
+    monkeypatch.setattr(json_decoder, "_decoder_cache", {})
+    assert get_decoder() is json.loads
+
+
+def test_default_decoder_is_resolved_once(monkeypatch):
+    attempts = []
+
+    def not_installed():
+        attempts.append(None)
+        raise ImportError("not installed")
+
+    monkeypatch.setitem(json_decoder.DECODER_LOADERS, "orjson", not_installed)
+    monkeypatch.setitem(json_decoder.DECODER_LOADERS, "ujson", not_installed)
+    monkeypatch.setattr(json_decoder, "_decoder_cache", {})
+    for _ in range(3):
+        assert get_decoder() is json.loads
+    assert len(attempts) == 2
+
+
+def test_python_api_url_uses_literal_eval():
+    decoder = get_decoder_for_url("http://localhost:8080/api/python")
+    assert decoder(repr(PAYLOAD)) == PAYLOAD
+
+
+def test_configured_callable_is_used(monkeypatch):
+    monkeypatch.setattr(config, "JSON_DECODER", lambda text: "decoded")
+    assert get_decoder_for_url("http://localhost:8080/api/json")("") == (
+        "decoded"
+    )
+
+
+def test_get_data_decodes_json(jenkinsbase):
+    requester = jenkinsbase.get_jenkins_obj().requester
+    requester.get_url.return_value = FakeResponse(json.dumps(PAYLOAD))
+
+    url = jenkinsbase.python_api_url(jenkinsbase.baseurl)
+    assert url == "http://localhost:8080/api/json"
+    assert jenkinsbase.get_data(url) == PAYLOAD
+
+
+def test_get_data_legacy_python_api(jenkinsbase, monkeypatch):
+    monkeypatch.setattr(config, "JENKINS_API", config.JENKINS_PYTHON_API)
+    requester = jenkinsbase.get_jenkins_obj().requester
+    requester.get_url.return_value = FakeResponse(repr(PAYLOAD))
+
+    url = jenkinsbase.python_api_url(jenkinsbase.baseurl)
+    assert url == "http://localhost:8080/api/python"
+    assert jenkinsbase.get_data(url) == PAYLOAD
+
+
+def test_get_data_bad_content(jenkinsbase):
+    requester = jenkinsbase.get_jenkins_obj().requester
+    requester.get_url.return_value = FakeResponse("{'not': 'json'}")
+
+    with pytest.raises(JenkinsAPIException):
+        jenkinsbase.get_data("http://localhost:8080/api/json")
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from jenkinsapi.utils import json_stream
+from jenkinsapi.utils.json_stream import iter_array_items
+
+REPORT = {
+    "_class": "hudson.tasks.test.MatrixTestResult",
+    "failCount": 1,
+    "stdout": 'not an array: "cases":[1]',
+    "suites": [
+        {
+            "cases": [
+                {
+                    "className": "pkg.Test%i" % i,
+                    "name": 'test_é\\"]%i' % i,
+                    "duration": i / 3.0,
+                    "status": "PASSED",
+                }
+                for i in range(20)
+            ],
+            "name": "cases",
+        },
+        {"cases": []},
+        {"cases": None},
+    ],
+    "childReports": [
+        {"result": {"suites": [{"cases": [1, -2.5e3, "x", [3], True]}]}},
+    ],
+}
+EXPECTED = REPORT["suites"][0]["cases"] + [1, -2.5e3, "x", [3], True]
+
+
+def chunked(data, size):
+    for start in range(0, len(data), size):
+        end = start + size
+        yield data[start:end]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_array_items(size, indent):
+    data = json.dumps(REPORT, indent=indent, ensure_ascii=False)
+    items = iter_array_items(chunked(data.encode("utf-8"), size), "cases")
+    assert list(items) == EXPECTED
+
+
+def test_memory_is_bounded_by_items(monkeypatch):
+    sizes = []
+
+    class TextBuffer(json_stream._TextBuffer):
+        def fill(self, size=1):
+            filled = super().fill(size)
+            sizes.append(len(self.text))
+            return filled
+
+    monkeypatch.setattr(json_stream, "_TextBuffer", TextBuffer)
+    monkeypatch.setattr(json_stream, "COMPACT_SIZE", 1024)
+    case = {"className": "pkg.Test", "name": "test", "stdout": "x" * 500}
+    data = json.dumps({"suites": [{"cases": [case] * 2000}]}).encode()
+
+    items = list(iter_array_items(chunked(data, 4096), "cases"))
+    assert items == [case] * 2000
+    assert len(data) > 1000000
+    assert max(sizes) < 16 * 1024
+
+
+def test_truncated_document():
+    data = json.dumps(REPORT).encode("utf-8")
+    with pytest.raises(ValueError):
+        list(iter_array_items(chunked(data[:200], 7), "cases"))
@@ -0,0 +1,122 @@
+import pytest
+
+from jenkinsapi.build import Build
+from jenkinsapi.log_follower import LogFollower
+
+BUILD_URL = "http://localhost:8080/job/foo/1"
+
+
+class FakeResponse(object):
+    encoding = "utf-8"
+
+    def __init__(self, content, text_size, more_data):
+        self.content = content
+        self.headers = {"X-Text-Size": str(text_size)}
+        if more_data:
+            self.headers["X-More-Data"] = "true"
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), chunk_size):
+            end = start + chunk_size
+            yield self.content[start:end]
+
+    def close(self):
+        self.closed = True
+
+
+class GrowingLog(object):
+    """
+    Serves progressiveText for a log which grows by one entry of writes
+    per poll, and is complete once all of them were served.
+    """
+
+    def __init__(self, writes):
+        self.writes = list(writes)
+        self.log = b""
+        self.requests = []
+        self.responses = []
+
+    def get_and_confirm_status(self, url, params=None, stream=False):
+        assert url == BUILD_URL + "/logText/progressiveText"
+        assert stream
+        start = params["start"]
+        self.requests.append(start)
+        if self.writes:
+            self.log += self.writes.pop(0)
+        response = FakeResponse(
+            self.log[start:], len(self.log), bool(self.writes)
+        )
+        self.responses.append(response)
+        return response
+
+
+@pytest.fixture(scope="function")
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr("jenkinsapi.log_follower.sleep", slept.append)
+    return slept
+
+
+def make_build(mocker, writes):
+    build = Build(BUILD_URL, 1, mocker.MagicMock(), poll=False)
+    build.job.jenkins.requester = GrowingLog(writes)
+    return build
+
+
+def test_iter_bytes_adapts_interval(mocker, sleeps):
+    build = make_build(
+        mocker, [b"one\n", b"", b"", b"", b"two\n", b"", b"three\n"]
+    )
+    follower = build.follow_logs(min_interval=1, max_interval=4, chunk_size=2)
+
+    assert b"".join(follower.iter_bytes()) == b"one\ntwo\nthree\n"
+    assert follower.offset == 14
+    assert follower.polls == 7
+    assert sleeps == [1, 2, 4, 4, 1, 2]
+    requester = build.job.jenkins.requester
+    assert requester.requests == [0, 4, 4, 4, 4, 8, 8]
+    assert all(response.closed for response in requester.responses)
+
+
+def test_iter_lines_resumes_from_offset(mocker, sleeps):
+    build = make_build(mocker, [b"first\r\nsec", b"ond\nthi", b"rd"])
+    follower = build.follow_logs(min_interval=0, chunk_size=3)
+    lines = iter(follower)
+
+    assert next(lines) == "first"
+    assert next(lines) == "second"
+    lines.close()
+    assert follower.offset == 14
+
+    # Pick up where we left off, with a fresh follower
+    resumed = LogFollower(build, offset=follower.offset)
+    assert list(resumed.iter_lines()) == ["third"]
+    assert resumed.offset == 19
+    assert build.job.jenkins.requester.requests[-1] == 14
+
+
+def test_tee_to_path(mocker, sleeps, tmp_path):
+    path = str(tmp_path / "console.log")
+    build = make_build(mocker, [b"abc", "déf\n".encode("utf-8")])
+
+    follower = build.follow_logs(min_interval=0, tee=path, chunk_size=1)
+    assert follower.drain() == 8
+    with open(path, "rb") as log_file:
+        assert log_file.read() == "abcdéf\n".encode("utf-8")
+
+    build.job.jenkins.requester.writes = [b"ghi\n"]
+    resumed = build.follow_logs(offset=8, tee=path)
+    assert resumed.drain() == 12
+    with open(path, "rb") as log_file:
+        assert log_file.read() == "abcdéf\nghi\n".encode("utf-8")
+
+
+def test_stream_logs_decodes_split_characters(mocker, sleeps):
+    build = make_build(mocker, ["été\n".encode("utf-8")])
+    follower = build.follow_logs(chunk_size=1)
+    assert "".join(follower.iter_text()) == "été\n"
+
+    build = make_build(mocker, [b"a", b"b"])
+    assert "".join(build.stream_logs(interval=3)) == "ab"
+    assert sleeps == [3]
@@ -1,7 +1,9 @@
+import copy
 import pytest
 from jenkinsapi.jenkins import Jenkins
-from jenkinsapi.nodes import Nodes
+from jenkinsapi.nodes import Nodes, NodeRecord, NodesSnapshot
 from jenkinsapi.node import Node
+from jenkinsapi.custom_exceptions import UnknownNode
 
 
 DATA0 = {
@@ -292,3 +294,72 @@ def test_itervalues(nodes, monkeypatch):
 
 def test_values(nodes, monkeypatch):
     values_test_case(nodes.values, monkeypatch)
+
+
+def test_snapshot(nodes, monkeypatch):
+    trees = []
+
+    def fake_nodes_poll(cls, tree=None):
+        trees.append(tree)
+        return DATA1
+
+    monkeypatch.setattr(Nodes, "_poll", fake_nodes_poll)
+
+    snapshot = nodes.snapshot()
+    assert trees == [NodesSnapshot.TREE]
+    assert len(snapshot) == 3
+    assert snapshot.keys() == ["master", "bobnit", "halob"]
+
+    master = snapshot["master"]
+    assert isinstance(master, NodeRecord)
+    assert master.is_online()
+    assert master.num_executors == 2
+    assert master.busy_executors == 0
+    assert master.architecture == "Linux (amd64)"
+    assert master.available_physical_memory == 3174686720
+    assert master.workspace_path == "/var/lib/jenkins"
+    assert master.get_monitor("ClockMonitor") == {"diff": 0}
+    assert snapshot["halob"].total_swap_space is None
+    with pytest.raises(UnknownNode):
+        snapshot["nonexistent"]
+
+    assert [r.name for r in snapshot.filter(offline=True)] == [
+        "bobnit",
+        "halob",
+    ]
+    assert [
+        r.name
+        for r in snapshot.filter(
+            lambda r: (r.clock_difference or 0) > 1000, offline=True
+        )
+    ] == ["bobnit"]
+
+    columns = snapshot.columns(["name", "response_time"])
+    assert columns == {
+        "name": ["master", "bobnit", "halob"],
+        "response_time": [0, 29, None],
+    }
+    assert set(snapshot.columns()) == set(NodeRecord.FIELDS)
+
+
+def test_snapshot_executors(nodes, monkeypatch):
+    data = copy.deepcopy(DATA1)
+    master, bobnit, _ = data["computer"]
+    master["executors"] = [
+        {"number": 0, "idle": False, "likelyStuck": True, "progress": 99},
+        {"number": 1, "idle": True, "likelyStuck": False, "progress": -1},
+    ]
+    master["oneOffExecutors"] = [{"idle": False, "likelyStuck": False}]
+    bobnit["executors"] = [{"number": 0, "idle": True}]
+    monkeypatch.setattr(Nodes, "_poll", lambda cls, tree=None: data)
+
+    snapshot = nodes.snapshot()
+    assert len(snapshot.executors()) == 5
+    assert snapshot["master"].busy_executors == 2
+    assert [(e.nodename, e.number) for e in snapshot.find_stuck()] == [
+        ("master", 0)
+    ]
+    assert [(e.nodename, e.number) for e in snapshot.find_idle()] == [
+        ("master", 1)
+    ]
+    assert len(snapshot.find_idle(include_offline=True)) == 3
@@ -0,0 +1,91 @@
+import pytest
+
+from jenkinsapi.custom_exceptions import UnknownQueueItem
+from jenkinsapi.jenkinsbase import JenkinsBase
+from jenkinsapi.queue import Queue, QueueItem
+
+QUEUE_URL = "http://localhost:8080/queue"
+
+
+def make_row(queue_id, job_name, params=None):
+    row = {
+        "id": queue_id,
+        "url": "queue/item/%i/" % queue_id,
+        "why": "Waiting for next available executor",
+        "task": {
+            "name": job_name,
+            "url": "http://localhost:8080/job/%s/" % job_name,
+        },
+        "actions": [{}],
+    }
+    if params is not None:
+        row["actions"].append(
+            {
+                "parameters": [
+                    {"name": name, "value": value}
+                    for name, value in params.items()
+                ]
+            }
+        )
+    return row
+
+
+@pytest.fixture(scope="function")
+def requests(monkeypatch):
+    made = []
+    rows = [make_row(i, "job_%i" % (i % 3), {"N": str(i)}) for i in range(30)]
+
+    def fake_get_data(self, url, params=None, tree=None):
+        made.append((url, tree))
+        assert url.startswith(QUEUE_URL + "/api/"), url
+        return {"items": rows}
+
+    monkeypatch.setattr(JenkinsBase, "get_data", fake_get_data)
+    return made
+
+
+@pytest.fixture(scope="function")
+def queue(mocker, requests):
+    return Queue(QUEUE_URL, mocker.MagicMock())
+
+
+def test_snapshot_lookups(queue, requests):
+    assert len(queue) == 30
+    assert 7 in queue
+    assert 30 not in queue
+
+    item = queue[7]
+    assert isinstance(item, QueueItem)
+    assert item.baseurl == QUEUE_URL + "/item/7"
+    assert item.queue_id == 7
+    assert item.get_job_name() == "job_1"
+    assert item.get_parameters() == {"N": "7"}
+    with pytest.raises(UnknownQueueItem):
+        queue[30]
+
+    items = queue.get_queue_items_for_job("job_2")
+    assert [i.queue_id for i in items] == list(range(2, 30, 3))
+    assert queue.get_queue_items_for_job("job_3") == []
+    assert [i.queue_id for i in queue.values()] == list(range(30))
+    assert dict(queue.iteritems())[4].name == "job_1"
+
+    # A single projected request, none per item
+    assert requests == [(QUEUE_URL + "/api/json", Queue.ITEMS_TREE)]
+
+
+def test_refresh_and_delete(queue, requests):
+    assert len(queue.get_queue_items_for_job("job_0")) == 10
+
+    queue.delete_item(queue[3])
+    queue.jenkins.requester.post_url.assert_called_once_with(
+        QUEUE_URL + "/cancelItem?id=3"
+    )
+    assert 3 not in queue
+    assert len(queue) == 29
+    assert len(queue.get_queue_items_for_job("job_0")) == 9
+    assert len(requests) == 1
+
+    assert queue.refresh() is queue
+    assert 3 in queue
+    assert len(requests) == 2
+    assert requests[1][1] == Queue.ITEMS_TREE
@@ -1,7 +1,11 @@
 from __future__ import print_function
+import http.server
+import threading
+
 import pytest
 import requests
 from jenkinsapi.jenkins import Requester
+from jenkinsapi.utils.requester import retry_policy
 from jenkinsapi.custom_exceptions import JenkinsAPIException
 from mock import patch
 
@@ -394,3 +398,149 @@ def test_configure_max_retries():
     )
     for adapter in req.session.adapters.values():
         assert adapter.max_retries.total == 3
+
+
+def test_configure_pool():
+    req = Requester(
+        "username",
+        "password",
+        baseurl="http://dummy",
+        pool_connections=2,
+        pool_maxsize=32,
+        pool_block=True,
+    )
+    for adapter in req.session.adapters.values():
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 32
+        assert adapter._pool_block is True
+
+
+def test_retry_policy():
+    req = Requester(
+        baseurl="http://dummy",
+        max_retries=retry_policy(total=4, backoff_factor=2),
+    )
+    for adapter in req.session.adapters.values():
+        assert adapter.max_retries.total == 4
+        assert adapter.max_retries.backoff_factor == 2
+        assert 503 in adapter.max_retries.status_forcelist
+
+
+@pytest.fixture(scope="function")
+def keepalive_server():
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:%i" % server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def test_connection_stats(keepalive_server):
+    req = Requester(baseurl=keepalive_server)
+    for _ in range(5):
+        req.get_url(keepalive_server + "/api/json")
+
+    assert req.connection_stats() == {
+        keepalive_server: {"requests": 5, "connections": 1, "reused": 4}
+    }
+
+
+def test_coalesce_disabled_by_default():
+    assert Requester("foo", "bar").single_flight is None
+
+
+def test_identical_concurrent_gets_are_coalesced(monkeypatch, mocker):
+    entered = threading.Event()
+    release = threading.Event()
+    response = mocker.MagicMock(status_code=200)
+
+    def slow_get(url, **kwargs):
+        if kwargs.get("params") == {"depth": 1}:
+            entered.set()
+            release.wait(5)
+        return response
+
+    session_get = mocker.MagicMock(side_effect=slow_get)
+    monkeypatch.setattr(requests.Session, "get", session_get)
+    req = Requester(baseurl="http://dummy", coalesce=True)
+    results = []
+
+    def get():
+        results.append(
+            req.get_url("http://dummy/job/foo/api/json", params={"depth": 1})
+        )
+
+    threads = [threading.Thread(target=get) for _ in range(5)]
+    threads[0].start()
+    entered.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    while req.single_flight.stats()["coalesced"] < 4:
+        release.wait(0.01)
+    # Other parameters and streams are not shared
+    req.get_url("http://dummy/job/foo/api/json", params={"depth": 0})
+    req.get_url("http://dummy/job/foo/api/json", stream=True)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [response] * 5
+    assert session_get.call_count == 3
+    assert req.single_flight.stats() == {
+        "requests": 2,
+        "coalesced": 4,
+        "in_flight": 0,
+    }
+
+    # Nothing is kept once the request completed
+    req.get_url("http://dummy/job/foo/api/json", params={"depth": 1})
+    assert session_get.call_count == 4
+
+
+def test_coalesced_get_shares_exception(monkeypatch, mocker):
+    entered = threading.Event()
+    release = threading.Event()
+
+    def failing_get(url, **kwargs):
+        entered.set()
+        release.wait(5)
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(
+        requests.Session, "get", mocker.MagicMock(side_effect=failing_get)
+    )
+    req = Requester(baseurl="http://dummy", coalesce=True)
+    errors = []
+
+    def get():
+        try:
+            req.get_url("http://dummy/api/json")
+        except requests.ConnectionError as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=get) for _ in range(3)]
+    threads[0].start()
+    entered.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    while req.single_flight.stats()["coalesced"] < 2:
+        release.wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+    assert req.single_flight.stats()["in_flight"] == 0
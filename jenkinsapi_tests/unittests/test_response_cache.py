@@ -0,0 +1,188 @@
+import pytest
+import requests
+
+from jenkinsapi.utils.requester import Requester
+from jenkinsapi.utils import response_cache
+from jenkinsapi.utils.response_cache import ResponseCache
+
+API_URL = "http://dummy/job/foo/api/json"
+
+
+class FakeResponse(object):
+    def __init__(self, status_code=200, content=b"{}", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+@pytest.fixture(scope="function")
+def session_get(monkeypatch, mocker):
+    fake_get = mocker.MagicMock(return_value=FakeResponse())
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+    return fake_get
+
+
+def make_requester(**kwargs):
+    return Requester(
+        "foo", "bar", baseurl="http://dummy", cache=ResponseCache(**kwargs)
+    )
+
+
+def test_cache_disabled_by_default():
+    assert Requester("foo", "bar").cache is None
+
+
+def test_shared_cache():
+    req1 = Requester("foo", "bar", cache=True)
+    req2 = Requester("foo", "bar", cache=True)
+    assert req1.cache is req2.cache
+
+
+def test_fresh_entry_is_served_from_cache(session_get):
+    req = make_requester(default_ttl=60)
+
+    first = req.get_url(API_URL, params={"tree": "jobs[name]"})
+    second = req.get_url(API_URL, params={"tree": "jobs[name]"})
+
+    assert first is second
+    assert session_get.call_count == 1
+    assert req.cache.stats()["hits"] == 1
+    assert req.cache.stats()["misses"] == 1
+
+
+def test_key_includes_tree_and_depth(session_get):
+    req = make_requester(default_ttl=60)
+
+    req.get_url(API_URL, params={"tree": "jobs[name]"})
+    req.get_url(API_URL, params={"tree": "jobs[url]"})
+    req.get_url(API_URL, params={"depth": 1})
+
+    assert session_get.call_count == 3
+
+
+def test_uncacheable_requests_bypass_cache(session_get):
+    req = make_requester(default_ttl=60)
+
+    for _ in range(2):
+        req.get_url(API_URL, params={"start": 0})
+        req.get_url("http://dummy/job/foo/1/consoleText")
+        req.get_url(API_URL, stream=True)
+
+    assert session_get.call_count == 6
+    assert len(req.cache) == 0
+
+
+def test_stale_entry_is_revalidated(session_get):
+    req = make_requester(ttls=[], default_ttl=0)
+    session_get.return_value = FakeResponse(headers={"ETag": '"abc"'})
+    first = req.get_url(API_URL)
+
+    session_get.return_value = FakeResponse(status_code=304, content=b"")
+    second = req.get_url(API_URL)
+
+    assert first is second
+    _, kwargs = session_get.call_args
+    assert kwargs["headers"]["If-None-Match"] == '"abc"'
+    assert req.cache.stats()["revalidations"] == 1
+
+
+def test_lru_respects_byte_budget(session_get):
+    session_get.return_value = FakeResponse(content=b"x" * 40)
+    req = make_requester(max_bytes=100, default_ttl=60)
+
+    for depth in range(3):
+        req.get_url(API_URL, params={"depth": depth})
+
+    assert len(req.cache) == 2
+    assert req.cache.size == 80
+    assert req.cache.stats()["evictions"] == 1
+
+
+def test_ttl_per_url_class():
+    cache = ResponseCache(ttls=[(r"/queue/", 0), (r"/job/", 30)])
+    assert cache.ttl_for("http://dummy/queue/api/json") == 0
+    assert cache.ttl_for(API_URL) == 30
+    assert cache.ttl_for("http://dummy/api/json") == cache.default_ttl
+
+
+def test_post_invalidates_object(session_get, monkeypatch):
+    monkeypatch.setattr(
+        requests.Session, "post", lambda *args, **kwargs: FakeResponse()
+    )
+    req = make_requester(default_ttl=60)
+    req.get_url(API_URL)
+
+    req.post_url("http://dummy/job/foo/build", data="")
+    req.get_url(API_URL)
+
+    assert session_get.call_count == 2
+
+
+def test_only_completed_builds_get_long_ttl(session_get):
+    build_url = "http://dummy/job/foo/3/api/json"
+    report_url = "http://dummy/job/foo/3/testReport/api/json"
+    req = make_requester(default_ttl=60)
+
+    session_get.return_value = FakeResponse(content=b'{"building": true}')
+    for url in (build_url, build_url, report_url, report_url):
+        req.get_url(url)
+    assert session_get.call_count == 4
+
+    session_get.return_value = FakeResponse(content=b'{"building": false}')
+    req.get_url(build_url)
+    for url in (build_url, report_url, report_url):
+        req.get_url(url)
+    # Once the build completed, its report is cached too
+    assert session_get.call_count == 6
+
+    # A tree without building tells nothing about other builds
+    session_get.return_value = FakeResponse(content=b'{"number": 4}')
+    for _ in range(2):
+        req.get_url("http://dummy/job/foo/4/api/json", params={"tree": "n"})
+    assert session_get.call_count == 8
+
+
+def test_finished_runs_do_not_complete_a_running_build(session_get):
+    build_url = "http://dummy/job/matrix/7/api/json"
+    req = make_requester(default_ttl=60)
+    session_get.return_value = FakeResponse(
+        content=b'{"building": true, "runs": [{"building": false}]}'
+    )
+
+    for _ in range(2):
+        req.get_url(build_url, params={"depth": 1})
+    assert session_get.call_count == 2
+
+
+def test_completed_builds_are_bounded(monkeypatch):
+    monkeypatch.setattr(response_cache, "MAX_COMPLETED_BUILDS", 2)
+    cache = ResponseCache()
+    completed = FakeResponse(content=b'{"building": false}')
+    for number in (1, 2, 3):
+        cache.ttl_for("http://dummy/job/foo/%i/api/json" % number, completed)
+
+    assert list(cache._completed) == [
+        "http://dummy/job/foo/2",
+        "http://dummy/job/foo/3",
+    ]
+
+
+def test_post_invalidates_only_its_object(session_get, monkeypatch):
+    monkeypatch.setattr(
+        requests.Session, "post", lambda *args, **kwargs: FakeResponse()
+    )
+    session_get.return_value = FakeResponse(content=b'{"building": false}')
+    req = make_requester(default_ttl=60)
+    builds = ["http://dummy/job/foo/%i/api/json" % n for n in (1, 2)]
+    for url in builds:
+        req.get_url(url)
+
+    req.post_url("http://dummy/job/foo/2/toggleLogKeep", data="")
+    for url in builds:
+        req.get_url(url)
+
+    assert [call[0][0] for call in session_get.call_args_list] == [
+        builds[0],
+        builds[1],
+        builds[1],
+    ]
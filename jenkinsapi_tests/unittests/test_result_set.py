@@ -1,3 +1,5 @@
+import json
+
 import mock
 
 # To run unittests on python 2.6 please use unittest2 library
@@ -6,10 +8,16 @@ try:
 except ImportError:
     import unittest
 
-from jenkinsapi.result_set import ResultSet
+from jenkinsapi.result_set import CaseTable, ResultSet
 from jenkinsapi.result import Result
 
 
+def chunked(body, chunk_size):
+    for start in range(0, len(body), chunk_size):
+        end = start + chunk_size
+        yield body[start:end]
+
+
 class TestResultSet(unittest.TestCase):
 
     DATA = {
@@ -87,6 +95,152 @@ class TestResultSet(unittest.TestCase):
             self.assertIsInstance(v, Result)
             self.assertIsInstance(v.identifier(), str)
 
+    def testLookups(self):
+        self.assertEqual(len(self.rs), 2)
+        self.assertIn("nose.failure.Failure.runTest", self.rs)
+        self.assertNotIn("nose.failure.Failure.other", self.rs)
+        result = self.rs["nose.failure.Failure.runTest"]
+        self.assertEqual(result.errorDetails, "No module named mock")
+        with self.assertRaises(KeyError):
+            self.rs["nose.failure.Failure.other"]
+        # The index is built once per poll
+        index = self.rs._get_index()
+        self.rs["nose.failure.Failure.runTest"]
+        self.assertIs(self.rs._get_index(), index)
+
+    def testTable(self):
+        table = self.rs.table()
+        self.assertIsInstance(table, CaseTable)
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.counts(), {"FAILED": 2})
+        self.assertEqual(
+            table.with_status("FAILED", "REGRESSION"), self.rs.keys()
+        )
+        self.assertEqual(table.with_status("PASSED"), [])
+
+    def testStream(self):
+        body = json.dumps(self.DATA).encode("utf-8")
+        requester = self.b.job.get_jenkins_obj().requester
+        response = requester.get_and_confirm_status
+        response.return_value.iter_content.side_effect = lambda chunk_size: (
+            chunked(body, chunk_size)
+        )
+
+        streamed = list(self.rs.iter_stream(chunk_size=64))
+        self.assertEqual(
+            [k for k, _ in streamed], [k for k, _ in self.rs.iteritems()]
+        )
+        self.assertEqual(streamed[1][1].errorDetails, "No module named mock")
+        response.assert_called_with("http:/api/json", params=None, stream=True)
+
+        table = self.rs.stream_table(chunk_size=7)
+        self.assertEqual(list(table), list(self.rs.table()))
+
+    def testTree(self):
+        self.assertIsNone(ResultSet.get_tree())
+        self.assertEqual(
+            ResultSet.get_tree(summary=True),
+            "failCount,passCount,skipCount,duration",
+        )
+        self.assertEqual(
+            ResultSet.get_tree(["status"]),
+            "failCount,passCount,skipCount,duration,"
+            "suites[cases[className,name,status]],"
+            "childReports[child[number,url],"
+            "result[failCount,passCount,skipCount,duration,"
+            "suites[cases[className,name,status]]]]",
+        )
+
+    @mock.patch.object(ResultSet, "get_data")
+    def testProjectedFailures(self, get_data):
+        data = {
+            "failCount": 1,
+            "passCount": 1,
+            "suites": [
+                {
+                    "cases": [
+                        {"className": "a.A", "name": "ok", "status": "FIXED"},
+                        {
+                            "className": "a.A",
+                            "name": "ko",
+                            "status": "REGRESSION",
+                            "errorDetails": "boom",
+                        },
+                    ]
+                }
+            ],
+        }
+        get_data.return_value = data
+        rs = ResultSet(
+            "http://localhost/testReport/api/json",
+            self.b,
+            fields=ResultSet.FAILURE_FIELDS,
+            statuses=ResultSet.FAILED_STATUSES,
+        )
+        get_data.assert_called_once_with(
+            "http://localhost/testReport/api/json",
+            tree=ResultSet.get_tree(ResultSet.FAILURE_FIELDS),
+        )
+        self.assertEqual(rs.keys(), ["a.A.ko"])
+        self.assertEqual(rs["a.A.ko"].errorDetails, "boom")
+        self.assertNotIn("a.A.ok", rs)
+        self.assertEqual(
+            rs.get_counts(), {"failCount": 1, "passCount": 1, "skipCount": 0}
+        )
+
+    @mock.patch.object(ResultSet, "get_data")
+    def testStatusesWithoutStatusField(self, get_data):
+        get_data.return_value = {
+            "suites": [
+                {
+                    "cases": [
+                        {
+                            "className": "a.A",
+                            "name": "ok",
+                            "status": "PASSED",
+                            "duration": 1.0,
+                        },
+                        {
+                            "className": "a.A",
+                            "name": "ko",
+                            "status": "FAILED",
+                            "duration": 2.0,
+                        },
+                    ]
+                }
+            ],
+        }
+        rs = ResultSet(
+            "http://localhost/testReport/api/json",
+            self.b,
+            fields=["duration"],
+            statuses={"FAILED"},
+        )
+        self.assertIn(
+            "suites[cases[className,name,duration,status]]",
+            get_data.call_args[1]["tree"],
+        )
+        self.assertEqual(rs.keys(), ["a.A.ko"])
+        self.assertEqual(rs["a.A.ko"].duration, 2.0)
+
+    @mock.patch.object(ResultSet, "get_data")
+    def testSummary(self, get_data):
+        get_data.return_value = {
+            "failCount": 2,
+            "passCount": 7,
+            "skipCount": 1,
+        }
+        rs = ResultSet(
+            "http://localhost/testReport/api/json", self.b, summary=True
+        )
+        self.assertEqual(
+            get_data.call_args[1]["tree"], ResultSet.get_tree(summary=True)
+        )
+        self.assertEqual(
+            rs.get_counts(), {"failCount": 2, "passCount": 7, "skipCount": 1}
+        )
+        self.assertEqual(len(rs), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
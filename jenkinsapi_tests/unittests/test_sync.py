@@ -0,0 +1,169 @@
+import pytest
+
+from jenkinsapi import sync
+from jenkinsapi.jenkinsbase import JenkinsBase
+from jenkinsapi.sync import JenkinsSync, SyncEvent
+
+BASE = "http://localhost:8080"
+
+
+def build(number, building=False, result="SUCCESS"):
+    return {
+        "number": number,
+        "building": building,
+        "result": None if building else result,
+    }
+
+
+class FakeJenkins(object):
+    baseurl = BASE
+    python_api_url = JenkinsBase.python_api_url
+
+    def __init__(self):
+        self.builds = {"foo": [build(1), build(2, building=True)]}
+        self.folder = {"bar": [build(7)]}
+        self.queue = [{"id": 10, "task": {"name": "foo", "url": ""}}]
+        self.nodes = {"master": False, "agent": False}
+        self.urls = []
+
+    def get_queue_url(self):
+        return BASE + "/queue"
+
+    @staticmethod
+    def _job(name, url, builds):
+        return {
+            "name": name,
+            "url": url,
+            "color": "blue_anime" if builds[-1]["building"] else "blue",
+            "lastBuild": builds[-1] if builds else None,
+        }
+
+    def get_data(self, url, tree=None):
+        self.urls.append(url)
+        if url == BASE + "/api/json":
+            jobs = [
+                self._job(name, "%s/job/%s/" % (BASE, name), builds)
+                for name, builds in self.builds.items()
+            ]
+            jobs.append(
+                {
+                    "name": "folder",
+                    "url": BASE + "/job/folder/",
+                    "jobs": [
+                        self._job(
+                            name,
+                            "%s/job/folder/job/%s/" % (BASE, name),
+                            builds,
+                        )
+                        for name, builds in self.folder.items()
+                    ],
+                }
+            )
+            return {"jobs": jobs}
+        if url == BASE + "/queue/api/json":
+            return {"items": self.queue}
+        if url == BASE + "/computer/api/json":
+            return {
+                "computer": [
+                    {"displayName": name, "offline": offline}
+                    for name, offline in self.nodes.items()
+                ]
+            }
+        name = url.split("/job/")[-1].split("/")[0]
+        builds = self.builds.get(name) or self.folder[name]
+        count = int(tree.split("{0,")[1][:-1])
+        return {"builds": builds[::-1][:count]}
+
+
+@pytest.fixture
+def jenkins():
+    return FakeJenkins()
+
+
+def test_first_sync_only_fills_model(jenkins):
+    syncer = JenkinsSync(jenkins)
+    received = []
+    syncer.subscribe(received.append)
+
+    assert syncer.sync() == []
+    assert received == []
+    assert sorted(state.name for state in syncer.jobs.values()) == [
+        "folder/bar",
+        "foo",
+    ]
+    assert syncer.jobs[BASE + "/job/foo/"].running == {2}
+    assert list(syncer.queue) == [10]
+    assert syncer.requests == 3
+
+
+def test_sync_events(jenkins):
+    syncer = JenkinsSync(jenkins)
+    syncer.sync()
+    received = []
+    syncer.subscribe(received.append, kinds=[sync.BUILD_FINISHED])
+
+    jenkins.builds["foo"][1] = build(2, result="FAILURE")
+    jenkins.builds["foo"].append(build(3, building=True))
+    jenkins.builds["baz"] = [build(1)]
+    jenkins.queue = [{"id": 11, "task": {"name": "baz", "url": ""}}]
+    jenkins.nodes["agent"] = True
+    del jenkins.nodes["master"]
+    del jenkins.folder["bar"]
+    jenkins.urls = []
+
+    events = syncer.sync()
+
+    assert [(e.kind, e.name, e.number) for e in events] == [
+        (sync.BUILD_FINISHED, "foo", 2),
+        (sync.BUILD_STARTED, "foo", 3),
+        (sync.JOB_ADDED, "baz", None),
+        (sync.JOB_REMOVED, "folder/bar", None),
+        (sync.QUEUE_ITEM_ADDED, "baz", 11),
+        (sync.QUEUE_ITEM_REMOVED, "foo", 10),
+        (sync.NODE_OFFLINE, "agent", None),
+        (sync.NODE_REMOVED, "master", None),
+    ]
+    assert received == [events[0]]
+    assert events[0].data["result"] == "FAILURE"
+    # Builds 2 and 3 of foo changed, only them were fetched
+    assert jenkins.urls[1] == BASE + "/job/foo/api/json"
+    assert len(jenkins.urls) == 4
+
+
+def test_last_build_is_enough(jenkins):
+    syncer = JenkinsSync(jenkins)
+    syncer.sync()
+    jenkins.builds["foo"][1] = build(2)
+    jenkins.folder["bar"].append(build(8, building=True))
+
+    events = syncer.sync()
+
+    assert events == [
+        SyncEvent(sync.JOB_CHANGED, "foo", None, events[0].data),
+        SyncEvent(sync.BUILD_FINISHED, "foo", 2, build(2)),
+        SyncEvent(sync.JOB_CHANGED, "folder/bar", None, events[2].data),
+        SyncEvent(
+            sync.BUILD_STARTED, "folder/bar", 8, build(8, building=True)
+        ),
+    ]
+    # No builds were fetched
+    assert syncer.requests == 6
+
+
+def test_failing_subscriber(jenkins):
+    syncer = JenkinsSync(jenkins)
+    syncer.sync()
+    received = []
+
+    def fail(event):
+        raise ValueError(event)
+
+    syncer.subscribe(fail)
+    syncer.subscribe(received.append)
+    jenkins.nodes["agent"] = True
+
+    syncer.sync()
+    syncer.unsubscribe(fail)
+
+    assert [event.kind for event in received] == [sync.NODE_OFFLINE]
+    assert len(syncer._subscribers) == 1
@@ -0,0 +1,126 @@
+import collections
+import json
+
+from jenkinsapi.custom_exceptions import JenkinsAPIException
+from jenkinsapi.jenkinsbase import JenkinsBase
+from jenkinsapi.result_set import ResultSet
+from jenkinsapi.test_history import TestHistory, get_test_history
+
+JOB_URL = "http://localhost:8080/job/tests"
+# build number: statuses of flaky, stable and broken, or None without report
+REPORTS = {
+    1: ("PASSED", "PASSED", "FAILED"),
+    2: ("FAILED", "PASSED", "REGRESSION"),
+    3: None,
+    4: ("FIXED", "SKIPPED", "FAILED"),
+    5: ("FAILED", "PASSED", "FAILED"),
+}
+
+
+class FakeResponse(object):
+    def __init__(self, body):
+        self.body = body
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), 5):
+            end = i + 5
+            yield self.body[i:end]
+
+    def close(self):
+        pass
+
+
+class FakeJob(JenkinsBase):
+    def __init__(self):
+        self.name = "tests"
+        self.jenkins = self
+        self.requester = self
+        self.reports = collections.Counter()
+        self.trees = []
+        JenkinsBase.__init__(self, JOB_URL, poll=False)
+
+    def get_jenkins_obj(self):
+        return self
+
+    def get_data(self, url, params=None, tree=None):
+        self.trees.append(tree)
+        builds = [
+            {"number": n, "url": "%s/%i/" % (JOB_URL, n), "building": False}
+            for n in REPORTS
+        ]
+        builds.append({"number": 6, "url": JOB_URL + "/6/", "building": True})
+        start, end = map(int, tree.split("{")[1].rstrip("}").split(","))
+        return {"allBuilds": builds[::-1][start:end]}
+
+    def get_and_confirm_status(self, url, params=None, stream=False):
+        assert params == {"tree": ResultSet.get_tree(["status"])}
+        number = int(url.replace(JOB_URL + "/", "", 1).split("/")[0])
+        self.reports[number] += 1
+        statuses = REPORTS[number]
+        if statuses is None:
+            raise JenkinsAPIException("404")
+        cases = [
+            {"className": "a.T", "name": name, "status": status}
+            for name, status in zip(("flaky", "stable", "broken"), statuses)
+        ]
+        return FakeResponse(
+            json.dumps({"suites": [{"cases": cases}]}).encode("utf-8")
+        )
+
+
+def test_history():
+    job = FakeJob()
+    history = get_test_history(job, builds=10, workers=2)
+
+    assert isinstance(history, TestHistory)
+    assert history.builds == [1, 2, 3, 4, 5]
+    assert sorted(history.tests) == ["a.T.broken", "a.T.flaky", "a.T.stable"]
+    assert history.history("a.T.stable") == [
+        (1, "PASSED"),
+        (2, "PASSED"),
+        (3, "NOT_RUN"),
+        (4, "SKIPPED"),
+        (5, "PASSED"),
+    ]
+    assert history.failure_rates() == {
+        "a.T.flaky": 0.5,
+        "a.T.stable": 0.0,
+        "a.T.broken": 1.0,
+    }
+    assert history.flip_counts() == {
+        "a.T.flaky": 3,
+        "a.T.stable": 0,
+        "a.T.broken": 0,
+    }
+    assert history.flaky() == [("a.T.flaky", 3, 0.5)]
+    assert history.flaky(min_flips=4) == []
+    # The build still running is not fetched
+    assert job.reports == {1: 1, 2: 1, 3: 1, 4: 1, 5: 1}
+    assert job.trees == ["allBuilds[number,url,building]{0,10}"]
+
+
+def test_history_skips_running_builds():
+    job = FakeJob()
+    history = get_test_history(job, builds=5)
+
+    # The running build took a place in the first page, one more build
+    # is fetched to make up for it
+    assert history.builds == [1, 2, 3, 4, 5]
+    assert job.trees == [
+        "allBuilds[number,url,building]{0,5}",
+        "allBuilds[number,url,building]{5,6}",
+    ]
+
+
+def test_history_cache(tmp_path):
+    job = FakeJob()
+    first = get_test_history(job, builds=10, cache_dir=str(tmp_path))
+    job.reports.clear()
+
+    second = get_test_history(job, builds=10, cache_dir=str(tmp_path))
+
+    # Only the build without report is tried again
+    assert job.reports == {3: 1}
+    assert sorted(second.tests) == sorted(first.tests)
+    for identifier in first.tests:
+        assert second.history(identifier) == first.history(identifier)
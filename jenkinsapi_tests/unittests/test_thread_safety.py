@@ -0,0 +1,131 @@
+"""
+Hammer a single Jenkins client from many threads.
+"""
+
+import collections
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from jenkinsapi.jenkins import Jenkins
+from jenkinsapi.jenkinsbase import JenkinsBase
+from jenkinsapi.job import Job
+from jenkinsapi.utils.crumb_requester import CrumbRequester
+
+BASEURL = "http://localhost:8080"
+NUM_THREADS = 64
+NUM_JOBS = 8
+
+# Captured at import time: other test modules leave JenkinsBase.get_data
+# patched once they have run.
+GET_DATA = JenkinsBase.get_data
+
+
+class FakeResponse(object):
+    def __init__(self, payload, status_code=200, headers=None):
+        self.status_code = status_code
+        self.text = json.dumps(payload)
+        self.content = self.text.encode("utf-8")
+        self.headers = headers or {}
+        self.url = None
+
+
+def job_url(num):
+    return "%s/job/job_%i" % (BASEURL, num)
+
+
+def fake_payload(url, tree):
+    if url.startswith(BASEURL + "/crumbIssuer/"):
+        return {"crumbRequestField": "Jenkins-Crumb", "crumb": "abc"}
+    if url == BASEURL + "/api/json":
+        return {
+            "jobs": [
+                {"name": "job_%i" % i, "url": job_url(i), "color": "blue"}
+                for i in range(NUM_JOBS)
+            ]
+        }
+    builds = [
+        {"number": n, "url": "%s/%i/" % (url.rsplit("/api/", 1)[0], n)}
+        for n in (3, 2, 1)
+    ]
+    return {
+        "name": "job",
+        "builds": builds,
+        "lastBuild": builds[0],
+        "firstBuild": builds[-1],
+        "nextBuildNumber": 4,
+    }
+
+
+@pytest.fixture(scope="function")
+def requests_made():
+    return collections.Counter()
+
+
+@pytest.fixture(scope="function")
+def jenkins(requests_made, monkeypatch):
+    monkeypatch.setattr(JenkinsBase, "get_data", GET_DATA)
+    lock = threading.Lock()
+    posted_crumbs = []
+
+    def fake_get(url, params=None, **kwargs):  # pylint: disable=W0613
+        tree = (params or {}).get("tree")
+        with lock:
+            requests_made[(url, tree)] += 1
+        # give other threads a chance to run into the same fetch
+        time.sleep(0.002)
+        return FakeResponse(fake_payload(url, tree))
+
+    def fake_post(url, headers=None, **kwargs):  # pylint: disable=W0613
+        with lock:
+            requests_made[(url, "POST")] += 1
+            posted_crumbs.append((headers or {}).get("Jenkins-Crumb"))
+        return FakeResponse({}, status_code=201)
+
+    requester = CrumbRequester(baseurl=BASEURL)
+    requester.session.get = fake_get
+    requester.session.post = fake_post
+    new_jenkins = Jenkins(BASEURL, requester=requester, lazy=True)
+    new_jenkins.posted_crumbs = posted_crumbs
+    return new_jenkins
+
+
+def test_shared_client_from_64_threads(jenkins, requests_made):
+    jobs = [
+        Job(job_url(i), "job_%i" % i, jenkins, poll=False)
+        for i in range(NUM_JOBS)
+    ]
+    barrier = threading.Barrier(NUM_THREADS)
+
+    def worker(num):
+        barrier.wait()
+        for iteration in range(20):
+            job = jobs[(num + iteration) % NUM_JOBS]
+            assert jenkins.has_job(job.name)
+            assert jenkins.jobs._find_job_row(job.name)["url"] == job.baseurl
+            assert sorted(job.get_build_dict()) == [1, 2, 3]
+            assert job._get_build_url(2).endswith("/%s/2/" % job.name)
+            jenkins.requester.post_url(job.baseurl + "/build", data="x")
+        return num
+
+    with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+        assert sorted(executor.map(worker, range(NUM_THREADS))) == list(
+            range(NUM_THREADS)
+        )
+
+    # the job list, each build index and the crumb were fetched once
+    assert requests_made[(BASEURL + "/api/json", "jobs[name,color,url]")] == 1
+    for i in range(NUM_JOBS):
+        url = job_url(i) + "/api/json"
+        assert requests_made[(url, "builds[number,url]")] == 1
+        assert requests_made[(url, "lastBuild[number,url]")] == 1
+    crumb_requests = [
+        count
+        for (url, _), count in requests_made.items()
+        if "/crumbIssuer/" in url
+    ]
+    assert crumb_requests == [1]
+    assert jenkins.posted_crumbs == ["abc"] * NUM_THREADS * 20
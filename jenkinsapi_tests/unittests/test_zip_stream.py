@@ -0,0 +1,113 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from jenkinsapi.utils.zip_stream import extract_zip_stream, iter_zip_stream
+
+FILES = {
+    "archive/": b"",
+    "archive/report.txt": b"all good\n" * 1000,
+    "archive/dir/data.bin": os.urandom(5000),
+    "archive/dir/sub/empty.txt": b"",
+    "archive/dir/sub/notes.md": "héllo\n".encode("utf-8"),
+}
+
+
+class Unseekable(io.RawIOBase):
+    """Makes zipfile write data descriptors, as Jenkins does."""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+
+def make_zip(compression=zipfile.ZIP_DEFLATED, seekable=False):
+    out = io.BytesIO() if seekable else Unseekable()
+    with zipfile.ZipFile(out, "w", compression) as archive:
+        for name, content in FILES.items():
+            archive.writestr(name, content)
+    return (out if seekable else out.buffer).getvalue()
+
+
+def chunked(data, size=7):
+    for pos in range(0, len(data), size):
+        end = pos + size
+        yield data[pos:end]
+
+
+@pytest.mark.parametrize(
+    "compression,seekable",
+    [
+        (zipfile.ZIP_DEFLATED, False),
+        (zipfile.ZIP_DEFLATED, True),
+        (zipfile.ZIP_STORED, True),
+    ],
+)
+def test_iter_zip_stream(compression, seekable):
+    data = make_zip(compression, seekable)
+    names = []
+    for name, content in iter_zip_stream(chunked(data)):
+        names.append(name)
+        assert b"".join(content) == FILES[name]
+    assert names == list(FILES)
+
+
+def test_unread_data_is_skipped():
+    data = make_zip()
+    names = [name for name, _ in iter_zip_stream(chunked(data, 100))]
+    assert names == list(FILES)
+
+
+def test_extract_zip_stream(tmp_path):
+    extracted = extract_zip_stream(
+        chunked(make_zip(), 1000),
+        str(tmp_path),
+        include=lambda name: name.startswith("dir/"),
+        strip_prefix="archive/",
+    )
+
+    assert sorted(extracted) == [
+        "dir/data.bin",
+        "dir/sub/empty.txt",
+        "dir/sub/notes.md",
+    ]
+    for name, fspath in extracted.items():
+        assert fspath == os.path.join(str(tmp_path), *name.split("/"))
+        with open(fspath, "rb") as f:
+            assert f.read() == FILES["archive/" + name]
+    assert not (tmp_path / "report.txt").exists()
+
+
+def test_extract_zip_stream_stays_in_dirpath(tmp_path):
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as archive:
+        archive.writestr("../escaped.txt", b"nope")
+        archive.writestr("inside.txt", b"yes")
+    target = tmp_path / "target"
+
+    extracted = extract_zip_stream([out.getvalue()], str(target))
+
+    assert list(extracted) == ["inside.txt"]
+    assert not (tmp_path / "escaped.txt").exists()
+
+
+def test_bad_crc():
+    data = bytearray(make_zip(zipfile.ZIP_STORED, seekable=True))
+    data[data.index(b"all good")] ^= 0xFF
+    with pytest.raises(zipfile.BadZipFile, match="CRC"):
+        for _, content in iter_zip_stream([bytes(data)]):
+            list(content)
+
+
+def test_truncated_stream():
+    data = make_zip()
+    with pytest.raises(zipfile.BadZipFile, match="Truncated"):
+        for _, content in iter_zip_stream([data[: len(data) // 2]]):
+            list(content)